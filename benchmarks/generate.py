@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Generates reproducible repositories for the vigit benchmarks.
+
+Each scale produces, under <root>/<scale>/:
+
+  remote.git   bare repository written with `git fast-import`: a linear
+               history on main, a `bench` branch one commit ahead of it and
+               the requested number of topic branches
+  work/        clone of file://.../remote.git with the requested number of
+               local branches, a stash and a few unstaged and untracked
+               changes, checked out on `bench`
+
+Contents, authors and dates are fixed, so the same scale always produces
+the same object ids.
+
+Usage: python benchmarks/generate.py [--root DIR] [--force] [scale ...]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+SCALES = {
+    # name: commits, files, remote (topic) branches, local branches, files changed in the stash
+    "small": dict(commits=1_000, files=1_000, remote_branches=20, local_branches=20, stash_files=50),
+    "commits-10k": dict(commits=10_000, files=2_000, remote_branches=100, local_branches=100, stash_files=200),
+    "commits-100k": dict(commits=100_000, files=5_000, remote_branches=100, local_branches=100, stash_files=200),
+    "files-100k": dict(commits=1_000, files=100_000, remote_branches=20, local_branches=20, stash_files=1_000),
+    "branches-5k": dict(commits=10_000, files=2_000, remote_branches=5_000, local_branches=5_000, stash_files=200),
+    "stash-large": dict(commits=1_000, files=20_000, remote_branches=20, local_branches=20, stash_files=20_000),
+}
+
+DEFAULT_ROOT = os.path.join(tempfile.gettempdir(), "vigit-bench")
+
+FILES_PER_COMMIT = 3
+EPOCH = 1_600_000_000
+IDENTITY = "Bench <bench@example.com>"
+
+# Working tree changes left in place for the status, diff and add actions
+UNSTAGED_FILES = 20
+UNTRACKED_FILES = 10
+
+
+def git_env(**extra):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Bench", GIT_AUTHOR_EMAIL="bench@example.com",
+        GIT_COMMITTER_NAME="Bench", GIT_COMMITTER_EMAIL="bench@example.com",
+        GIT_AUTHOR_DATE=f"{EPOCH} +0000", GIT_COMMITTER_DATE=f"{EPOCH} +0000",
+        GIT_CONFIG_NOSYSTEM="1",
+    )
+    env.update(extra)
+    return env
+
+def git(*args, cwd=None, **kwargs):
+    return subprocess.run(["git", *args], cwd=cwd, env=git_env(), check=True, **kwargs)
+
+
+def file_path(n):
+    return f"dir{n // 100:04d}/file{n:06d}.txt"
+
+def file_content(n, revision=0):
+    lines = [f"file {n} line {j}" for j in range(8)]
+    lines.append(f"revision {revision}")
+    return ("\n".join(lines) + "\n").encode()
+
+def changed_files(i, files):
+    """Files modified by commit i, spread over the whole tree."""
+    return [(i * 7919 + k * 104729) % files for k in range(FILES_PER_COMMIT)]
+
+
+def _data(payload):
+    return b"data %d\n%s\n" % (len(payload), payload)
+
+def _commit(ref, mark, parent, when, message, modifications):
+    chunks = [
+        f"commit {ref}\nmark :{mark}\n".encode(),
+        f"author {IDENTITY} {when} +0000\ncommitter {IDENTITY} {when} +0000\n".encode(),
+        _data(message.encode()),
+    ]
+    if parent:
+        chunks.append(f"from :{parent}\n".encode())
+    for path, content in modifications:
+        chunks.append(f"M 100644 inline {path}\n".encode())
+        chunks.append(_data(content))
+    chunks.append(b"\n")
+    return b"".join(chunks)
+
+def fast_import_stream(scale):
+    """Yields the fast-import commands for the remote's history."""
+    commits, files = scale["commits"], scale["files"]
+
+    yield _commit("refs/heads/main", 1, None, EPOCH, "Initial commit",
+                  ((file_path(n), file_content(n)) for n in range(files)))
+    for i in range(2, commits + 1):
+        modifications = [(file_path(n), file_content(n, i)) for n in changed_files(i, files)]
+        yield _commit("refs/heads/main", i, i - 1, EPOCH + i * 60, f"Change {i}\n\nUpdates {len(modifications)} files.",
+                      modifications)
+
+    # One commit ahead of main, so merge actions have something to do. It
+    # leaves the files with working tree changes alone so checkouts succeed.
+    unstaged = set(unstaged_files(files))
+    bench = [(file_path(n), file_content(n, -1)) for n in range(1, files, max(1, files // 5)) if n not in unstaged]
+    yield _commit("refs/heads/bench", commits + 1, commits, EPOCH + (commits + 1) * 60, "Bench branch commit", bench)
+
+    branches = scale["remote_branches"]
+    for b in range(branches):
+        mark = 1 + (b * (commits - 1)) // max(1, branches)
+        yield f"reset refs/heads/topic-{b:05d}\nfrom :{mark}\n\n".encode()
+
+
+def unstaged_files(files):
+    return [(k * 4099) % files for k in range(min(UNSTAGED_FILES, files))]
+
+def apply_worktree_changes(work, scale):
+    """Leaves UNSTAGED_FILES modified tracked files and UNTRACKED_FILES new files in work."""
+    for n in unstaged_files(scale["files"]):
+        with open(os.path.join(work, file_path(n)), "ab") as f:
+            f.write(b"unstaged change\n")
+    for k in range(UNTRACKED_FILES):
+        with open(os.path.join(work, f"untracked{k:03d}.txt"), "wb") as f:
+            f.write(f"untracked {k}\n".encode())
+
+
+def generate(name, root=DEFAULT_ROOT, force=False, verbose=True):
+    """Builds the repositories for scale name under root and returns (remote, work)."""
+    scale = SCALES[name]
+    base = os.path.join(root, name)
+    remote = os.path.join(base, "remote.git")
+    work = os.path.join(base, "work")
+    marker = os.path.join(base, "complete")
+    signature = repr(sorted(scale.items()))
+
+    if not force and os.path.exists(marker):
+        with open(marker) as f:
+            if f.read() == signature:
+                return remote, work
+    if os.path.exists(base):
+        shutil.rmtree(base)
+    os.makedirs(base)
+
+    def step(message):
+        if verbose:
+            print(f"[{name}] {message}", file=sys.stderr)
+
+    step(f"fast-import: {scale['commits']} commits, {scale['files']} files")
+    git("init", "-q", "--bare", "-b", "main", remote)
+    process = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=remote, stdin=subprocess.PIPE, env=git_env())
+    for chunk in fast_import_stream(scale):
+        process.stdin.write(chunk)
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    git("gc", "-q", cwd=remote)
+
+    step("clone over file://")
+    git("clone", "-q", "--branch", "bench", f"file://{remote}", work)
+
+    step(f"{scale['local_branches']} local branches")
+    oids = git("rev-list", "--first-parent", "origin/main", cwd=work, capture_output=True, text=True).stdout.split()
+    updates = "".join(
+        f"create refs/heads/local-{b:05d} {oids[(b * len(oids)) // max(1, scale['local_branches'])]}\n"
+        for b in range(scale["local_branches"])
+    )
+    updates += f"create refs/heads/main {oids[0]}\n"
+    git("update-ref", "--stdin", cwd=work, input=updates, text=True)
+    git("config", "branch.main.remote", "origin", cwd=work)
+    git("config", "branch.main.merge", "refs/heads/main", cwd=work)
+
+    step(f"stash touching {scale['stash_files']} files")
+    for n in range(min(scale["stash_files"], scale["files"])):
+        with open(os.path.join(work, file_path(n)), "ab") as f:
+            f.write(b"stashed change\n")
+    git("stash", "push", "-q", "-m", "bench stash", cwd=work)
+
+    apply_worktree_changes(work, scale)
+
+    with open(marker, "w") as f:
+        f.write(signature)
+    step("done")
+    return remote, work
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the vigit benchmark repositories")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help=f"Where to put them (default: {DEFAULT_ROOT})")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the scale already exists")
+    parser.add_argument("scales", nargs="*", default=list(SCALES), help=f"Scales: {', '.join(SCALES)}")
+    args = parser.parse_args()
+
+    for name in args.scales:
+        if name not in SCALES:
+            parser.error(f"unknown scale '{name}'")
+        remote, work = generate(name, args.root, args.force)
+        print(f"{name}: {work} (remote {remote})")
+
+
+if __name__ == "__main__":
+    main()
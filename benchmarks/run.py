@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Times vg quick actions against the generated benchmark repositories.
+
+Every action runs as `vg <command>` through vigit.main.main() in its own
+process, attached to a pseudo-terminal so the menus that need one work.
+Prompts are answered from a fixed script, pagers are disabled, and actions
+that change the repository are undone before the next run. Per action it
+reports:
+
+  wall ms    time until the process exits, minus the pauses spent waiting
+             to type the scripted answers (SETTLE per answer)
+  rss MB     peak resident memory of the vg process (git children excluded)
+  git        number of processes vg started, counted from VG_TRACE_FILE
+
+Usage: python benchmarks/run.py [--scales small ...] [--actions s v ...]
+                                [--repeat N] [--json FILE]
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import pty
+import select
+import signal
+import struct
+import sys
+import tempfile
+import termios
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate import SCALES, DEFAULT_ROOT, apply_worktree_changes, git, generate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Quiet period after which the next scripted answer is typed
+SETTLE = 0.3
+
+# command, extra arguments, scripted answers, changes the repository
+ACTIONS = [
+    ("s", [], [], False),
+    ("v", [], [], False),
+    ("sb", [], [], False),
+    ("sl", [], [], False),
+    ("sr", [], [], False),
+    ("h", [], ["q"], False),  # History pager
+    ("hx", [], ["q"], False),  # Graph pager
+    ("sht", [], [], False),
+    ("shd", [], ["q"], False),  # Piped into less
+    ("hp", [], ["dir0000/file000002.txt\n", "\n"], False),
+    ("find", [], ["c\n", "revision 7\n", "\n"], False),  # Pickaxe over the whole history
+    ("blame", [], ["dir0000/file000002.txt\n", "\n", "q"], False),  # Blame pager
+    ("sd", [], [" "], False),  # File list
+    ("sda", [], [" "], False),
+    ("sdc", [], ["HEAD~10\n", "HEAD\n"], False),
+    ("sdb", [], ["main\n", "bench\n", " "], False),  # File list
+    ("f", [], ["0\n"], False),
+    ("at", [], ["\r"], True),
+    ("aa", [], [], True),
+    ("c", ["bench commit"], [], True),
+    ("p", ["bench push"], ["3\n"], True),
+    ("b", [], ["bench-new\n"], True),
+    ("g", [], ["1\n", "n\n"], True),
+    ("m", [], ["y\n"], True),
+    ("mb", [], ["1\n", "y\n"], True),
+    ("br", [], ["main\n", "bench-remote\n", "n\n"], True),
+]
+# Not timed: `a` and `ar` create repositories (the latter on GitHub), `n`
+# only opens the configuration menu and `optimize` writes files into the
+# object store that would speed up every action timed after it.
+
+CHILD = "import sys; sys.argv = ['vg'] + sys.argv[1:]; from vigit.main import main; main()"
+
+
+def run_action(work, command, args, answers, timeout):
+    """Runs one action under a pty; returns a result dict."""
+    with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as trace:
+        trace_file = trace.name
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        VG_TRACE_FILE=trace_file,
+        GIT_PAGER="cat", PAGER="cat", TERM="xterm-256color",
+        GIT_AUTHOR_NAME="Bench", GIT_AUTHOR_EMAIL="bench@example.com",
+        GIT_COMMITTER_NAME="Bench", GIT_COMMITTER_EMAIL="bench@example.com",
+    )
+    env.pop("VG_TRACE", None)
+
+    started = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(work)
+        os.execve(sys.executable, [sys.executable, "-c", CHILD, command, *args], env)
+
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", 50, 160, 0, 0))
+    pending = list(answers)
+    waited = 0.0
+    output_bytes = 0
+    timed_out = False
+    while True:
+        if time.perf_counter() - started > timeout:
+            timed_out = True
+            os.kill(pid, signal.SIGKILL)
+            break
+        ready, _, _ = select.select([fd], [], [], SETTLE if pending else 0.5)
+        if ready:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                break  # EIO: the child closed the terminal
+            if not data:
+                break
+            output_bytes += len(data)
+        elif pending:
+            os.write(fd, pending.pop(0).encode())
+            waited += SETTLE
+
+    _, status, usage = os.wait4(pid, 0)
+    wall = time.perf_counter() - started - waited
+    os.close(fd)
+
+    processes = 0
+    try:
+        with open(trace_file) as f:
+            processes = sum(1 for line in f if json.loads(line).get("kind") == "process")
+    finally:
+        os.unlink(trace_file)
+
+    return {
+        "command": command,
+        "wall_ms": round(wall * 1000, 1),
+        "rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "git_processes": processes,
+        "output_bytes": output_bytes,
+        "exit": "timeout" if timed_out else os.waitstatus_to_exitcode(status),
+    }
+
+
+def snapshot_refs(git_dir):
+    output = git("for-each-ref", "--format=%(refname) %(objectname)", cwd=git_dir, capture_output=True, text=True).stdout
+    return dict(line.split(" ", 1) for line in output.splitlines())
+
+def restore(work, remote, scale, work_refs, remote_refs):
+    """Undoes whatever a mutating action did: refs, HEAD, index and working tree."""
+    for git_dir, saved in ((remote, remote_refs), (work, work_refs)):
+        current = snapshot_refs(git_dir)
+        updates = "".join(f"update {ref} {oid}\n" for ref, oid in saved.items() if current.get(ref) != oid)
+        updates += "".join(f"delete {ref}\n" for ref in current if ref not in saved)
+        if updates:
+            git("update-ref", "--stdin", cwd=git_dir, input=updates, text=True)
+    if os.path.exists(os.path.join(work, ".git", "MERGE_HEAD")):
+        git("merge", "--abort", cwd=work, capture_output=True)
+    git("checkout", "-q", "-f", "bench", cwd=work)
+    git("reset", "-q", "--hard", "bench", cwd=work)
+    git("clean", "-q", "-f", "-d", cwd=work)
+    apply_worktree_changes(work, scale)
+
+
+def benchmark(scale_name, actions, repeat, timeout, root):
+    remote, work = generate(scale_name, root)
+    scale = SCALES[scale_name]
+    work_refs, remote_refs = snapshot_refs(work), snapshot_refs(remote)
+
+    results = []
+    for command, args, answers, mutates in actions:
+        runs = []
+        for _ in range(repeat):
+            runs.append(run_action(work, command, args, answers, timeout))
+            if mutates:
+                restore(work, remote, scale, work_refs, remote_refs)
+        best = min(runs, key=lambda r: r["wall_ms"])
+        best["scale"] = scale_name
+        best["runs"] = [r["wall_ms"] for r in runs]
+        results.append(best)
+        print(f"{scale_name:<14} {command:<6} {best['wall_ms']:>10.1f} {best['rss_mb']:>8.1f} "
+              f"{best['git_processes']:>5} {str(best['exit']):>8}", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time vg quick actions on generated repositories")
+    parser.add_argument("--scales", nargs="+", default=["small"], help=f"Scales: {', '.join(SCALES)} (default: small)")
+    parser.add_argument("--actions", nargs="+", help="Commands to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per action; the fastest is reported (default: 3)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before an action is killed (default: 300)")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help=f"Where the repositories live (default: {DEFAULT_ROOT})")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to FILE")
+    args = parser.parse_args()
+
+    actions = ACTIONS
+    if args.actions:
+        known = {action[0] for action in ACTIONS}
+        unknown = [command for command in args.actions if command not in known]
+        if unknown:
+            parser.error(f"unknown or untimed actions: {', '.join(unknown)}")
+        actions = [action for action in ACTIONS if action[0] in args.actions]
+    for name in args.scales:
+        if name not in SCALES:
+            parser.error(f"unknown scale '{name}'")
+
+    print(f"{'scale':<14} {'action':<6} {'wall ms':>10} {'rss MB':>8} {'git':>5} {'exit':>8}")
+    results = []
+    for name in args.scales:
+        results.extend(benchmark(name, actions, args.repeat, args.timeout, args.root))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Startup budget for `vg` quick actions.
+
+For each quick action, imports vigit.main and resolves the action's function
+under `python -X importtime`, then checks that:
+
+  - the vigit modules it pulls in import within the budget, and
+  - none of the heavy modules only the interactive menus or GitHub
+    operations need (requests, urllib3, simple_term_menu) were loaded.
+
+Usage: python benchmarks/startup_budget.py [--budget-ms 30] [command ...]
+Exits with status 1 when any command is over budget.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_COMMANDS = ["s", "c", "sd", "v", "h", "sl", "g", "m"]
+FORBIDDEN = ("requests", "urllib3", "simple_term_menu")
+
+
+def import_profile(command):
+    """Returns [(module, self_us, cumulative_us, depth)] for resolving command."""
+    code = f"from vigit.main import resolve_action; resolve_action({command!r})"
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return profile
+
+
+def measure(command, repeat=3):
+    """Best-of-repeat import time of vigit for command, in ms, and the forbidden modules it loaded."""
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        profile = import_profile(command)
+        # Top-level entries: vigit, vigit.main and the lazily imported action module
+        total = sum(cumulative for name, _, cumulative, depth in profile
+                    if depth == 0 and name.split(".")[0] == "vigit")
+        best = total if best is None else min(best, total)
+        loaded |= {name for name, _, _, _ in profile if name.split(".")[0] in FORBIDDEN}
+    return best / 1000, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import-time budget of vg quick actions")
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="Import budget per command (default: 30)")
+    parser.add_argument("commands", nargs="*", default=DEFAULT_COMMANDS)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'command':<8} {'import ms':>10}  status")
+    for command in args.commands:
+        try:
+            elapsed, loaded = measure(command)
+        except RuntimeError as e:
+            print(f"{command:<8} {'-':>10}  error: {str(e).splitlines()[-1]}")
+            failed = True
+            continue
+        problems = []
+        if elapsed > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if loaded:
+            problems.append("loads " + ", ".join(loaded))
+        failed = failed or bool(problems)
+        print(f"{command:<8} {elapsed:>10.1f}  {'; '.join(problems) or 'ok'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
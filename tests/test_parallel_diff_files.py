@@ -0,0 +1,47 @@
+"""
+parallel_diff_files() splits a diff's stat over several `git diff --numstat`
+processes; whatever the layout of the changed files, the result must be the
+one a single `git diff --numstat` gives.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from vigit import diff_render
+
+
+def git(*args):
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def nested_repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q")
+    git("config", "user.name", "vg")
+    git("config", "user.email", "vg@example.com")
+    # git sorts a/b/x*, a/b/y/z*, a/b/zz*: a/b's files are not next to each other
+    paths = [f"a/b/x{n}" for n in range(4)] + [f"a/b/y/z{n}" for n in range(4)] + [f"a/b/zz{n}" for n in range(4)]
+    paths += ["top.txt", "a/moved.txt"]
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            file.write(f"{path}\n" * 20)
+    git("add", "-A")
+    git("commit", "-q", "-m", "base")
+    for path in paths:
+        with open(path, "a") as file:
+            file.write("changed\n")
+    git("mv", "a/moved.txt", "a/b/y/renamed.txt")
+    git("commit", "-q", "-a", "-m", "change")
+    return tmp_path
+
+
+def test_parallel_stat_matches_single_process(nested_repo, monkeypatch):
+    monkeypatch.setattr(diff_render, "MIN_STAT_CHUNK", 3)
+    monkeypatch.setattr(diff_render.os, "cpu_count", lambda: 4)
+    expected = sorted(diff_render.diff_files(["HEAD~1", "HEAD", "--"]), key=lambda item: item[2])
+    assert diff_render._parallel_diff_files("HEAD~1", "HEAD") == expected
+    assert len(expected) == 14
@@ -0,0 +1,27 @@
+"""
+The startup budget of benchmarks/startup_budget.py as a test: every quick
+action imports within the budget and loads none of the heavy modules only
+the interactive menus need.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    "startup_budget", os.path.join(ROOT, "benchmarks", "startup_budget.py")
+)
+startup_budget = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(startup_budget)
+
+BUDGET_MS = float(os.environ.get("VG_STARTUP_BUDGET_MS", "30"))
+
+
+@pytest.mark.parametrize("command", startup_budget.DEFAULT_COMMANDS)
+def test_quick_action_startup_budget(command):
+    elapsed, loaded = startup_budget.measure(command)
+    assert not loaded, f"vg {command} loads {', '.join(loaded)} at startup"
+    assert elapsed <= BUDGET_MS, f"vg {command} imports in {elapsed:.1f} ms (budget {BUDGET_MS:.0f} ms)"
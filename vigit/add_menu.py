@@ -1,13 +1,13 @@
-import subprocess
 import sys
 import termios
 import tty
 
-from simple_term_menu import TerminalMenu
 from .utils import GREEN, ENDC, BLUE, RED, YELLOW
 from .constants import add_menu, MENU_CURSOR, MENU_CURSOR_STYLE
-from .checks import is_git_repo, print_not_git_repo
-from .github_ops import create_github_repository, get_github_token, get_github_username
+from .checks import is_git_repo, print_not_git_repo, get_current_branch, local_branch_exists
+from .runner import run
+from .render import clear_terminal
+from .header import print_status_header
 
 def get_single_keypress():
     """Captura un solo carácter del usuario sin necesidad de presionar Enter."""
@@ -19,13 +19,10 @@ def get_single_keypress():
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
-def clear_screen():
-    """Clear the terminal screen"""
-    import os
-    os.system('cls' if os.name == 'nt' else 'clear')
 
 def add_tracked_files(ask_for_enter=True):
     """Añade archivos al índice de Git (git add)"""
+    from simple_term_menu import TerminalMenu
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -34,7 +31,7 @@ def add_tracked_files(ask_for_enter=True):
         print(f"\n{BLUE}Add Tracked Files:{ENDC}")
 
         # Obtener archivos no rastreados
-        untracked_files = subprocess.run(
+        untracked_files = run(
             ["git", "ls-files", "--others", "--exclude-standard"],
             capture_output=True,
             text=True,
@@ -42,7 +39,7 @@ def add_tracked_files(ask_for_enter=True):
         ).stdout.strip().split('\n')
 
         # Obtener archivos modificados
-        modified_files = subprocess.run(
+        modified_files = run(
             ["git", "ls-files", "--modified"],
             capture_output=True,
             text=True,
@@ -88,7 +85,7 @@ def add_tracked_files(ask_for_enter=True):
         # Si se seleccionó "Add all files"
         if len(selected_indices) == 1 and selected_indices[0] == len(menu_options) - 2:
             print(f"\n{YELLOW}Adding all files...{ENDC}")
-            subprocess.run(["git", "add", "."], check=True)
+            run(["git", "add", "."], check=True)
             print(f"\n{GREEN}All files have been added successfully.{ENDC}")
         else:
             # Filtrar las opciones que no son archivos (Add all, Cancel)
@@ -98,7 +95,7 @@ def add_tracked_files(ask_for_enter=True):
                 print(f"\n{YELLOW}Adding selected files...{ENDC}")
                 for file in selected_files:
                     print(f"  Adding: {file}")
-                    subprocess.run(["git", "add", file], check=True)
+                    run(["git", "add", file], check=True)
                 print(f"\n{GREEN}Selected file(s) have been added successfully.{ENDC}")
             else:
                 print(f"\n{YELLOW}No files were selected.{ENDC}")
@@ -125,12 +122,12 @@ def add_expanded_files(ask_for_enter=True):
 
         # Ejecutar git add --all
         print(f"\n{YELLOW}Adding all files, including untracked files...{ENDC}")
-        subprocess.run(["git", "add", "--all"], check=True)
+        run(["git", "add", "--all"], check=True)
         print(f"\n{GREEN}All files have been added successfully.{ENDC}")
 
         # Mostrar qué archivos se han añadido
         print(f"\n{BLUE}Added files:{ENDC}")
-        subprocess.run(["git", "status", "-s"], check=True)
+        run(["git", "status", "-s"], check=True)
 
         # Solo mostrar mensaje y esperar tecla si se solicita explícitamente
         if ask_for_enter:
@@ -152,17 +149,12 @@ def add_local_branch(ask_for_enter=False):
         print(f"\n{BLUE}Add Local Branch:{ENDC}")
 
         # Obtener las ramas actuales para mostrarlas como referencia
-        current_branch = subprocess.run(
-            ["git", "--no-pager","branch", "--show-current"],
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout.strip()
+        current_branch = get_current_branch()
 
         print(f"\n{YELLOW}Current branch: {current_branch}{ENDC}")
 
         print(f"\n{BLUE}Existing branches:{ENDC}")
-        subprocess.run(["git", "--no-pager", "branch", "--color=always"], check=True)
+        run(["git", "--no-pager", "branch", "--color=always"], check=True)
 
         # Solicitar el nombre de la nueva rama
         print(f"\n{YELLOW}Enter the name for the new branch (leave empty to cancel):{ENDC}")
@@ -173,14 +165,7 @@ def add_local_branch(ask_for_enter=False):
             return
 
         # Verificar si la rama ya existe
-        existing_branches = subprocess.run(
-            ["git", "branch"],
-            capture_output=True,
-            text=True,
-            check=True
-        ).stdout
-
-        branch_exists = any(line.strip().replace("*", "").strip() == branch_name for line in existing_branches.split('\n') if line)
+        branch_exists = local_branch_exists(branch_name)
 
         if branch_exists:
             print(f"\n{RED}A branch with the name '{branch_name}' already exists.{ENDC}")
@@ -188,7 +173,7 @@ def add_local_branch(ask_for_enter=False):
 
         # Crear la nueva rama
         print(f"\n{YELLOW}Creating new branch: {branch_name}...{ENDC}")
-        subprocess.run(["git", "branch", branch_name], check=True)
+        run(["git", "branch", branch_name], check=True)
         print(f"\n{GREEN}Branch '{branch_name}' created successfully.{ENDC}")
 
         # Preguntar si quiere moverse a la nueva rama
@@ -197,7 +182,7 @@ def add_local_branch(ask_for_enter=False):
 
         if switch_choice == 'y':
             print(f"\n{YELLOW}Switching to branch: {branch_name}...{ENDC}")
-            subprocess.run(["git", "checkout", branch_name], check=True)
+            run(["git", "checkout", branch_name], check=True)
             print(f"\n{GREEN}Switched to branch '{branch_name}' successfully.{ENDC}")
         else:
             print(f"\n{YELLOW}Staying on current branch: {current_branch}{ENDC}")
@@ -213,7 +198,7 @@ def add_local_repo(ask_for_enter=True):
         # Verificar si ya estamos en un repositorio git
         is_already_repo = False
         try:
-            subprocess.run(
+            run(
                 ["git", "rev-parse", "--is-inside-work-tree"],
                 capture_output=True,
                 check=True
@@ -229,11 +214,11 @@ def add_local_repo(ask_for_enter=True):
             pass
 
         print(f"\n{YELLOW}Initializing new Git repository in the current directory...{ENDC}")
-        subprocess.run(["git", "init"], check=True)
+        run(["git", "init"], check=True)
         print(f"\n{GREEN}Git repository initialized successfully.{ENDC}")
 
         # Verificar si hay archivos que podrían ser añadidos
-        status = subprocess.run(
+        status = run(
             ["git", "status", "-s"],
             capture_output=True,
             text=True,
@@ -242,7 +227,7 @@ def add_local_repo(ask_for_enter=True):
 
         if status:
             print(f"\n{BLUE}Files that can be added to the repository:{ENDC}")
-            subprocess.run(["git", "status", "-s"], check=True)
+            run(["git", "status", "-s"], check=True)
 
             # Preguntar si quiere añadir todos los archivos
             print(f"\n{YELLOW}Do you want to add all files to the repository? (y/n):{ENDC}")
@@ -250,7 +235,7 @@ def add_local_repo(ask_for_enter=True):
 
             if add_all_choice == 'y':
                 print(f"\n{YELLOW}Adding all files...{ENDC}")
-                subprocess.run(["git", "add", "."], check=True)
+                run(["git", "add", "."], check=True)
                 print(f"\n{GREEN}All files have been added successfully.{ENDC}")
 
                 # Preguntar si quiere hacer el commit inicial
@@ -265,7 +250,7 @@ def add_local_repo(ask_for_enter=True):
                         commit_message = "Initial commit"
 
                     print(f"\n{YELLOW}Creating initial commit...{ENDC}")
-                    subprocess.run(["git", "commit", "-m", commit_message], check=True)
+                    run(["git", "commit", "-m", commit_message], check=True)
                     print(f"\n{GREEN}Initial commit created successfully.{ENDC}")
         else:
             print(f"\n{YELLOW}No files found in the directory to add to the repository.{ENDC}")
@@ -312,7 +297,7 @@ def add_empty_repo(ask_for_enter=True):
 
         # Crear el repositorio bare
         print(f"\n{YELLOW}Initializing new bare Git repository in '{repo_name}'...{ENDC}")
-        subprocess.run(["git", "init", "--bare", repo_name], check=True)
+        run(["git", "init", "--bare", repo_name], check=True)
         print(f"\n{GREEN}Empty Git repository initialized successfully in '{repo_name}'.{ENDC}")
 
         # Mostrar mensaje final y esperar que el usuario presione una tecla
@@ -328,6 +313,7 @@ def add_empty_repo(ask_for_enter=True):
 
 def add_remote_repo(ask_for_enter=True):
     """Crea un nuevo repositorio remoto en GitHub"""
+    from .github_ops import create_github_repository, get_github_token, get_github_username
     try:
         print(f"\n{BLUE}Add Remote Repo:{ENDC}")
 
@@ -380,7 +366,7 @@ def add_remote_repo(ask_for_enter=True):
 
                 if connect_choice == 'y':
                     print(f"\n{YELLOW}Connecting to remote repository...{ENDC}")
-                    subprocess.run(["git", "remote", "add", "origin", repo_url], check=True)
+                    run(["git", "remote", "add", "origin", repo_url], check=True)
                     print(f"\n{GREEN}Remote repository connected successfully.{ENDC}")
 
                     # Preguntar si quiere hacer push
@@ -388,15 +374,10 @@ def add_remote_repo(ask_for_enter=True):
                     push_choice = get_single_keypress().lower()
 
                     if push_choice == 'y':
-                        current_branch = subprocess.run(
-                            ["git", "branch", "--show-current"],
-                            capture_output=True,
-                            text=True,
-                            check=True
-                        ).stdout.strip()
+                        current_branch = get_current_branch()
 
                         print(f"\n{YELLOW}Pushing to remote repository...{ENDC}")
-                        subprocess.run(["git", "push", "-u", "origin", current_branch], check=True)
+                        run(["git", "push", "-u", "origin", current_branch], check=True)
                         print(f"\n{GREEN}Successfully pushed to remote repository.{ENDC}")
 
         # Mostrar mensaje final y esperar que el usuario presione una tecla
@@ -420,14 +401,14 @@ def add_all_files(ask_for_enter=True):
         print(f"\n{BLUE}Add All Files:{ENDC}")
 
         # Verificar si hay archivos para añadir
-        untracked = subprocess.run(
+        untracked = run(
             ["git", "ls-files", "--others", "--exclude-standard"],
             capture_output=True,
             text=True,
             check=True
         ).stdout.strip()
 
-        modified = subprocess.run(
+        modified = run(
             ["git", "ls-files", "--modified"],
             capture_output=True,
             text=True,
@@ -443,7 +424,7 @@ def add_all_files(ask_for_enter=True):
 
         # Añadir todos los archivos sin preguntar
         print(f"\n{YELLOW}Adding all files...{ENDC}")
-        subprocess.run(["git", "add", "."], check=True)
+        run(["git", "add", "."], check=True)
         print(f"\n{GREEN}All files have been added successfully.{ENDC}")
 
         # Solo mostrar mensaje y esperar tecla si se solicita explícitamente
@@ -459,6 +440,7 @@ def add_all_files(ask_for_enter=True):
 
 def add_menu_options():
     """Muestra el menú de opciones para añadir archivos"""
+    from simple_term_menu import TerminalMenu
     is_repo = is_git_repo()
 
     while True:
@@ -466,54 +448,7 @@ def add_menu_options():
 
         # Solo mostrar status y último commit si estamos en un repositorio git
         if is_repo:
-            print(f"\n{BLUE}Overall Status:{ENDC}")
-            try:
-                # Capturar la salida para verificar si hay cambios
-                result = subprocess.run(
-                    ["git", "status", "-s"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                status = result.stdout.strip()
-
-                if status:
-                    # Ejecutar directamente para preservar colores
-                    subprocess.run(["git", "status", "-s"], check=True)
-                else:
-                    print("Working tree clean")
-            except Exception as e:
-                print(f"Error getting status: {e}")
-
-            # Obtener el último commit
-            try:
-                # Primero verificar si hay commits
-                has_commits = subprocess.run(
-                    ["git", "rev-parse", "--verify", "HEAD"],
-                    capture_output=True,
-                    text=True
-                ).returncode == 0
-
-                if has_commits:
-                    result = subprocess.run(
-                        ["git", "log", "-1", "--pretty=format:%C(yellow)● %h %C(blue)► %C(white)%s %C(magenta)(%cr)", "--color=always"],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    last_commit = result.stdout.strip()
-
-                    if last_commit:
-                        print(f"\n{BLUE}Last Commit:{ENDC}")
-                        print(last_commit)
-                        print()  # Añadir línea en blanco después del commit
-                else:
-                    print(f"\n{YELLOW}No commits yet in this repository.{ENDC}")
-                    print()  # Añadir línea en blanco
-            except Exception as e:
-                # No mostrar el error, solo manejar silenciosamente esta situación
-                print(f"\n{YELLOW}No commit history available.{ENDC}")
-                print()  # Añadir línea en blanco
+            print_status_header()
         else:
             # Mensaje amigable para indicar que no estamos en un repositorio
             print(f"\n{YELLOW}Not in a Git repository. You can create one with 'Add Local Repo'.{ENDC}\n")
@@ -557,43 +492,43 @@ def add_menu_options():
 
         # Si se presionó la barra espaciadora, volvemos al menú anterior
         if chosen_key == " ":
-            clear_screen()
+            clear_terminal()
             return
 
         # Procesamos la selección según si estamos en un repo o no
         if is_repo:
             if menu_entry_index == 0 or chosen_key == "a":
                 add_all_files(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 1 or chosen_key == "t":
                 add_tracked_files(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 2 or chosen_key == "x":
                 add_expanded_files(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 3 or chosen_key == "b":
                 add_local_branch()
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 4 or chosen_key == "l":
                 add_local_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 # Verificar si ahora estamos en un repo después de crear uno
                 is_repo = is_git_repo()
                 continue
             elif menu_entry_index == 5 or chosen_key == "r":
                 add_remote_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 6 or chosen_key == "0":
                 add_empty_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 7:
-                clear_screen()
+                clear_terminal()
                 return
             elif menu_entry_index == 8 or chosen_key == "q":
                 quit()
@@ -602,20 +537,20 @@ def add_menu_options():
         else:
             if menu_entry_index == 0 or chosen_key == "l":
                 add_local_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 # Verificar si ahora estamos en un repo después de crear uno
                 is_repo = is_git_repo()
                 continue
             elif menu_entry_index == 1 or chosen_key == "r":
                 add_remote_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 2 or chosen_key == "0":
                 add_empty_repo(ask_for_enter=True)
-                clear_screen()
+                clear_terminal()
                 continue
             elif menu_entry_index == 3:
-                clear_screen()
+                clear_terminal()
                 return
             elif menu_entry_index == 4 or chosen_key == "q":
                 quit()
@@ -1,15 +1,11 @@
 # ADVANCED OPERATIONS
-import subprocess
 from simple_term_menu import TerminalMenu
 from .utils import YELLOW, GREEN, ENDC
 from .checks import is_git_repo, print_not_git_repo, current_branch
 from .constants import MENU_CURSOR, MENU_CURSOR_STYLE
-import os
+from .runner import run
+from .render import clear_screen
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 def advanced_operations():
     while True:
@@ -24,6 +20,7 @@ def advanced_operations():
             "Cherry-pick (select specific commits)",
             "Interactive rebase (reorganize/edit commits)",
             "See Log (view commit history)",
+            "Optimize repository (commit-graph, multi-pack-index, bitmaps)",
             "Return to main menu"
         ]
 
@@ -50,6 +47,9 @@ def advanced_operations():
         elif choice == 6:
             check_log()
         elif choice == 7:
+            from .optimize import optimize_repository
+            optimize_repository()
+        elif choice == 8:
             clear_screen()
             break
 
@@ -91,7 +91,7 @@ def reset_operations():
             return
     elif reset_option == "3":
         # Show recent commits for reference
-        subprocess.run(["git", "--no-pager", "log", "--oneline", "-n", "10"])
+        run(["git", "--no-pager", "log", "--oneline", "-n", "10"])
         reset_target = input("\nEnter the commit hash: ")
     else:
         print("Invalid option. Operation cancelled.")
@@ -107,7 +107,7 @@ def reset_operations():
     # Execute the corresponding reset
     reset_type = ["--soft", "--mixed", "--hard"][choice]
     try:
-        result = subprocess.run(
+        result = run(
             ["git", "reset", reset_type, reset_target],
             capture_output=True,
             text=True
@@ -131,7 +131,7 @@ def clean_untracked_files():
 
     # Show untracked files
     print("\nUntracked files:")
-    subprocess.run(["git", "ls-files", "--others", "--exclude-standard"])
+    run(["git", "ls-files", "--others", "--exclude-standard"])
 
     menu_options = [
         "Interactive mode (select files to delete)",
@@ -149,7 +149,7 @@ def clean_untracked_files():
     # Confirm the operation
     if choice == 0:
         print("Starting interactive mode...")
-        subprocess.run(["git", "clean", "-i"])
+        run(["git", "clean", "-i"])
     else:
         # For options 1 and 2, ask for explicit confirmation
         clean_message = "all untracked files"
@@ -164,7 +164,7 @@ def clean_untracked_files():
         confirm = input(f"{YELLOW}Are you sure you want to delete {clean_message}? This action cannot be undone. (y/n): {ENDC}").lower()
         if confirm == "y":
             try:
-                result = subprocess.run(clean_command, capture_output=True, text=True)
+                result = run(clean_command, capture_output=True, text=True)
                 if result.returncode == 0:
                     print(f"{GREEN}Cleaning completed successfully.{ENDC}")
                 else:
@@ -211,7 +211,7 @@ def force_push():
 
     # Execute the force push
     try:
-        result = subprocess.run(
+        result = run(
             ["git", "push", push_option, "origin", branch],
             capture_output=True,
             text=True
@@ -244,9 +244,9 @@ def stash_operations():
         message = input("Descriptive message for the stash (optional): ")
         try:
             if message:
-                result = subprocess.run(["git", "stash", "push", "-m", message], capture_output=True, text=True)
+                result = run(["git", "stash", "push", "-m", message], capture_output=True, text=True)
             else:
-                result = subprocess.run(["git", "stash", "push"], capture_output=True, text=True)
+                result = run(["git", "stash", "push"], capture_output=True, text=True)
 
             if result.returncode == 0:
                 if "No local changes to save" in result.stdout:
@@ -260,7 +260,7 @@ def stash_operations():
 
     elif choice == 1:  # List stashes
         try:
-            result = subprocess.run(["git", "stash", "list"], capture_output=True, text=True)
+            result = run(["git", "stash", "list"], capture_output=True, text=True)
             if result.stdout.strip():
                 print("\nSaved stashes:")
                 print(result.stdout)
@@ -272,7 +272,7 @@ def stash_operations():
     elif choice in [2, 3]:  # Apply stash
         # First list available stashes
         try:
-            stash_list = subprocess.run(["git", "stash", "list"], capture_output=True, text=True).stdout.strip()
+            stash_list = run(["git", "stash", "list"], capture_output=True, text=True).stdout.strip()
 
             if not stash_list:
                 print("No saved stashes.")
@@ -289,10 +289,10 @@ def stash_operations():
                 return
 
             if choice == 2:  # Apply keeping
-                result = subprocess.run(["git", "stash", "apply", stash_ref], capture_output=True, text=True)
+                result = run(["git", "stash", "apply", stash_ref], capture_output=True, text=True)
                 success_message = "Stash applied successfully and kept in the list."
             else:  # choice == 3, apply and drop
-                result = subprocess.run(["git", "stash", "pop", stash_ref], capture_output=True, text=True)
+                result = run(["git", "stash", "pop", stash_ref], capture_output=True, text=True)
                 success_message = "Stash applied successfully and removed from the list."
 
             if result.returncode == 0:
@@ -304,7 +304,7 @@ def stash_operations():
 
     elif choice == 4:  # Delete specific stash
         try:
-            stash_list = subprocess.run(["git", "stash", "list"], capture_output=True, text=True).stdout.strip()
+            stash_list = run(["git", "stash", "list"], capture_output=True, text=True).stdout.strip()
 
             if not stash_list:
                 print("No saved stashes.")
@@ -325,7 +325,7 @@ def stash_operations():
                 print("Operation cancelled.")
                 return
 
-            result = subprocess.run(["git", "stash", "drop", stash_ref], capture_output=True, text=True)
+            result = run(["git", "stash", "drop", stash_ref], capture_output=True, text=True)
             if result.returncode == 0:
                 print(f"{GREEN}Stash deleted successfully.{ENDC}")
             else:
@@ -340,7 +340,7 @@ def stash_operations():
             return
 
         try:
-            result = subprocess.run(["git", "stash", "clear"], capture_output=True, text=True)
+            result = run(["git", "stash", "clear"], capture_output=True, text=True)
             print(f"{GREEN}All stashes have been deleted.{ENDC}")
         except Exception as e:
             print(f"Error deleting stashes: {e}")
@@ -354,7 +354,7 @@ def cherry_pick_commits():
     # Show latest commits to select from
     print("\nLatest available commits:")
     try:
-        subprocess.run(["git", "--no-pager", "log", "--oneline", "-n", "20"])
+        run(["git", "--no-pager", "log", "--oneline", "-n", "20"])
     except Exception as e:
         print(f"Error showing commits: {e}")
         return
@@ -389,7 +389,7 @@ def cherry_pick_commits():
 
     # Execute cherry-pick
     try:
-        result = subprocess.run(cherry_pick_cmd, capture_output=True, text=True)
+        result = run(cherry_pick_cmd, capture_output=True, text=True)
 
         if result.returncode == 0:
             print(f"{GREEN}Cherry-pick completed successfully.{ENDC}")
@@ -414,7 +414,7 @@ def cherry_pick_commits():
                     print("Continue resolving conflicts manually in your editor.")
                     print("After resolving them, use 'git add' for the modified files and 'git cherry-pick --continue'.")
                 elif conflict_choice == 1:
-                    abort_result = subprocess.run(["git", "cherry-pick", "--abort"], capture_output=True, text=True)
+                    abort_result = run(["git", "cherry-pick", "--abort"], capture_output=True, text=True)
                     if abort_result.returncode == 0:
                         print(f"{GREEN}Cherry-pick aborted. Previous state has been restored.{ENDC}")
                     else:
@@ -429,7 +429,7 @@ def interactive_rebase():
     # Show recent commits for reference
     print("\nRecent commits:")
     try:
-        subprocess.run(["git", "--no-pager", "log", "--oneline", "-n", "10"])
+        run(["git", "--no-pager", "log", "--oneline", "-n", "10"])
     except Exception as e:
         print(f"Error displaying commits: {e}")
         return
@@ -479,7 +479,7 @@ def interactive_rebase():
 
     try:
         # The -i flag indicates interactive rebase
-        result = subprocess.run(["git", "rebase", "-i", rebase_target])
+        result = run(["git", "rebase", "-i", rebase_target])
 
         # The result will depend on user interaction with the editor
         if result.returncode == 0:
@@ -499,7 +499,7 @@ def check_log():
     # Show commit history
     print("\nCommit history:")
     try:
-        subprocess.run(["git", "--no-pager", "log", "--oneline", "-n", "20"])
+        run(["git", "--no-pager", "log", "--oneline", "-n", "20"])
     except Exception as e:
         print(f"Error showing commit history: {e}")
 
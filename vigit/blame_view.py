@@ -0,0 +1,508 @@
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+
+from .utils import BLUE, ORANGE, DARK_BLUE, CYAN, MAGENTA, GREEN, YELLOW, RED, ENDC
+from .checks import is_git_repo, print_not_git_repo, has_commits, repository_paths
+from .objects import get_object_reader
+from .render import screen, is_tty, read_key, terminal_size, fit
+from .runner import run, popen
+
+DIM = "\033[2m"
+
+# Seconds between redraws while attributions are still arriving
+REFRESH_INTERVAL = 0.1
+
+# Cached blames of the same file looked at when blaming it at a new commit
+BASE_CANDIDATES = 5
+
+# Beyond this many -L ranges the remaining lines are blamed with the whole file
+MAX_RANGES = 100
+
+HUNK_RANGES = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class BlameCommit:
+    """What the blame view shows about the commit a line comes from."""
+
+    def __init__(self, author="", author_time=0, summary="", filename="", previous=None, boundary=False):
+        self.author = author
+        self.author_time = author_time
+        self.summary = summary
+        self.filename = filename
+        self.previous = previous
+        self.boundary = boundary
+
+    @classmethod
+    def from_fields(cls, fields):
+        previous = fields.get("previous")
+        return cls(
+            fields.get("author", ""),
+            int(fields.get("author-time", 0) or 0),
+            fields.get("summary", ""),
+            fields.get("filename", ""),
+            tuple(previous.split(" ", 1)) if previous else None,
+            "boundary" in fields
+        )
+
+    def to_list(self):
+        return [self.author, self.author_time, self.summary, self.filename,
+                list(self.previous) if self.previous else None, self.boundary]
+
+    @classmethod
+    def from_list(cls, values):
+        author, author_time, summary, filename, previous, boundary = values
+        return cls(author, author_time, summary, filename, tuple(previous) if previous else None, boundary)
+
+
+class Blame:
+    """
+    One file at one commit and, for each of its lines, the (commit, line in
+    that commit's version) it comes from. Lines start unattributed and are
+    filled from the cache, from a related blame or from git as results
+    arrive, so the view can be drawn at any point.
+    """
+
+    def __init__(self, commit, path, blob, lines):
+        self.commit = commit
+        self.path = path
+        self.blob = blob
+        self.lines = lines
+        self.owners = [None] * len(lines)
+        self.commits = {}
+        self.attributed = 0
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def complete(self):
+        return self.attributed == len(self.lines)
+
+    def note(self, oid, fields):
+        """Keeps the commit details git sends the first time it reports a commit."""
+        if oid not in self.commits and "author" in fields:
+            self.commits[oid] = BlameCommit.from_fields(fields)
+
+    def assign(self, oid, orig_line, final_line, count):
+        for offset in range(count):
+            index = final_line - 1 + offset
+            if 0 <= index < len(self.owners) and self.owners[index] is None:
+                self.owners[index] = (oid, orig_line + offset)
+                self.attributed += 1
+
+    def missing_ranges(self):
+        """1-based (start, end) ranges of the lines not attributed yet."""
+        ranges = []
+        start = None
+        for number, owner in enumerate(self.owners, 1):
+            if owner is None and start is None:
+                start = number
+            elif owner is not None and start is not None:
+                ranges.append((start, number - 1))
+                start = None
+        if start is not None:
+            ranges.append((start, len(self.owners)))
+        return ranges
+
+    def groups(self):
+        """Owners as [oid, orig_line, final_line, count] runs, the way git reports them."""
+        groups = []
+        for number, (oid, orig_line) in enumerate(self.owners, 1):
+            last = groups[-1] if groups else None
+            if last and last[0] == oid and last[1] + last[3] == orig_line and last[2] + last[3] == number:
+                last[3] += 1
+            else:
+                groups.append([oid, orig_line, number, 1])
+        return groups
+
+
+def parse_incremental(lines):
+    """(oid, orig_line, final_line, count, fields) per group of `git blame --incremental` output."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\n")
+        if current is None:
+            parts = line.split(" ")
+            if len(parts) < 4:
+                continue
+            current = (parts[0], int(parts[1]), int(parts[2]), int(parts[3]), {})
+            continue
+        key, _, value = line.partition(" ")
+        current[4][key] = value
+        # Every group ends with its filename
+        if key == "filename":
+            yield current
+            current = None
+
+
+class BlameCache:
+    """
+    Finished blames in the commit index database, keyed by (commit, path,
+    blob). A blame at a commit never changes, so rows are only added.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS blame (
+                oid TEXT NOT NULL,
+                path TEXT NOT NULL,
+                blob TEXT NOT NULL,
+                created REAL NOT NULL,
+                commits TEXT NOT NULL,
+                groups TEXT NOT NULL,
+                PRIMARY KEY (oid, path, blob)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS blame_path ON blame (path, created);
+        """)
+
+    def load(self, commit, path, blob, lines=None):
+        """
+        The cached Blame, or None. Without lines only the owners are filled,
+        which is all that is needed to reuse them.
+        """
+        row = self.db.execute("SELECT commits, groups FROM blame WHERE oid = ? AND path = ? AND blob = ?",
+                              (commit, path, blob)).fetchone()
+        if row is None:
+            return None
+        commits, groups = json.loads(row[0]), json.loads(row[1])
+        blame = Blame(commit, path, blob, lines if lines is not None else [""] * sum(group[3] for group in groups))
+        blame.commits.update((oid, BlameCommit.from_list(values)) for oid, values in commits.items())
+        for oid, orig_line, final_line, count in groups:
+            blame.assign(oid, orig_line, final_line, count)
+        blame.done.set()
+        return blame
+
+    def store(self, blame):
+        owners = {oid for oid, _ in blame.owners}
+        commits = {oid: info.to_list() for oid, info in blame.commits.items() if oid in owners}
+        self.db.execute("INSERT OR REPLACE INTO blame VALUES (?, ?, ?, ?, ?, ?)",
+                        (blame.commit, blame.path, blame.blob, time.time(), json.dumps(commits),
+                         json.dumps(blame.groups())))
+        self.db.commit()
+
+    def recent(self, path, exclude):
+        """(commit, blob) of the latest cached blames of path, newest first."""
+        rows = self.db.execute("SELECT oid, blob FROM blame WHERE path = ? AND oid != ? ORDER BY created DESC LIMIT ?",
+                               (path, exclude, BASE_CANDIDATES))
+        return rows.fetchall()
+
+
+def _blame_process(args, path, cwd):
+    return popen(["git", "blame", "--incremental", *args, "--", path],
+                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors="replace", cwd=cwd)
+
+def _read_groups(process, accept):
+    """
+    Passes every group git reports to accept(oid, orig_line, final_line,
+    count, fields) until git exits. Returns git's error, if it failed.
+    """
+    try:
+        for group in parse_incremental(process.stdout):
+            accept(*group)
+    finally:
+        process.stdout.close()
+        error = process.stderr.read().strip()
+        process.stderr.close()
+    if process.wait() != 0:
+        return error.splitlines()[-1] if error else "git blame failed"
+    return None
+
+
+def fill_from_base(blame, base, toplevel):
+    """
+    Blames only the commits after base, an ancestor whose blame of the same
+    file is cached: git reports the lines that come from base or older as
+    boundary lines at base, and their owners are read from base's blame.
+    """
+    # Only the first group of a commit carries its details, "boundary" included
+    boundaries = set()
+
+    def accept(oid, orig_line, final_line, count, fields):
+        if "boundary" in fields:
+            boundaries.add(oid)
+        if oid not in boundaries:
+            blame.note(oid, fields)
+            blame.assign(oid, orig_line, final_line, count)
+        elif oid == base.commit and fields.get("filename") == base.path:
+            for offset in range(count):
+                owner = base.owners[orig_line - 1 + offset] if orig_line - 1 + offset < len(base.owners) else None
+                if owner is not None:
+                    blame.commits.setdefault(owner[0], base.commits.get(owner[0], BlameCommit()))
+                    blame.assign(owner[0], owner[1], final_line + offset, 1)
+        # Other boundaries (history merged in from before base) are left for fill_missing()
+
+    _read_groups(_blame_process([f"{base.commit}..{blame.commit}"], blame.path, toplevel), accept)
+
+def fill_from_child(blame, child, toplevel):
+    """
+    Reuses the blame of a child commit for its parent: lines the child did
+    not change (outside the hunks of `git diff -U0 parent child`) have the
+    same owner in both.
+    """
+    result = run(["git", "diff", "-U0", "--no-color", "--no-ext-diff", "--diff-algorithm=myers",
+                  blame.blob, child.blob], capture_output=True, text=True, errors="replace", cwd=toplevel)
+    if result.returncode not in (0, 1):
+        return
+    hunks = []
+    for line in result.stdout.split("\n"):
+        match = HUNK_RANGES.match(line)
+        if match:
+            old_start, old_count, new_start, new_count = match.groups()
+            old_count = 1 if old_count is None else int(old_count)
+            new_count = 1 if new_count is None else int(new_count)
+            # -U0 gives the line before the change as the start of an empty side
+            hunks.append((int(old_start) + (1 if old_count == 0 else 0), old_count,
+                          int(new_start) + (1 if new_count == 0 else 0), new_count))
+
+    def reuse(parent_line, child_line, count):
+        for offset in range(count):
+            owner = child.owners[child_line - 1 + offset]
+            if owner is not None and owner[0] != child.commit:
+                blame.commits.setdefault(owner[0], child.commits.get(owner[0], BlameCommit()))
+                blame.assign(owner[0], owner[1], parent_line + offset, 1)
+
+    parent_line = child_line = 1
+    for old_start, old_count, new_start, new_count in hunks:
+        reuse(parent_line, child_line, old_start - parent_line)
+        parent_line, child_line = old_start + old_count, new_start + new_count
+    reuse(parent_line, child_line, len(blame.lines) - parent_line + 1)
+
+def fill_missing(blame, toplevel):
+    """Blames whatever is still unattributed, only those line ranges when there are few."""
+    ranges = blame.missing_ranges()
+    if not ranges:
+        return
+    whole_file = ranges == [(1, len(blame.lines))] or len(ranges) > MAX_RANGES
+    args = [] if whole_file else [f"-L{start},{end}" for start, end in ranges]
+    process = _blame_process([*args, blame.commit], blame.path, toplevel)
+
+    def accept(oid, orig_line, final_line, count, fields):
+        blame.note(oid, fields)
+        blame.assign(oid, orig_line, final_line, count)
+
+    blame.error = _read_groups(process, accept)
+
+
+class BlameSession:
+    """
+    Resolves files to blames and keeps the loaded ones, so walking back to a
+    newer commit is instant. Finished blames are stored in the BlameCache.
+    """
+
+    def __init__(self, toplevel):
+        from .commit_index import open_commit_index
+
+        self.toplevel = toplevel
+        self.loaded = {}
+        self.cache = None
+        index = open_commit_index()
+        if index is not None:
+            self.cache = BlameCache(index.db)
+            self.cache_path = index.path
+
+    def open(self, revision, path, child=None):
+        """
+        Blame of path (relative to the top of the repository) at revision,
+        filled by a background thread, or an error message. child is the
+        blame of a commit whose first parent is revision, to reuse from.
+        """
+        reader = get_object_reader()
+        commit_info, blob_info = reader.info_many([f"{revision}^{{commit}}", f"{revision}:{path}"])
+        if commit_info is None:
+            return f"{revision} is not a commit"
+        if blob_info is None or blob_info[1] != "blob":
+            return f"{path} does not exist at {revision[:12]}"
+        commit, blob = commit_info[0], blob_info[0]
+        if (commit, path) in self.loaded:
+            return self.loaded[(commit, path)]
+
+        content = reader.read(blob)[2]
+        if b"\0" in content[:8000]:
+            return f"{path} is a binary file"
+        # Split on "\n" alone, as git counts lines: splitlines() also breaks on
+        # \f, \v, \x85, \u2028... and would shift every line after them
+        lines = content.decode("utf-8", "replace").expandtabs(4).split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        lines = [line.removesuffix("\r") for line in lines]
+        blame = self.cache.load(commit, path, blob, lines) if self.cache is not None else None
+        if blame is None:
+            blame = Blame(commit, path, blob, lines)
+            base = self._base(blame) if child is None else None
+            threading.Thread(target=self._load, args=(blame, child, base), daemon=True).start()
+        self.loaded[(commit, path)] = blame
+        return blame
+
+    def _base(self, blame):
+        """The cached blame of the same file at the latest ancestor of blame.commit, if any."""
+        if self.cache is None:
+            return None
+        for commit, blob in self.cache.recent(blame.path, blame.commit):
+            result = run(["git", "merge-base", "--is-ancestor", commit, blame.commit],
+                         capture_output=True, cwd=self.toplevel)
+            if result.returncode == 0:
+                return self.cache.load(commit, blame.path, blob)
+        return None
+
+    def _load(self, blame, child, base):
+        try:
+            if child is not None:
+                fill_from_child(blame, child, self.toplevel)
+            elif base is not None:
+                fill_from_base(blame, base, self.toplevel)
+            fill_missing(blame, self.toplevel)
+            if blame.complete and self.cache is not None:
+                # SQLite connections cannot be shared between threads
+                from .commit_index import sqlite3
+                db = sqlite3.connect(self.cache_path, timeout=10)
+                try:
+                    BlameCache(db).store(blame)
+                finally:
+                    db.close()
+        except Exception as e:
+            blame.error = str(e)
+        finally:
+            blame.done.set()
+
+    def parent(self, blame):
+        """Blame of the same file at the first parent of blame.commit, reusing what did not change."""
+        if get_object_reader().info(f"{blame.commit}^") is None:
+            return f"{blame.commit[:8]} has no parent commit"
+        info = blame.commits.get(blame.commit)
+        path = info.previous[1] if info is not None and info.previous else blame.path
+        return self.open(f"{blame.commit}^", path, child=blame)
+
+
+def format_blame_line(blame, number, width, first_shown=0):
+    """One line of the view: commit, author and date on the first line of each run, then the text."""
+    owner = blame.owners[number]
+    previous = blame.owners[number - 1] if number > first_shown else None
+    if owner is None:
+        meta = f"{DIM}{'·' * 8} {'·' * 12} {'·' * 10}{ENDC}"
+    elif previous is not None and previous[0] == owner[0]:
+        meta = " " * 32
+    else:
+        info = blame.commits.get(owner[0], BlameCommit())
+        date = time.strftime("%Y-%m-%d", time.localtime(info.author_time)) if info.author_time else " " * 10
+        short = ("^" + owner[0][:7]) if info.boundary else owner[0][:8]
+        meta = f"{ORANGE}{short}{ENDC} {CYAN}{info.author[:12]:<12}{ENDC} {MAGENTA}{date}{ENDC}"
+    line = f"{meta} {DARK_BLUE}{number + 1:>5} │{ENDC} {blame.lines[number]}"
+    return fit(line, width) if width else line
+
+def format_blame_header(blame):
+    progress = "" if blame.complete else f" {DIM}({blame.attributed}/{len(blame.lines)} lines attributed){ENDC}"
+    return f"{BLUE}{blame.path}{ENDC} at {ORANGE}{blame.commit[:8]}{ENDC}{progress}"
+
+
+def browse_blame(session, blame):
+    """[j/k] line, [space/b] page, [g/G] first/last, [p] parent commit, [n] back to the newer one, [q] back."""
+    newer = []
+    top = 0
+    notice = ""
+    while True:
+        width, height = terminal_size()
+        page = height - 2
+        with screen():
+            print(format_blame_header(blame))
+            shown = range(top, min(top + page, len(blame.lines)))
+            for number in shown:
+                print(format_blame_line(blame, number, width, top))
+            print("\n" * (page - len(shown)), end="")
+            if blame.error:
+                notice = f"{RED}{blame.error}{ENDC}  "
+            print(f"{notice}{GREEN}[j/k] line  [space/b] page  [g/G] first/last  [p] parent commit  "
+                  f"[n] newer  [q] back{ENDC}", end="")
+
+        key = read_key(sequences=True, timeout=None if blame.done.is_set() else REFRESH_INTERVAL)
+        if key is None:
+            continue
+        notice = ""
+        last = max(0, len(blame.lines) - page)
+        if key in ("j", "\r", "\n", "\x1b[B", "\x1bOB"):
+            top = min(top + 1, last)
+        elif key in ("k", "\x1b[A", "\x1bOA"):
+            top = max(top - 1, 0)
+        elif key in (" ", "f", "\x1b[6~"):
+            top = min(top + page - 1, last)
+        elif key in ("b", "\x1b[5~"):
+            top = max(top - (page - 1), 0)
+        elif key in ("g", "\x1b[H"):
+            top = 0
+        elif key in ("G", "\x1b[F"):
+            top = last
+        elif key == "p":
+            parent = session.parent(blame)
+            if isinstance(parent, str):
+                notice = f"{YELLOW}{parent}{ENDC}  "
+            else:
+                newer.append((blame, top))
+                blame = parent
+                top = min(top, max(0, len(blame.lines) - page))
+        elif key == "n":
+            if newer:
+                blame, top = newer.pop()
+            else:
+                notice = f"{YELLOW}Already at the first commit blamed{ENDC}  "
+        elif key in ("q", "x", "\x1b", "\x03", ""):
+            break
+    print()
+
+def print_blame(blame):
+    """Prints each line as soon as it and every line above it are attributed (for pipes and redirects)."""
+    printed = 0
+    while printed < len(blame.lines):
+        finished = blame.done.wait(REFRESH_INTERVAL)
+        while printed < len(blame.lines) and (blame.owners[printed] is not None or finished):
+            print(format_blame_line(blame, printed, None))
+            printed += 1
+        sys.stdout.flush()
+    if blame.error:
+        print(f"{RED}{blame.error}{ENDC}")
+
+
+def _prompt(text):
+    print(f"{YELLOW}{text}{ENDC} ", end="", flush=True)
+    try:
+        return input().strip()
+    except EOFError:
+        return ""
+
+def blame_file(ask_for_enter=True):
+    """Muestra quién cambió por última vez cada línea de un archivo"""
+    import os
+
+    if not is_git_repo():
+        print_not_git_repo()
+        return
+    if not has_commits():
+        print(f"{YELLOW}No commits yet in this repository.{ENDC}")
+        return
+
+    print(f"\n{BLUE}Blame File:{ENDC}\n")
+    path = _prompt("File to blame:")
+    if not path:
+        print(f"{YELLOW}No file given.{ENDC}")
+        return
+    revision = _prompt("Revision (empty for HEAD):") or "HEAD"
+
+    toplevel, prefix = repository_paths()
+    path = os.path.normpath(os.path.join(prefix, path)).replace(os.sep, "/")
+    session = BlameSession(toplevel)
+    blame = session.open(revision, path)
+    if isinstance(blame, str):
+        print(f"{RED}{blame}{ENDC}")
+    elif is_tty() and is_tty(sys.stdin):
+        browse_blame(session, blame)
+        return
+    else:
+        print()
+        print(format_blame_header(blame))
+        print_blame(blame)
+
+    if ask_for_enter:
+        print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
+        read_key()
@@ -1,6 +1,5 @@
 import subprocess
 import sys
-import os
 
 from simple_term_menu import TerminalMenu
 
@@ -12,11 +11,8 @@ from .branx_local import branch_local, check_local_branches, create_local_branch
 from .branx_remote import branch_remote
 from .branx_manage import manage_branches
 from .advanced import advanced_operations
+from .render import clear_screen
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 def work_in_branches():
     if not is_git_repo():
@@ -1,16 +1,13 @@
 import subprocess
-import os
-from simple_term_menu import TerminalMenu
 from .utils import BG_BLUE, YELLOW, GREEN, ENDC, BOLD, BG_PURPLE, BLACK_TEXT, WHITE_TEXT
 from .constants import branch_local_menu, MENU_CURSOR, MENU_CURSOR_STYLE
-from .checks import is_git_repo, print_not_git_repo, current_branch, has_commits, print_not_commits
+from .checks import is_git_repo, print_not_git_repo, current_branch, has_commits, print_not_commits, format_local_branches, get_branch_upstream, get_last_commit
+from .runner import run
+from .render import clear_screen
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 def branch_local():
+    from simple_term_menu import TerminalMenu
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -61,12 +58,7 @@ def check_local_branches():
         print_not_commits()
         return
     try:
-        # Use --no-pager to prevent Git from using vi/less and capture the output to display it directly
-        result = subprocess.run(["git", "--no-pager", "branch"],
-                               capture_output=True,
-                               text=True)
-
-        branches = result.stdout.strip().split('\n')
+        branches = format_local_branches()
         for branch in branches:
             print(f"  {branch}")
     except Exception as e:
@@ -82,7 +74,7 @@ def create_local_branch():
 
     branch_name = input("Enter the name of the new branch: ")
     try:
-        subprocess.run(["git", "branch", branch_name])
+        run(["git", "branch", branch_name])
         print(f"Branch {branch_name} created successfully.")
     except Exception as e:
         print(f"Error creating branch {branch_name}: {e}")
@@ -93,8 +85,7 @@ def go_to_branch():
         return
 
     try:
-        result = subprocess.run(["git", "branch"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        branches = result.stdout.strip().split('\n')
+        branches = format_local_branches()
         if branches:
             print("Local branches:")
             for idx, branch in enumerate(branches, 1):
@@ -104,7 +95,7 @@ def go_to_branch():
                 selected_branch = branches[choice - 1].replace('*', '').strip()  # Remove the '*' which indicates the current branch
 
                 # Try to checkout the branch
-                checkout_result = subprocess.run(
+                checkout_result = run(
                     ["git", "checkout", selected_branch],
                     capture_output=True,
                     text=True
@@ -124,7 +115,7 @@ def go_to_branch():
                             commit_msg = input(f"\nCommit message: ")
 
                             # Add all changes
-                            add_result = subprocess.run(
+                            add_result = run(
                                 ["git", "add", "."],
                                 capture_output=True,
                                 text=True
@@ -135,7 +126,7 @@ def go_to_branch():
                                 return
 
                             # Commit
-                            commit_result = subprocess.run(
+                            commit_result = run(
                                 ["git", "commit", "-m", commit_msg],
                                 capture_output=True,
                                 text=True
@@ -148,7 +139,7 @@ def go_to_branch():
                             print(f"{GREEN}Commit successful.{ENDC}")
 
                             # Try to switch to the branch again
-                            checkout_result = subprocess.run(
+                            checkout_result = run(
                                 ["git", "checkout", selected_branch],
                                 capture_output=True,
                                 text=True
@@ -164,18 +155,11 @@ def go_to_branch():
                             # Show additional branch information
                             try:
                                 # Last commit on this branch
-                                last_commit = subprocess.run(
-                                    ["git", "log", "-1", "--oneline"],
-                                    capture_output=True,
-                                    text=True
-                                ).stdout.strip()
+                                commit = get_last_commit()
+                                last_commit = f"{commit.short_oid} {commit.subject}" if commit else ""
 
                                 # Branch tracking info
-                                tracking_info = subprocess.run(
-                                    ["git", "for-each-ref", "--format='%(upstream:short)'", f"refs/heads/{selected_branch}"],
-                                    capture_output=True,
-                                    text=True
-                                ).stdout.strip().replace("'", "")
+                                tracking_info = get_branch_upstream(selected_branch)
 
                                 print(f"{GREEN}Last commit:{ENDC} {last_commit if last_commit else 'No commits yet'}")
 
@@ -195,18 +179,11 @@ def go_to_branch():
                     # Show additional branch information
                     try:
                         # Last commit on this branch
-                        last_commit = subprocess.run(
-                            ["git", "log", "-1", "--oneline"],
-                            capture_output=True,
-                            text=True
-                        ).stdout.strip()
+                        commit = get_last_commit()
+                        last_commit = f"{commit.short_oid} {commit.subject}" if commit else ""
 
                         # Branch tracking info
-                        tracking_info = subprocess.run(
-                            ["git", "for-each-ref", "--format='%(upstream:short)'", f"refs/heads/{selected_branch}"],
-                            capture_output=True,
-                            text=True
-                        ).stdout.strip().replace("'", "")
+                        tracking_info = get_branch_upstream(selected_branch)
 
                         print(f"{GREEN}Last commit:{ENDC} {last_commit if last_commit else 'No commits yet'}")
 
@@ -233,7 +210,7 @@ def go_to_main():
 
     try:
         # Try to checkout main branch
-        checkout_result = subprocess.run(
+        checkout_result = run(
             ["git", "checkout", "main"],
             capture_output=True,
             text=True
@@ -253,7 +230,7 @@ def go_to_main():
                     commit_msg = input(f"\nCommit message: ")
 
                     # Add all changes
-                    add_result = subprocess.run(
+                    add_result = run(
                         ["git", "add", "."],
                         capture_output=True,
                         text=True
@@ -264,7 +241,7 @@ def go_to_main():
                         return
 
                     # Commit
-                    commit_result = subprocess.run(
+                    commit_result = run(
                         ["git", "commit", "-m", commit_msg],
                         capture_output=True,
                         text=True
@@ -277,7 +254,7 @@ def go_to_main():
                     print(f"{GREEN}Commit successful.{ENDC}")
 
                     # Try to switch to the branch again
-                    checkout_result = subprocess.run(
+                    checkout_result = run(
                         ["git", "checkout", "main"],
                         capture_output=True,
                         text=True
@@ -293,18 +270,11 @@ def go_to_main():
                     # Show additional branch information
                     try:
                         # Last commit on this branch
-                        last_commit = subprocess.run(
-                            ["git", "log", "-1", "--oneline"],
-                            capture_output=True,
-                            text=True
-                        ).stdout.strip()
+                        commit = get_last_commit()
+                        last_commit = f"{commit.short_oid} {commit.subject}" if commit else ""
 
                         # Branch tracking info
-                        tracking_info = subprocess.run(
-                            ["git", "for-each-ref", "--format='%(upstream:short)'", "refs/heads/main"],
-                            capture_output=True,
-                            text=True
-                        ).stdout.strip().replace("'", "")
+                        tracking_info = get_branch_upstream("main")
 
                         print(f"{GREEN}Last commit:{ENDC} {last_commit if last_commit else 'No commits yet'}")
 
@@ -324,18 +294,11 @@ def go_to_main():
             # Show additional branch information
             try:
                 # Last commit on this branch
-                last_commit = subprocess.run(
-                    ["git", "log", "-1", "--oneline"],
-                    capture_output=True,
-                    text=True
-                ).stdout.strip()
+                commit = get_last_commit()
+                last_commit = f"{commit.short_oid} {commit.subject}" if commit else ""
 
                 # Branch tracking info
-                tracking_info = subprocess.run(
-                    ["git", "for-each-ref", "--format='%(upstream:short)'", "refs/heads/main"],
-                    capture_output=True,
-                    text=True
-                ).stdout.strip().replace("'", "")
+                tracking_info = get_branch_upstream("main")
 
                 print(f"{GREEN}Last commit:{ENDC} {last_commit if last_commit else 'No commits yet'}")
 
@@ -355,8 +318,7 @@ def go_to_branch_force():
         return
 
     try:
-        result = subprocess.run(["git", "branch"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        branches = result.stdout.strip().split('\n')
+        branches = format_local_branches()
 
         if branches:
             print("Local branches:")
@@ -369,7 +331,7 @@ def go_to_branch_force():
                 selected_branch = branches[choice - 1].replace('*', '').strip()  # Remove the '*' which indicates the current branch
 
                 # Check if there are uncommitted changes
-                status_result = subprocess.run(
+                status_result = run(
                     ["git", "status", "--porcelain"],
                     stdout=subprocess.PIPE,
                     text=True
@@ -381,19 +343,19 @@ def go_to_branch_force():
 
                     if force_option == "1":
                         # Save to stash and switch
-                        subprocess.run(["git", "stash", "push", "-u", "-m", f"Automatic changes before switching to {selected_branch}"])
-                        subprocess.run(["git", "checkout", selected_branch])
+                        run(["git", "stash", "push", "-u", "-m", f"Automatic changes before switching to {selected_branch}"])
+                        run(["git", "checkout", selected_branch])
                         print(f"{GREEN}Changes saved to stash and switched to branch {selected_branch}.{ENDC}")
                         print("To recover your changes, use 'git stash pop' when you return to this branch.")
                     elif force_option == "2":
                         # Force switch discarding changes
-                        subprocess.run(["git", "checkout", "-f", selected_branch])
+                        run(["git", "checkout", "-f", selected_branch])
                         print(f"{GREEN}Switched to branch {selected_branch}. Uncommitted changes have been discarded.{ENDC}")
                     else:
                         print("Operation cancelled.")
                 else:
                     # No changes, switch normally
-                    subprocess.run(["git", "checkout", selected_branch])
+                    run(["git", "checkout", selected_branch])
                     print(f"{GREEN}Switched to branch {selected_branch}.{ENDC}")
             else:
                 print("Invalid option.")
@@ -1,9 +1,10 @@
-import subprocess
 from simple_term_menu import TerminalMenu
 from .utils import YELLOW, GREEN, ENDC
 from .constants import branch_lr_menu, branch_local_menu
 from .checks import is_git_repo, print_not_git_repo, current_branch, is_local_branch_connected_to_remote, has_commits, print_not_commits, is_current_branch_main
 from .menu import commit_and_push
+from .runner import run
+from .render import clear_screen
 
 def branch_local_to_remote():
     if is_current_branch_main():
@@ -62,7 +63,7 @@ def check_remote_branches():
 
     try:
         # Use --no-pager to prevent Git from using vi/less and capture the output to display it directly
-        result = subprocess.run(["git", "--no-pager", "branch", "-r"],
+        result = run(["git", "--no-pager", "branch", "-r"],
                                capture_output=True,
                                text=True)
 
@@ -84,7 +85,7 @@ def connect_local_branch_with_remote():
 
     remote_url = input("Enter the remote repository (GitHub) URL: ")
     try:
-        subprocess.run(["git", "branch", "--set-upstream-to", f"origin/{branch}", branch])
+        run(["git", "branch", "--set-upstream-to", f"origin/{branch}", branch])
         print(f"Connected local branch {branch} with remote: {remote_url}")
     except Exception as e:
         print(f"Error connecting local branch with remote: {e}")
@@ -96,9 +97,9 @@ def commit_in_local_branch():
         return
 
     try:
-        subprocess.run(["git", "add", "."])
+        run(["git", "add", "."])
         message = input("Enter commit message: ")
-        subprocess.run(["git", "commit", "-m", message])
+        run(["git", "commit", "-m", message])
     except Exception as e:
         print(f"Error committing in local branch: {e}")
 
@@ -110,7 +111,7 @@ def push_changes_to_remote_branch():
 
     try:
         # Try to do a normal push first
-        result = subprocess.run(
+        result = run(
             ["git", "push", "origin", branch],
             capture_output=True,
             text=True
@@ -129,7 +130,7 @@ def push_changes_to_remote_branch():
 
             if force_push == 'y':
                 print(f"{YELLOW}Executing force push...{ENDC}")
-                force_result = subprocess.run(
+                force_result = run(
                     ["git", "push", "--force", "origin", branch],
                     capture_output=True,
                     text=True
@@ -1,16 +1,14 @@
 from enum import Enum
 
-import os
-import subprocess
 import json
 import time
-from simple_term_menu import TerminalMenu
 from .utils import YELLOW, GREEN, ENDC, BOLD, BG_PURPLE, BLACK_TEXT, WHITE_TEXT, BG_BLUE
 from .constants import manage_branch_menu, branch_remote_menu, branch_local_menu, MENU_CURSOR, MENU_CURSOR_STYLE
-from .checks import is_git_repo, print_not_git_repo, current_branch, get_current_branch, has_commits, print_not_commits, is_current_branch_main, is_connected_to_remote, print_not_connected_to_remote
+from .checks import is_git_repo, print_not_git_repo, current_branch, get_current_branch, has_commits, print_not_commits, is_current_branch_main, is_connected_to_remote, print_not_connected_to_remote, get_local_branches, local_branch_exists
 from .branx_local import go_to_branch, go_to_main, create_local_branch
 from .branx_remote import check_remote_branches, connect_local_branch_with_remote
-from .menu import clear_screen
+from .render import clear_screen
+from .runner import run
 
 def handle_uncommitted_changes(target_branch):
     """
@@ -24,7 +22,7 @@ def handle_uncommitted_changes(target_branch):
         commit_msg = input(f"\nCommit message: ")
 
         # Add all changes
-        add_result = subprocess.run(
+        add_result = run(
             ["git", "add", "."],
             capture_output=True,
             text=True
@@ -35,7 +33,7 @@ def handle_uncommitted_changes(target_branch):
             return False
 
         # Commit
-        commit_result = subprocess.run(
+        commit_result = run(
             ["git", "commit", "-m", commit_msg],
             capture_output=True,
             text=True
@@ -48,7 +46,7 @@ def handle_uncommitted_changes(target_branch):
         print(f"{GREEN}Commit successful.{ENDC}")
 
         # Try to switch to the branch again
-        checkout_result = subprocess.run(
+        checkout_result = run(
             ["git", "checkout", target_branch],
             capture_output=True,
             text=True
@@ -88,7 +86,7 @@ def merge_with_main():
         original_branch = source_branch
 
         # Switch to target branch (main)
-        checkout_result = subprocess.run(
+        checkout_result = run(
             ["git", "checkout", target_branch],
             capture_output=True,
             text=True
@@ -105,7 +103,7 @@ def merge_with_main():
                 return
 
         # Perform the merge
-        merge_result = subprocess.run(
+        merge_result = run(
             ["git", "merge", source_branch, "--allow-unrelated-histories"],
             capture_output=True,
             text=True
@@ -118,7 +116,7 @@ def merge_with_main():
             # Ask if user wants to go back to original branch
             go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
             if go_back == 'y':
-                subprocess.run(["git", "checkout", original_branch])
+                run(["git", "checkout", original_branch])
                 print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
         else:
             # Handle merge conflicts
@@ -135,7 +133,7 @@ def merge_with_main():
 
             if choice == "1":
                 # Use "ours" strategy (keep target/main changes)
-                ours_result = subprocess.run(
+                ours_result = run(
                     ["git", "merge", "-X", "ours", source_branch],
                     capture_output=True,
                     text=True
@@ -147,17 +145,17 @@ def merge_with_main():
                     # Ask about returning to original branch
                     go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
                     if go_back == 'y':
-                        subprocess.run(["git", "checkout", original_branch])
+                        run(["git", "checkout", original_branch])
                         print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
                 else:
                     print(f"{YELLOW}Forced merge failed: {ours_result.stderr.strip()}{ENDC}")
                     # Return to original branch
-                    subprocess.run(["git", "checkout", original_branch])
+                    run(["git", "checkout", original_branch])
                     print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
             elif choice == "2":
                 # Use "theirs" strategy (keep source branch changes)
-                theirs_result = subprocess.run(
+                theirs_result = run(
                     ["git", "merge", "-X", "theirs", source_branch],
                     capture_output=True,
                     text=True
@@ -169,18 +167,18 @@ def merge_with_main():
                     # Ask about returning to original branch
                     go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
                     if go_back == 'y':
-                        subprocess.run(["git", "checkout", original_branch])
+                        run(["git", "checkout", original_branch])
                         print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
                 else:
                     print(f"{YELLOW}Forced merge failed: {theirs_result.stderr.strip()}{ENDC}")
                     # Return to original branch
-                    subprocess.run(["git", "checkout", original_branch])
+                    run(["git", "checkout", original_branch])
                     print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
             else:
                 print("Merge operation canceled.")
                 # Return to original branch
-                subprocess.run(["git", "checkout", original_branch])
+                run(["git", "checkout", original_branch])
                 print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
     except Exception as e:
@@ -188,7 +186,7 @@ def merge_with_main():
         # Try to return to the original branch in case of error
         try:
             original_branch = source_branch
-            subprocess.run(["git", "checkout", original_branch])
+            run(["git", "checkout", original_branch])
             print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
         except:
             pass
@@ -204,16 +202,7 @@ def merge_with_selected_branch():
         source_branch = current_branch()
 
         # Get all available branches
-        result = subprocess.run(["git", "branch"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        branches = result.stdout.strip().split('\n')
-
-        # Format branch names (remove asterisk from current branch)
-        formatted_branches = []
-        for branch in branches:
-            branch = branch.strip()
-            if branch.startswith('*'):
-                branch = branch[1:].strip()  # Remove asterisk and spaces
-            formatted_branches.append(branch)
+        formatted_branches = get_local_branches()
 
         # Remove current branch from the list
         if source_branch in formatted_branches:
@@ -251,7 +240,7 @@ def merge_with_selected_branch():
         print(f"\n{GREEN}Merging current branch '{source_branch}' into '{target_branch}'...{ENDC}")
 
         # Switch to target branch
-        checkout_result = subprocess.run(
+        checkout_result = run(
             ["git", "checkout", target_branch],
             capture_output=True,
             text=True
@@ -268,7 +257,7 @@ def merge_with_selected_branch():
                 return
 
         # Perform the merge
-        merge_result = subprocess.run(
+        merge_result = run(
             ["git", "merge", source_branch, "--allow-unrelated-histories"],
             capture_output=True,
             text=True
@@ -281,7 +270,7 @@ def merge_with_selected_branch():
             # Ask if user wants to go back to original branch
             go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
             if go_back == 'y':
-                subprocess.run(["git", "checkout", original_branch])
+                run(["git", "checkout", original_branch])
                 print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
         else:
             # Handle merge conflicts
@@ -298,7 +287,7 @@ def merge_with_selected_branch():
 
             if choice == "1":
                 # Use "ours" strategy (keep target branch changes)
-                ours_result = subprocess.run(
+                ours_result = run(
                     ["git", "merge", "-X", "ours", source_branch],
                     capture_output=True,
                     text=True
@@ -310,17 +299,17 @@ def merge_with_selected_branch():
                     # Ask about returning to original branch
                     go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
                     if go_back == 'y':
-                        subprocess.run(["git", "checkout", original_branch])
+                        run(["git", "checkout", original_branch])
                         print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
                 else:
                     print(f"{YELLOW}Forced merge failed: {ours_result.stderr.strip()}{ENDC}")
                     # Return to original branch
-                    subprocess.run(["git", "checkout", original_branch])
+                    run(["git", "checkout", original_branch])
                     print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
             elif choice == "2":
                 # Use "theirs" strategy (keep source branch changes)
-                theirs_result = subprocess.run(
+                theirs_result = run(
                     ["git", "merge", "-X", "theirs", source_branch],
                     capture_output=True,
                     text=True
@@ -332,18 +321,18 @@ def merge_with_selected_branch():
                     # Ask about returning to original branch
                     go_back = input(f"Do you want to go back to branch '{source_branch}'? (y/n): ").lower()
                     if go_back == 'y':
-                        subprocess.run(["git", "checkout", original_branch])
+                        run(["git", "checkout", original_branch])
                         print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
                 else:
                     print(f"{YELLOW}Forced merge failed: {theirs_result.stderr.strip()}{ENDC}")
                     # Return to original branch
-                    subprocess.run(["git", "checkout", original_branch])
+                    run(["git", "checkout", original_branch])
                     print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
             else:
                 print("Merge operation canceled.")
                 # Return to original branch
-                subprocess.run(["git", "checkout", original_branch])
+                run(["git", "checkout", original_branch])
                 print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
 
     except Exception as e:
@@ -351,7 +340,7 @@ def merge_with_selected_branch():
         # Try to return to the original branch in case of error
         try:
             original_branch = source_branch
-            subprocess.run(["git", "checkout", original_branch])
+            run(["git", "checkout", original_branch])
             print(f"{GREEN}Returned to branch '{original_branch}'.{ENDC}")
         except:
             pass
@@ -368,6 +357,7 @@ def show_all_branches():
 
 def add_branch_menu():
     """Submenú para añadir una rama"""
+    from simple_term_menu import TerminalMenu
     while True:
         print(f"\n{GREEN}Add Branch:{ENDC}")
 
@@ -415,7 +405,7 @@ def create_remote_branch():
             return
 
         # First, fetch to make sure we have the latest reference of the base branch
-        fetch_result = subprocess.run(
+        fetch_result = run(
             ["git", "fetch", "origin", base_branch],
             capture_output=True,
             text=True
@@ -426,7 +416,7 @@ def create_remote_branch():
             return
 
         # Create a remote branch based on the specified base branch
-        create_result = subprocess.run(
+        create_result = run(
             ["git", "push", "origin", f"origin/{base_branch}:refs/heads/{new_branch_name}"],
             capture_output=True,
             text=True
@@ -438,7 +428,7 @@ def create_remote_branch():
             # Ask if user wants to check out the new branch locally
             checkout_local = input(f"Do you want to check out this branch locally? (y/n): ").lower()
             if checkout_local == 'y':
-                checkout_result = subprocess.run(
+                checkout_result = run(
                     ["git", "checkout", "-b", new_branch_name, f"origin/{new_branch_name}"],
                     capture_output=True,
                     text=True
@@ -456,6 +446,7 @@ def create_remote_branch():
 
 def delete_branch_menu():
     """Submenú para eliminar una rama"""
+    from simple_term_menu import TerminalMenu
     while True:
         print(f"\n{GREEN}Delete Branch:{ENDC}")
 
@@ -494,8 +485,8 @@ def import_remote_branch():
 
     try:
         # Obtenemos la lista de ramas remotas
-        subprocess.run(["git", "fetch"])
-        result = subprocess.run(
+        run(["git", "fetch"])
+        result = run(
             ["git", "--no-pager", "branch", "-r"],
             capture_output=True,
             text=True
@@ -529,7 +520,7 @@ def import_remote_branch():
                 branch_name = selected_branch.split('/', 1)[1] if '/' in selected_branch else selected_branch
 
                 # Creamos una rama local que hace tracking de la remota
-                checkout_result = subprocess.run(
+                checkout_result = run(
                     ["git", "checkout", "--track", selected_branch],
                     capture_output=True,
                     text=True
@@ -547,6 +538,7 @@ def import_remote_branch():
         print(f"Error importing remote branch: {e}")
 
 def manage_branches():
+    from simple_term_menu import TerminalMenu
     while True:
         current = current_branch()
         branch_display = f"{WHITE_TEXT}{BG_BLUE}{BOLD} {current} {ENDC}"
@@ -599,28 +591,9 @@ def merge_branches():
 
     try:
         # Get all local branches
-        result = subprocess.run(
-            ["git", "branch"],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            print(f"{YELLOW}Error listing branches: {result.stderr.strip()}{ENDC}")
-            return
-
-        # Process the branch list
-        all_branches = []
+        all_branches = get_local_branches()
         current_branch_name = current_branch()
 
-        for branch in result.stdout.strip().split('\n'):
-            branch = branch.strip()
-            if branch.startswith('*'):
-                branch = branch[2:]  # Remove the * and space
-
-            if branch:
-                all_branches.append(branch)
-
         if len(all_branches) < 2:
             print(f"{YELLOW}At least two branches are needed to perform a merge.{ENDC}")
             return
@@ -675,7 +648,7 @@ def merge_branches():
                         original_branch = current_branch_name
 
                         # Switch to destination branch
-                        checkout_result = subprocess.run(
+                        checkout_result = run(
                             ["git", "checkout", target_branch],
                             capture_output=True,
                             text=True
@@ -689,7 +662,7 @@ def merge_branches():
                                 if handle_uncommitted_changes(target_branch):
                                     # Try to do a normal merge
                                     print(f"\n{YELLOW}Attempting to merge {origin_branch} into {target_branch}...{ENDC}")
-                                    result = subprocess.run(
+                                    result = run(
                                         ["git", "merge", origin_branch, "--allow-unrelated-histories"],
                                         capture_output=True,
                                         text=True
@@ -704,7 +677,7 @@ def merge_branches():
                                             # We're already on the target_branch at this point
                                             stay_on_target = input(f"\nGo to destination branch '{target_branch}'? (y/n): ").lower()
                                             if stay_on_target != 'y' and stay_on_target != 's':
-                                                subprocess.run(["git", "checkout", original_branch])
+                                                run(["git", "checkout", original_branch])
                                                 print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
                                     else:
                                         # If merge fails, show error and offer options
@@ -721,7 +694,7 @@ def merge_branches():
 
                                         if choice == "1":
                                             print(f"{YELLOW}Executing forced merge (ours)...{ENDC}")
-                                            ours_result = subprocess.run(
+                                            ours_result = run(
                                                 ["git", "merge", "-X", "ours", origin_branch],
                                                 capture_output=True,
                                                 text=True
@@ -735,18 +708,18 @@ def merge_branches():
                                                     # We're already on the target_branch at this point
                                                     stay_on_target = input(f"\nGo to destination branch '{target_branch}'? (y/n): ").lower()
                                                     if stay_on_target != 'y' and stay_on_target != 's':
-                                                        subprocess.run(["git", "checkout", original_branch])
+                                                        run(["git", "checkout", original_branch])
                                                         print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
                                             else:
                                                 print(f"{YELLOW}Forced merge failed: {ours_result.stderr.strip()}{ENDC}")
                                                 # Return to original branch
                                                 if target_branch != original_branch:
-                                                    subprocess.run(["git", "checkout", original_branch])
+                                                    run(["git", "checkout", original_branch])
                                                     print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
 
                                         elif choice == "2":
                                             print(f"{YELLOW}Executing forced merge (theirs)...{ENDC}")
-                                            theirs_result = subprocess.run(
+                                            theirs_result = run(
                                                 ["git", "merge", "-X", "theirs", origin_branch],
                                                 capture_output=True,
                                                 text=True
@@ -760,20 +733,20 @@ def merge_branches():
                                                     # We're already on the target_branch at this point
                                                     stay_on_target = input(f"\nGo to destination branch '{target_branch}'? (y/n): ").lower()
                                                     if stay_on_target != 'y' and stay_on_target != 's':
-                                                        subprocess.run(["git", "checkout", original_branch])
+                                                        run(["git", "checkout", original_branch])
                                                         print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
                                             else:
                                                 print(f"{YELLOW}Forced merge failed: {theirs_result.stderr.strip()}{ENDC}")
                                                 # Return to original branch
                                                 if target_branch != original_branch:
-                                                    subprocess.run(["git", "checkout", original_branch])
+                                                    run(["git", "checkout", original_branch])
                                                     print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
 
                                         else:
                                             print("Merge operation canceled.")
                                             # Return to original branch
                                             if target_branch != original_branch:
-                                                subprocess.run(["git", "checkout", original_branch])
+                                                run(["git", "checkout", original_branch])
                                                 print(f"{GREEN}You have returned to branch {original_branch}.{ENDC}")
                     else:
                         print(f"{YELLOW}Invalid option. Please select a number between 1 and {len(destination_branches)}.{ENDC}")
@@ -787,7 +760,7 @@ def merge_branches():
         print(f"Error merging branches: {e}")
         # Try to return to the original branch in case of error
         try:
-            subprocess.run(["git", "checkout", current_branch_name])
+            run(["git", "checkout", current_branch_name])
         except:
             pass
 
@@ -811,11 +784,7 @@ def delete_local_branch():
 
     # Check if the branch exists
     try:
-        branch_exists = subprocess.run(
-            ["git", "show-ref", "--verify", f"refs/heads/{branch}"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        branch_exists = local_branch_exists(branch)
 
         if not branch_exists:
             print(f"{YELLOW}The branch '{branch}' does not exist.{ENDC}")
@@ -832,7 +801,7 @@ def delete_local_branch():
 
     # Try to delete the branch normally
     try:
-        result = subprocess.run(
+        result = run(
             ["git", "branch", "-d", branch],
             capture_output=True,
             text=True
@@ -849,7 +818,7 @@ def delete_local_branch():
             force_delete = input("\nDo you want to force deletion? This action is irreversible and you will lose all unmerged changes. (y/n): ").lower()
 
             if force_delete == 'y':
-                force_result = subprocess.run(["git", "branch", "-D", branch])
+                force_result = run(["git", "branch", "-D", branch])
                 if force_result.returncode == 0:
                     print(f"{GREEN}The branch '{branch}' has been forcibly deleted.{ENDC}")
                 else:
@@ -875,7 +844,7 @@ def delete_remote_branch():
 
     # Verify if the remote branch exists
     try:
-        remote_branches = subprocess.run(
+        remote_branches = run(
             ["git", "ls-remote", "--heads", "origin"],
             capture_output=True,
             text=True
@@ -896,7 +865,7 @@ def delete_remote_branch():
 
     # Delete the remote branch
     try:
-        result = subprocess.run(
+        result = run(
             ["git", "push", "origin", "--delete", branch],
             capture_output=True,
             text=True
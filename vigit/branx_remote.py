@@ -1,18 +1,13 @@
-import subprocess
-import os
-
-from simple_term_menu import TerminalMenu
 from .utils import YELLOW, GREEN, ENDC, BOLD, BG_PURPLE, BLACK_TEXT, WHITE_TEXT
 from .constants import branch_remote_menu, branch_local_menu, MENU_CURSOR, MENU_CURSOR_STYLE
 from .checks import is_git_repo, print_not_git_repo, current_branch, is_local_branch_connected_to_remote, has_commits, print_not_commits, is_current_branch_main, is_connected_to_remote, print_not_connected_to_remote
 from .menu import commit_and_push
+from .runner import run
+from .render import clear_screen
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 def branch_remote():
+    from simple_term_menu import TerminalMenu
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -71,17 +66,17 @@ def check_local_branches():
         return
 
     try:
-        subprocess.run(["git", "branch"])
+        run(["git", "branch"])
     except Exception as e:
         print(f"Error checking local branches: {e}")
 
 def check_remote_branches():
     try:
         # First, fetch to update remote branches
-        subprocess.run(["git", "fetch", "--all"], capture_output=True, text=True)
+        run(["git", "fetch", "--all"], capture_output=True, text=True)
 
         # Use --no-pager to prevent Git from using vi/less and capture the output to display it directly
-        result = subprocess.run(
+        result = run(
             ["git", "--no-pager", "branch", "-r"],
             capture_output=True,
             text=True
@@ -111,7 +106,7 @@ def connect_local_branch_with_remote():
 
     # Verificar si el repositorio está conectado a un remoto
     try:
-        remote_exists = subprocess.run(
+        remote_exists = run(
             ["git", "remote", "-v"],
             capture_output=True,
             text=True
@@ -119,7 +114,7 @@ def connect_local_branch_with_remote():
 
         if not remote_exists:
             remote_url = input("Enter the remote repository (GitHub) URL: ")
-            subprocess.run(["git", "remote", "add", "origin", remote_url])
+            run(["git", "remote", "add", "origin", remote_url])
             print(f"Connected local repository with remote: {remote_url}")
     except Exception as e:
         print(f"Error connecting with remote: {e}")
@@ -128,7 +123,7 @@ def connect_local_branch_with_remote():
     try:
         # Crear la rama en remoto y enlazarla con la local
         # Primero hacemos push de la rama local al remoto
-        push_result = subprocess.run(
+        push_result = run(
             ["git", "push", "-u", "origin", branch],
             capture_output=True,
             text=True
@@ -140,7 +135,7 @@ def connect_local_branch_with_remote():
             print(f"{YELLOW}Could not push branch to remote. Error: {push_result.stderr.strip()}{ENDC}")
 
             # Si falló, intentamos establecer la conexión manualmente
-            set_upstream = subprocess.run(
+            set_upstream = run(
                 ["git", "branch", "--set-upstream-to", f"origin/{branch}", branch]
             )
 
@@ -157,9 +152,9 @@ def commit_in_local_branch():
         return
 
     try:
-        subprocess.run(["git", "add", "."])
+        run(["git", "add", "."])
         message = input("Enter commit message: ")
-        subprocess.run(["git", "commit", "-m", message])
+        run(["git", "commit", "-m", message])
     except Exception as e:
         print(f"Error committing in local branch: {e}")
 
@@ -171,7 +166,7 @@ def push_changes_to_remote_branch():
 
     try:
         # Try to do a normal push first
-        result = subprocess.run(
+        result = run(
             ["git", "push", "origin", branch],
             capture_output=True,
             text=True
@@ -190,7 +185,7 @@ def push_changes_to_remote_branch():
 
             if force_push == 'y':
                 print(f"{YELLOW}Executing force push...{ENDC}")
-                force_result = subprocess.run(
+                force_result = run(
                     ["git", "push", "--force", "origin", branch],
                     capture_output=True,
                     text=True
@@ -231,7 +226,7 @@ def create_remote_branch():
             return
 
         # First, fetch to make sure we have the latest reference of the base branch
-        fetch_result = subprocess.run(
+        fetch_result = run(
             ["git", "fetch", "origin", base_branch],
             capture_output=True,
             text=True
@@ -242,7 +237,7 @@ def create_remote_branch():
             return
 
         # Create a remote branch based on the specified base branch
-        create_result = subprocess.run(
+        create_result = run(
             ["git", "push", "origin", f"origin/{base_branch}:refs/heads/{new_branch_name}"],
             capture_output=True,
             text=True
@@ -254,7 +249,7 @@ def create_remote_branch():
             # Ask if user wants to check out the new branch locally
             checkout_local = input(f"Do you want to check out this branch locally? (y/n): ").lower()
             if checkout_local == 'y':
-                checkout_result = subprocess.run(
+                checkout_result = run(
                     ["git", "checkout", "-b", new_branch_name, f"origin/{new_branch_name}"],
                     capture_output=True,
                     text=True
@@ -273,7 +268,7 @@ def create_remote_branch():
 def clone_remote_branch_to_local():
     remote_branch = input("Enter the name of the remote branch you want to clone: ")
     try:
-        subprocess.run(["git", "checkout", "--track", f"origin/{remote_branch}"])
+        run(["git", "checkout", "--track", f"origin/{remote_branch}"])
         print(f"Cloned and switched to the remote branch {remote_branch}")
     except Exception as e:
         print(f"Error cloning remote branch: {e}")
@@ -286,7 +281,7 @@ def pull_remote_changes_to_local():
 
     try:
         # Try to do a normal pull first
-        result = subprocess.run(
+        result = run(
             ["git", "pull", "origin", branch, "--allow-unrelated-histories"],
             capture_output=True,
             text=True
@@ -310,7 +305,7 @@ def pull_remote_changes_to_local():
 
             if choice == "1":
                 print(f"{YELLOW}Executing pull with rebase...{ENDC}")
-                rebase_result = subprocess.run(
+                rebase_result = run(
                     ["git", "pull", "--rebase", "origin", branch],
                     capture_output=True,
                     text=True
@@ -326,9 +321,9 @@ def pull_remote_changes_to_local():
                 confirm = input(f"{YELLOW}WARNING: This will discard all uncommitted local changes. Are you sure? (y/n): {ENDC}").lower()
                 if confirm == "y":
                     # Save current work
-                    subprocess.run(["git", "stash", "push", "-u"])
+                    run(["git", "stash", "push", "-u"])
                     # Reset local changes
-                    subprocess.run(["git", "reset", "--hard", f"origin/{branch}"])
+                    run(["git", "reset", "--hard", f"origin/{branch}"])
                     print(f"{GREEN}Local changes have been reset to the state of the remote repository.{ENDC}")
                     print("Your uncommitted changes have been saved in git stash.")
                 else:
@@ -1,9 +1,10 @@
-import subprocess
 from enum import Enum
 from simple_term_menu import TerminalMenu
 from .utils import YELLOW, GREEN, ENDC
 from .constants import branch_rl_menu, branch_lr_menu, branch_local_menu
 from .checks import is_git_repo, print_not_git_repo, current_branch
+from .runner import run
+from .render import clear_screen
 
 # BRANCHES REMOTE_TO_LOCAL
 class branch_rl_menu(Enum):
@@ -49,7 +50,7 @@ def branch_remote_to_local():
 def clone_remote_branch_to_local():
     remote_branch = input("Enter the name of the remote branch you want to clone: ")
     try:
-        subprocess.run(["git", "checkout", "--track", f"origin/{remote_branch}"])
+        run(["git", "checkout", "--track", f"origin/{remote_branch}"])
         print(f"Cloned and switched to the remote branch {remote_branch}")
     except Exception as e:
         print(f"Error cloning remote branch: {e}")
@@ -62,7 +63,7 @@ def pull_remote_changes_to_local():
 
     try:
         # Try to do a normal pull first
-        result = subprocess.run(
+        result = run(
             ["git", "pull", "origin", branch, "--allow-unrelated-histories"],
             capture_output=True,
             text=True
@@ -86,7 +87,7 @@ def pull_remote_changes_to_local():
 
             if choice == "1":
                 print(f"{YELLOW}Executing pull with rebase...{ENDC}")
-                rebase_result = subprocess.run(
+                rebase_result = run(
                     ["git", "pull", "--rebase", "origin", branch],
                     capture_output=True,
                     text=True
@@ -102,9 +103,9 @@ def pull_remote_changes_to_local():
                 confirm = input(f"{YELLOW}WARNING: This will discard all uncommitted local changes. Are you sure? (y/n): {ENDC}").lower()
                 if confirm == "y":
                     # Save current work
-                    subprocess.run(["git", "stash", "push", "-u"])
+                    run(["git", "stash", "push", "-u"])
                     # Reset local changes
-                    subprocess.run(["git", "reset", "--hard", f"origin/{branch}"])
+                    run(["git", "reset", "--hard", f"origin/{branch}"])
                     print(f"{GREEN}Local changes have been reset to the state of the remote repository.{ENDC}")
                     print("Your uncommitted changes have been saved in git stash.")
                 else:
@@ -2,11 +2,13 @@ import subprocess
 import os
 
 from .utils import YELLOW, GREEN, ENDC, RED
+from .snapshot import get_snapshot
+from .runner import run
 
 
 def is_git_installed():
     try:
-        result = subprocess.run(["git", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        result = run(["git", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         if result.returncode == 0:
             return True
     except Exception as e:
@@ -15,17 +17,7 @@ def is_git_installed():
 
 def is_git_repo():
     """Comprueba si el directorio actual es un repositorio Git"""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip() == "true"
-    except:
-        # El directorio actual no es un repositorio Git
-        return False
+    return get_snapshot().in_repo()
 
 def print_git_repo():
     print(f"{YELLOW}The present working directory is already a git repository. No need to create one.{ENDC}")
@@ -36,11 +28,7 @@ def print_not_git_repo():
     print(f"{YELLOW}To create one: Local -> Add a local repo{ENDC}")
 
 def is_connected_to_remote():
-    try:
-        result = subprocess.run(["git", "remote", "get-url", "origin"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return result.returncode == 0
-    except Exception:
-        return False
+    return "origin" in get_snapshot().remotes
 
 def print_connected_to_remote():
     print(f"{YELLOW}The local repository is already connected to a remote repository.{ENDC}")
@@ -49,87 +37,63 @@ def print_not_connected_to_remote():
     print(f"{YELLOW}The local repository is not connected to a remote repository. Please connect it to proceed.{ENDC}\nTo connect: Remote -> Join Local to Remote")
 
 def current_branch():
-    try:
-        result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        return result.stdout.strip()
-    except Exception:
-        return None
+    return get_snapshot().branch()
 
 def is_local_branch_connected_to_remote(branch_name):
-    try:
-        result = subprocess.run(["git", "for-each-ref", "--format", '%(upstream:short)', f"refs/heads/{branch_name}"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        return result.stdout.strip() != ""
-    except Exception:
-        return False
+    return get_branch_upstream(branch_name) is not None
+
+def get_branch_upstream(branch_name):
+    """Short name of the branch's upstream ('origin/main'), or None."""
+    return get_snapshot().branch_upstream(branch_name)
 
 
 def get_current_branch():
-    try:
-        result = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return None
+    return get_snapshot().branch()
 
 def is_current_branch_main():
     branch = current_branch()
     return branch == "main"
 
 def has_commits():
-    try:
-        result = subprocess.run(["git", "rev-parse", "--verify", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return get_snapshot().has_commits()
 
-        if result.returncode == 0:
-            return True
-        else:
-            return False
-    except Exception as e:
-        print(f"Error checking commits: {e}")
-        return False
+def repository_paths():
+    """(top level directory, current directory relative to it)."""
+    result = run(["git", "rev-parse", "--show-toplevel", "--show-prefix"], capture_output=True, text=True)
+    lines = result.stdout.split("\n")
+    return lines[0], lines[1] if len(lines) > 1 else ""
+
+def get_last_commit():
+    """The commit HEAD points to, or None when there are no commits yet."""
+    return get_snapshot().last_commit()
 
 def print_not_commits():
     print(f"{YELLOW}To work with branches, you need to commit first. Please commit to proceed.{ENDC}\nTo commit locally: Quick actions -> Commit to local repo")
 
+def get_local_branches():
+    """Local branch names, sorted the way `git branch` lists them."""
+    return get_snapshot().branches()
+
+def local_branch_exists(branch_name):
+    return get_snapshot().has_branch(branch_name)
+
+def format_local_branches():
+    """`git branch`-style lines: the current branch marked with '*'."""
+    current = current_branch()
+    return [f"* {branch}" if branch == current else f"  {branch}" for branch in get_local_branches()]
+
 def list_local_branches():
-    try:
-        result = subprocess.run(["git", "branch"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        branches = result.stdout.decode('utf-8')
-        print("Available branches:")
-        print(branches)
-    except subprocess.CalledProcessError as e:
-        print(f"Error listing branches: {e}")
+    print("Available branches:")
+    print("\n".join(format_local_branches()))
 
 def has_unstaged_changes():
     """Checks if there are unstaged changes in the repository."""
-    try:
-        result = subprocess.run(
-            ["git", "diff", "--quiet"],
-            capture_output=True
-        )
-        return result.returncode != 0
-    except Exception:
-        return False
+    return get_snapshot().has_unstaged_changes()
 
 def has_staged_changes():
     """Checks if there are changes staged for commit."""
-    try:
-        result = subprocess.run(
-            ["git", "diff", "--quiet", "--staged"],
-            capture_output=True
-        )
-        return result.returncode != 0
-    except Exception:
-        return False
+    return get_snapshot().has_staged_changes()
 
 def has_stash():
     """Checks if there are saved stashes."""
-    try:
-        result = subprocess.run(
-            ["git", "stash", "list"],
-            capture_output=True,
-            text=True
-        )
-        return bool(result.stdout.strip())
-    except Exception:
-        return False
+    return get_snapshot().has_stash()
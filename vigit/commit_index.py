@@ -0,0 +1,250 @@
+import os
+import subprocess
+import time
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite: history is read from git directly
+    sqlite3 = None
+
+from .runner import run, popen, record
+from .snapshot import get_snapshot
+from .objects import get_object_reader
+from .render import is_tty
+from .history_view import HistoryEntry, LogStream
+
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS commits (
+    oid TEXT PRIMARY KEY,
+    parents TEXT NOT NULL,
+    author TEXT NOT NULL,
+    author_email TEXT NOT NULL,
+    author_time INTEGER NOT NULL,
+    committer_time INTEGER NOT NULL,
+    subject TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tips (ref TEXT PRIMARY KEY, oid TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+# Fields read for each new commit; records end with NUL (-z)
+INDEX_FORMAT = "%H%x1f%P%x1f%an%x1f%ae%x1f%at%x1f%ct%x1f%s"
+
+
+def index_dir():
+    """<common git dir>/vigit, shared by every worktree of the repository."""
+    store = get_snapshot().store
+    common_dir = getattr(store, "common_dir", None)
+    if common_dir is None:
+        result = run(["git", "rev-parse", "--git-common-dir"], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        common_dir = os.path.abspath(result.stdout.strip())
+    return os.path.join(common_dir, "vigit")
+
+
+def current_refs():
+    """{refname: commit oid} for HEAD, branches, remote branches and tags (peeled)."""
+    result = run(
+        ["git", "for-each-ref", "--format=%(objectname) %(*objectname) %(refname)",
+         "refs/heads", "refs/remotes", "refs/tags"],
+        capture_output=True,
+        text=True
+    )
+    refs = {}
+    for line in result.stdout.splitlines():
+        oid, peeled, refname = line.split(" ", 2)
+        refs[refname] = peeled or oid
+    head = get_snapshot().head_oid()
+    if head:
+        refs["HEAD"] = head
+    return refs
+
+
+class CommitIndex:
+    """
+    Commit metadata kept in SQLite: oid, parents, author, dates and subject.
+    Commits never change, so each update() only walks from the tips seen
+    last time to the current ones; decorations come from the tips table.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=10)
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != SCHEMA_VERSION:
+            self.db.executescript("DELETE FROM commits; DELETE FROM tips;")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (SCHEMA_VERSION,))
+            self.db.commit()
+        self._decorations = None
+
+    def close(self):
+        self.db.close()
+
+    def is_empty(self):
+        return self.db.execute("SELECT 1 FROM commits LIMIT 1").fetchone() is None
+
+    def update(self):
+        """Indexes the commits reachable from the current refs that are not indexed yet. Returns how many."""
+        refs = current_refs()
+        known = dict(self.db.execute("SELECT ref, oid FROM tips"))
+        new_tips = sorted(set(refs.values()) - set(known.values()))
+
+        added = 0
+        if new_tips:
+            # Old tips can be gone after a force push and gc; excluding a missing object would fail
+            old_tips = sorted(set(known.values()))
+            present = [oid for oid, info in zip(old_tips, get_object_reader().info_many(old_tips)) if info]
+            added = self._index_walk(new_tips, present)
+
+        self.db.execute("DELETE FROM tips")
+        self.db.executemany("INSERT INTO tips VALUES (?, ?)", refs.items())
+        self.db.commit()
+        self._decorations = None
+        return added
+
+    def _index_walk(self, tips, exclude):
+        process = popen(
+            ["git", "log", "-z", f"--format={INDEX_FORMAT}", "--stdin"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        process.stdin.write("".join([f"{oid}\n" for oid in tips] + [f"^{oid}\n" for oid in exclude]).encode())
+        process.stdin.close()
+
+        started = time.perf_counter()
+        added = 0
+        batch = []
+        buffer = b""
+        while True:
+            chunk = process.stdout.read1(1 << 16)
+            buffer += chunk
+            records = buffer.split(b"\0")
+            buffer = records.pop() if chunk else b""
+            for raw in records:
+                raw = raw.strip(b"\n")
+                if not raw:
+                    continue
+                fields = raw.decode("utf-8", "replace").split("\x1f", 6)
+                oid, parents, author, email, author_time, committer_time, subject = fields
+                batch.append((oid, parents, author, email, int(author_time or 0), int(committer_time or 0), subject))
+            if len(batch) >= 5000 or not chunk:
+                self.db.executemany("INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                added += len(batch)
+                batch = []
+            if not chunk:
+                break
+        process.wait()
+        record(["sqlite", "commit-index", "insert"], time.time(), time.perf_counter() - started,
+               output_bytes=added, kind="index")
+        return added
+
+    # READING
+    def decorations(self):
+        """{oid: '%D'-style ref list}, from the refs seen at the last update."""
+        if self._decorations is None:
+            head_target = get_snapshot().branch()
+            by_oid = {}
+            for ref, oid in sorted(self.db.execute("SELECT ref, oid FROM tips")):
+                if ref == "HEAD":
+                    continue
+                if ref.startswith("refs/heads/"):
+                    name = ref[len("refs/heads/"):]
+                    if name == head_target:
+                        continue
+                elif ref.startswith("refs/remotes/"):
+                    name = ref[len("refs/remotes/"):]
+                else:
+                    name = "tag: " + ref[len("refs/tags/"):]
+                by_oid.setdefault(oid, []).append(name)
+            head = dict(self.db.execute("SELECT ref, oid FROM tips WHERE ref = 'HEAD'")).get("HEAD")
+            if head:
+                label = f"HEAD -> {head_target}" if head_target and head_target != "HEAD" else "HEAD"
+                by_oid.setdefault(head, []).insert(0, label)
+            self._decorations = {oid: ", ".join(names) for oid, names in by_oid.items()}
+        return self._decorations
+
+    def entry(self, oid):
+        row = self.db.execute("SELECT author, author_time, subject, parents FROM commits WHERE oid = ?",
+                              (oid,)).fetchone()
+        if row is None:
+            return None
+        author, author_time, subject, parents = row
+        return HistoryEntry(oid, oid[:7], self.decorations().get(oid, ""), author, author_time, subject,
+                            tuple(parents.split()))
+
+    def entries(self, oids):
+        """{oid: HistoryEntry} for the indexed ones among oids, in one query per 500 commits."""
+        decorations = self.decorations()
+        found = {}
+        for start in range(0, len(oids), 500):
+            chunk = oids[start:start + 500]
+            rows = self.db.execute(
+                "SELECT oid, author, author_time, subject, parents FROM commits "
+                f"WHERE oid IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for oid, author, author_time, subject, parents in rows:
+                found[oid] = HistoryEntry(oid, oid[:7], decorations.get(oid, ""), author, author_time, subject,
+                                          tuple(parents.split()))
+        return found
+
+
+class IndexedLogStream(LogStream):
+    """LogStream whose commits come from the index: git only supplies the order (`git rev-list`)."""
+
+    separator = b"\n"
+
+    def __init__(self, index, args=(), skip=0):
+        self.index = index
+        super().__init__(args, skip)
+
+    def command(self, args, skip):
+        return ["git", "rev-list", f"--skip={skip}", *args, "HEAD"]
+
+    def parse(self, record):
+        oid = record.decode()
+        return self.index.entry(oid) or HistoryEntry(oid, oid[:7], "", "", 0, "(not indexed)")
+
+    def read(self, count):
+        """Like LogStream.read, looking the whole batch up in the index at once."""
+        oids = []
+        while len(oids) < count:
+            record = self._next_record()
+            if record is None:
+                break
+            record = record.strip()
+            if record:
+                oids.append(record.decode())
+        self.position += len(oids)
+        found = self.index.entries(oids)
+        return [found.get(oid) or HistoryEntry(oid, oid[:7], "", "", 0, "(not indexed)") for oid in oids]
+
+
+_index = None
+
+def open_commit_index(announce=True):
+    """
+    The repository's commit index, brought up to date with the current refs,
+    or None when it cannot be used (no SQLite, read-only .git, ...).
+    """
+    global _index
+    if sqlite3 is None:
+        return None
+    try:
+        directory = index_dir()
+        if directory is None:
+            return None
+        path = os.path.join(directory, "commits.sqlite")
+        if _index is None or _index.path != path:
+            os.makedirs(directory, exist_ok=True)
+            _index = CommitIndex(path)
+        if announce and is_tty() and _index.is_empty():
+            print("Building the commit index (only needed once)...", flush=True)
+        _index.update()
+        return _index
+    except (OSError, sqlite3.Error):
+        return None
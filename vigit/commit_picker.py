@@ -0,0 +1,184 @@
+import sys
+
+from .utils import DARK_BLUE, GREEN, YELLOW, BLUE, ENDC
+from .objects import get_object_reader
+from .history_view import HistoryEntry, format_history_entry, history_stream
+from .render import screen, is_tty, read_key, terminal_size, fit, cbreak
+
+REVERSE = "\033[7m"
+
+# Commits read from the log between two checks for a key press, so typing
+# stays responsive while a filter with few matches scans a long history
+SCAN_BATCH = 2000
+
+HEX_DIGITS = set("0123456789abcdef")
+
+
+def matches(entry, text):
+    """Whether the filter text appears in the subject or author, or starts the commit id."""
+    if not text:
+        return True
+    text = text.lower()
+    return (text in entry.subject.lower() or text in entry.author.lower()
+            or (set(text) <= HEX_DIGITS and entry.oid.startswith(text)))
+
+
+class CommitPicker:
+    """
+    History filtered by subject, author or id prefix, read from a single log
+    stream only as far as the list has been scrolled. Typing more characters
+    narrows the matches found so far and keeps reading the same stream;
+    deleting characters starts it again. Only matching commits are kept.
+    """
+
+    def __init__(self, stream_factory):
+        self.stream_factory = stream_factory
+        self.text = ""
+        self.stream = stream_factory()
+        self.matches = []
+        self.exhausted = False
+        self.scanned = 0
+        self.revision = None
+        self.cursor = 0
+        self.top = 0
+
+    def set_filter(self, text):
+        if text.startswith(self.text):
+            self.matches = [entry for entry in self.matches if matches(entry, text)]
+        else:
+            self.stream.close()
+            self.stream = self.stream_factory()
+            self.matches = []
+            self.exhausted = False
+            self.scanned = 0
+        self.text = text
+        self.revision = resolve_revision(text)
+        self.cursor = self.top = 0
+
+    def scan(self, wanted):
+        """Reads at most SCAN_BATCH commits looking for wanted matches. Returns True when it has enough."""
+        if len(self.matches) >= wanted or self.exhausted:
+            return True
+        batch = self.stream.read(SCAN_BATCH)
+        if not batch:
+            self.exhausted = True
+        self.scanned += len(batch)
+        self.matches.extend(entry for entry in batch if matches(entry, self.text))
+        return len(self.matches) >= wanted or self.exhausted
+
+    def rows(self):
+        """The revision typed (when it names a commit) followed by the matching commits."""
+        return ([self.revision] if self.revision else []) + self.matches
+
+    def move(self, count, page):
+        # Only as far as the rows read so far; the next scan reads more
+        self.cursor = max(0, min(self.cursor + count, len(self.rows()) - 1))
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + page:
+            self.top = self.cursor - page + 1
+
+    def selected(self):
+        rows = self.rows()
+        return rows[self.cursor] if self.cursor < len(rows) else None
+
+    def close(self):
+        self.stream.close()
+
+
+def resolve_revision(text):
+    """HistoryEntry for text when git can resolve it to a commit (branch, tag, HEAD~3, unique id prefix...)."""
+    if not text or text.strip() != text:
+        return None
+    commit = get_object_reader().commit(text)
+    if commit is None:
+        return None
+    return HistoryEntry(commit.oid, commit.short_oid, f"= {text}", commit.author, commit.author_time, commit.subject)
+
+
+def resolve_revisions(revisions):
+    """Full commit ids for revisions, looked up together in one batch-check round trip; None for the unknown ones."""
+    infos = get_object_reader().info_many([f"{revision}^{{commit}}" for revision in revisions])
+    return [info[0] if info else None for info in infos]
+
+
+def browse_commits(title, stream_factory=None):
+    """
+    Lets the user pick a commit: typing filters the list, [↑/↓] and
+    [PgUp/PgDn] move, [Enter] picks, [Esc] cancels. Returns the commit id or None.
+    """
+    picker = CommitPicker(stream_factory or history_stream())
+    try:
+        with cbreak():
+            return _pick(picker, title)
+    finally:
+        picker.close()
+        print()
+
+
+def _pick(picker, title):
+    while True:
+        width, height = terminal_size()
+        page = max(3, height - 5)
+        enough = picker.scan(picker.top + page + 1)
+
+        with screen():
+            print(f"{BLUE}{title}{ENDC}")
+            print(f"{YELLOW}Filter (subject, author, id or revision):{ENDC} {picker.text}█")
+            rows = picker.rows()[picker.top:picker.top + page]
+            for number, entry in enumerate(rows, picker.top):
+                line = fit(format_history_entry(entry, width - 2), width - 2)
+                print(f"{REVERSE}>{ENDC} {line}" if number == picker.cursor else f"  {line}")
+            if not rows:
+                print(f"{YELLOW}No matching commits{' yet' if not picker.exhausted else ''}.{ENDC}")
+            print("\n" * (page - max(len(rows), 1)), end="")
+            status = "" if enough else f" (searching, {picker.scanned} commits read)"
+            print(f"{GREEN}[type] filter  [↑/↓] move  [Enter] pick  [Esc] cancel{ENDC}{DARK_BLUE}{status}{ENDC}",
+                  end="")
+
+        key = read_key(sequences=True, timeout=None if enough else 0)
+        if key is None:
+            continue
+        if key in ("\x1b[A", "\x1bOA"):
+            picker.move(-1, page)
+        elif key in ("\x1b[B", "\x1bOB"):
+            picker.move(1, page)
+        elif key == "\x1b[5~":
+            picker.move(-(page - 1), page)
+        elif key == "\x1b[6~":
+            picker.move(page - 1, page)
+        elif key in ("\x1b", "\x03", ""):
+            return None
+        elif key.startswith("\x1b"):
+            continue
+        else:
+            # Several characters at once when text is pasted (or typed ahead)
+            text = picker.text
+            for char in key:
+                if char in ("\r", "\n"):
+                    if text != picker.text:
+                        picker.set_filter(text)
+                    picker.scan(picker.cursor + 1)
+                    entry = picker.selected()
+                    if entry is not None:
+                        return entry.oid
+                elif char in ("\x7f", "\x08"):
+                    text = text[:-1]
+                elif char.isprintable():
+                    text += char
+            if text != picker.text:
+                picker.set_filter(text)
+
+
+def _prompt(text):
+    print(f"{YELLOW}{text}{ENDC} ", end="", flush=True)
+    try:
+        return input().strip()
+    except EOFError:
+        return ""
+
+def pick_commit(title):
+    """A commit id from the picker on a terminal, or the revision typed at a prompt otherwise (None if empty)."""
+    if is_tty() and is_tty(sys.stdin):
+        return browse_commits(title)
+    return _prompt(title) or None
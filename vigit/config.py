@@ -1,16 +1,10 @@
-import subprocess
-import os
-
 from .utils import YELLOW, GREEN, ENDC, global_menu
 from .constants import MENU_CURSOR, MENU_CURSOR_STYLE
+from .runner import run, getoutput
+from .render import clear_screen
 
 from enum import Enum
-from simple_term_menu import TerminalMenu
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 class config_menu(Enum):
     CHECK = 'See Credentials'
@@ -19,6 +13,7 @@ class config_menu(Enum):
     CONFIG_GITHUB_API = 'GitHub API Configuration'
 
 def configuration():
+    from simple_term_menu import TerminalMenu
     while True:
 
         print(f"{GREEN}Configuration:{ENDC}")
@@ -58,9 +53,9 @@ def configuration():
 
 def check_user_config():
     try:
-        user_name = subprocess.getoutput("git config user.name")
-        user_email = subprocess.getoutput("git config user.email")
-        github_token = subprocess.getoutput("git config --global github.token")
+        user_name = getoutput("git config user.name")
+        user_email = getoutput("git config user.email")
+        github_token = getoutput("git config --global github.token")
 
         print(f"User Name: {user_name}")
         print(f"User Email: {user_email}")
@@ -75,7 +70,7 @@ def check_user_config():
 def configure_user_name():
     user_name = input("Enter your desired user name: ")
     try:
-        subprocess.run(["git", "config", "--global", "user.name", user_name])
+        run(["git", "config", "--global", "user.name", user_name])
         print(f"User name set to: {user_name}")
     except Exception as e:
         print(f"Error setting user name: {e}")
@@ -83,7 +78,7 @@ def configure_user_name():
 def configure_user_email():
     user_email = input("Enter your desired user email: ")
     try:
-        subprocess.run(["git", "config", "--global", "user.email", user_email])
+        run(["git", "config", "--global", "user.email", user_email])
         print(f"User email set to: {user_email}")
     except Exception as e:
         print(f"Error setting user email: {e}")
@@ -102,7 +97,7 @@ def configure_github_api():
     token = input("\nEnter your GitHub token (it will be stored securely): ")
     try:
         # Save token securely using git config
-        subprocess.run(["git", "config", "--global", "github.token", token])
+        run(["git", "config", "--global", "github.token", token])
         print(f"\n{GREEN}GitHub token successfully saved.{ENDC}")
     except Exception as e:
         print(f"\n{YELLOW}Error saving GitHub token: {e}{ENDC}")
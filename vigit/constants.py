@@ -77,6 +77,8 @@ class show_menu(Enum):
     SHOW_STATUS = 'Show Detailed Status'
     SHOW_DIFFERENCES = 'Show Differences ►'
     SHOW_HISTORY = 'Show History ►'
+    FIND_IN_HISTORY = 'Find in History'
+    BLAME_FILE = 'Blame File'
     SHOW_LOCAL_REPO = 'Show Local Repo'
     SHOW_REMOTE_REPO = 'Show Remote Repo'
     SHOW_BRANCHES = 'Show Branches'
@@ -96,6 +98,7 @@ class history_menu(Enum):
     EXPANDED_HISTORY = 'Show Expanded History'
     TRACKING_HISTORY = 'Show Tracking History'
     DIFFERENCES_HISTORY = 'Show Differences History'
+    PATH_HISTORY = 'Show History of a Path'
 
 class differences_menu(Enum):
     NON_STAGED_DIFFERENCES = 'Show Differences of non staged files'
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import zlib
+
+from .runner import run
+
+# Total size of the compressed diffs kept on disk; the least recently used
+# ones are removed beyond it
+DEFAULT_CACHE_SIZE = 128 * 1024 * 1024
+
+# A single diff larger than this (compressed) is not kept
+MAX_ENTRY_FRACTION = 8
+
+# Configuration that changes what `git diff` and `git log -p` print for the
+# same two trees (algorithm, renames, context, prefixes, colors...)
+CONFIG_PATTERN = r"^(diff|color|log)\.|^core\.(quotepath|bigfilethreshold)$"
+
+_cache = None
+_config = None
+
+
+def config_fingerprint():
+    """Hash of the effective values of the settings in CONFIG_PATTERN, read once per run."""
+    global _config
+    if _config is None:
+        result = run(["git", "config", "--get-regexp", CONFIG_PATTERN], capture_output=True)
+        _config = hashlib.sha1(result.stdout).hexdigest()
+    return _config
+
+
+class DiffCache:
+    """
+    Compressed diff output in files under <common git dir>/vigit/cache,
+    named by a hash of what they are the diff of: two tree ids, the options
+    and the configuration that shapes git's output. The diff between two
+    trees never changes, so entries are never invalidated (a configuration
+    change just makes new keys); every hit refreshes an entry's modification
+    time and the least recently used ones are removed once the directory
+    outgrows max_size.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._total = None
+
+    @staticmethod
+    def key(kind, old_tree, new_tree, *options):
+        parts = [kind, old_tree, new_tree, config_fingerprint(), *map(str, options)]
+        return hashlib.sha1("\0".join(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".z")
+
+    def get(self, key):
+        """The stored text for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = zlib.decompress(file.read())
+            os.utime(path)
+        except (OSError, zlib.error):
+            return None
+        return data.decode("utf-8", "replace")
+
+    def put(self, key, text):
+        writer = self.writer(key)
+        writer.write(text)
+        writer.close()
+
+    def writer(self, key):
+        """A CacheWriter that stores the text written to it under key when closed."""
+        return CacheWriter(self, key)
+
+    def _store(self, key, data):
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            return
+        # The directory is only listed again when the running total says it may be full
+        if self._total is not None:
+            self._total += len(data)
+        if self._total is None or self._total > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_size."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        self._total = total
+        if total <= self.max_size:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_size:
+                break
+        self._total = total
+
+
+class CacheWriter:
+    """
+    Compresses text as it is written and stores it on close(). Gives up
+    (and stores nothing) once the entry outgrows the cache's size limit, so
+    memory stays bounded whatever the size of the diff.
+    """
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self._compressor = zlib.compressobj()
+        self._chunks = []
+        self._size = 0
+        self._limit = cache.max_size // MAX_ENTRY_FRACTION
+
+    def _add(self, chunk):
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size > self._limit:
+            self._chunks = None
+
+    def write(self, text):
+        if self._chunks is not None:
+            self._add(self._compressor.compress(text.encode("utf-8", "replace")))
+
+    def close(self):
+        if self._chunks is None:
+            return
+        self._add(self._compressor.flush())
+        if self._chunks is not None:
+            self.cache._store(self.key, b"".join(self._chunks))
+            self._chunks = None
+
+
+def open_diff_cache():
+    """The repository's diff cache, or None when it cannot be used (read-only .git, ...)."""
+    global _cache
+    from .commit_index import index_dir
+
+    try:
+        directory = index_dir()
+        if directory is None:
+            return None
+        directory = os.path.join(directory, "cache")
+        if _cache is None or _cache.directory != directory:
+            os.makedirs(directory, exist_ok=True)
+            _cache = DiffCache(directory)
+        return _cache
+    except OSError:
+        return None
+
+
+def tree_ids(revisions):
+    """The tree id of each revision, looked up together in one batch-check round trip; None for the unknown ones."""
+    from .objects import get_object_reader
+
+    infos = get_object_reader().info_many([f"{revision}^{{tree}}" for revision in revisions])
+    return [info[0] if info else None for info in infos]
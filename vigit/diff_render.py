@@ -0,0 +1,548 @@
+import io
+import os
+import re
+import subprocess
+import sys
+from contextlib import nullcontext
+
+from .utils import YELLOW, GREEN, RED, MAGENTA, BLUE, BOLD, ENDC
+from .constants import MENU_CURSOR, MENU_CURSOR_STYLE
+from .render import ANSI_ESCAPE, terminal_size, is_tty, pager, read_key, clear_terminal
+from .runner import run, popen
+
+REVERSE = "\033[7m"
+NO_REVERSE = "\033[27m"
+DIM = "\033[2m"
+
+# Longest run of removed (or added) lines held back to pair them up for
+# word highlighting. Longer runs are printed as they come, unhighlighted,
+# so memory stays bounded whatever the size of the patch.
+MAX_RUN = 200
+
+# Lines longer than this are not compared word by word
+MAX_WORD_DIFF_LENGTH = 1000
+
+# Blobs larger than this are treated as binary by every diff view (git does not
+# even load them) unless the user asks for them; VG_MAX_DIFF_SIZE overrides it
+# with a size in bytes or with a k, m or g suffix
+DEFAULT_MAX_DIFF_SIZE = 10 * 1024 * 1024
+
+# Files per `git diff --numstat` process when a large diff is summarized in
+# parallel: each process costs a git startup, and the paths go on its command line
+MIN_STAT_CHUNK = 500
+MAX_STAT_CHUNK = 5000
+
+TOKEN = re.compile(r"\w+|\s+|[^\w\s]")
+GLOB_SPECIAL = re.compile(r"([*?[\\])")
+HUNK_HEADER = re.compile(r"^@@+ -(\d+)(?:,\d+)? [^@]*?\+(\d+)(?:,\d+)? @@+ ?(.*)$")
+
+
+def _word_diff(old, new):
+    """
+    (old, new) with the words between their common prefix and suffix in
+    reverse video (what git's diff-highlight does), or None when the lines
+    have too little in common for that to help.
+    """
+    if len(old) > MAX_WORD_DIFF_LENGTH or len(new) > MAX_WORD_DIFF_LENGTH:
+        return None
+    old_tokens, new_tokens = TOKEN.findall(old), TOKEN.findall(new)
+    shortest = min(len(old_tokens), len(new_tokens))
+    prefix = 0
+    while prefix < shortest and old_tokens[prefix] == new_tokens[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old_tokens[-1 - suffix] == new_tokens[-1 - suffix]:
+        suffix += 1
+    if not prefix and not suffix:
+        return None
+
+    def mark(tokens):
+        middle = "".join(tokens[prefix:len(tokens) - suffix])
+        if not middle:
+            return "".join(tokens)
+        return "".join(tokens[:prefix]) + f"{REVERSE}{middle}{NO_REVERSE}" + "".join(tokens[len(tokens) - suffix:])
+
+    return mark(old_tokens), mark(new_tokens)
+
+
+def _render_run(removed, added):
+    """A run of - lines followed by + lines; pairs them for word highlighting when both sides have as many."""
+    pairs = None
+    if removed and len(removed) == len(added):
+        pairs = [_word_diff(old[1:], new[1:]) for old, new in zip(removed, added)]
+    for index, line in enumerate(removed):
+        highlighted = pairs[index] if pairs else None
+        yield f"{RED}-{highlighted[0] if highlighted else line[1:]}{ENDC}"
+    for index, line in enumerate(added):
+        highlighted = pairs[index] if pairs else None
+        yield f"{GREEN}+{highlighted[1] if highlighted else line[1:]}{ENDC}"
+
+
+class _FileHeader:
+    """What the lines between `diff --git` and the first hunk say about one file."""
+
+    def __init__(self, line):
+        self.status = "modified"
+        self.old_path = self.new_path = ""
+        paths = line.split(" ", 2)[2] if line.count(" ") >= 2 else ""
+        if paths.startswith("a/") and " b/" in paths:
+            self.old_path, self.new_path = paths[2:].split(" b/", 1)
+        elif paths.startswith("--cc ") or paths.startswith("--combined "):
+            self.old_path = self.new_path = paths.split(" ", 1)[1]
+
+    def update(self, line):
+        if line.startswith("new file mode"):
+            self.status = "added"
+        elif line.startswith("deleted file mode"):
+            self.status = "deleted"
+        elif line.startswith("rename from "):
+            self.status, self.old_path = "renamed", line[len("rename from "):]
+        elif line.startswith("rename to "):
+            self.status, self.new_path = "renamed", line[len("rename to "):]
+        elif line.startswith("copy from "):
+            self.status, self.old_path = "copied", line[len("copy from "):]
+        elif line.startswith("copy to "):
+            self.status, self.new_path = "copied", line[len("copy to "):]
+        elif line.startswith("--- a/"):
+            self.old_path = line[len("--- a/"):]
+        elif line.startswith("+++ b/"):
+            self.new_path = line[len("+++ b/"):]
+
+    def render(self, width):
+        rule = f"{YELLOW}{'─' * width}{ENDC}"
+        if self.status in ("renamed", "copied"):
+            title = f"{self.status}: {self.old_path} to {self.new_path}"
+        else:
+            title = f"{self.status}: {self.new_path or self.old_path}"
+        return [rule, f"{YELLOW}{title}{ENDC}", rule]
+
+
+def highlight_diff(lines, width=None):
+    """
+    Turns plain `git diff` output into colored lines, one input line at a
+    time: a ruled title per file, `@ path:line @` hunk headers, and removed
+    and added lines in red and green with the changed words highlighted. Only
+    the current run of -/+ lines is held back (MAX_RUN lines per side at
+    most), so output starts at once and memory does not grow with the patch.
+    """
+    width = width or min(terminal_size()[0], 80)
+    header = None
+    path = ""
+    deleted = False
+    removed, added = [], []
+    passthrough = False
+
+    def flush():
+        nonlocal removed, added
+        rendered = _render_run(removed, added)
+        removed, added = [], []
+        return rendered
+
+    for line in lines:
+        line = line.rstrip("\n")
+        if header is not None and not line.startswith("@@"):
+            if line.startswith("diff ") or line.startswith("Binary files "):
+                yield from header.render(width)
+                header = None
+                if line.startswith("Binary files "):
+                    yield f"{DIM}(binary file){ENDC}"
+                    continue
+            else:
+                header.update(line)
+                continue
+
+        first = line[:1]
+        if first in ("-", "+"):
+            if passthrough:
+                yield f"{RED if first == '-' else GREEN}{line}{ENDC}"
+                continue
+            if first == "-":
+                if added:
+                    # A removed line right after added ones starts a new run
+                    yield from flush()
+                removed.append(line)
+            else:
+                added.append(line)
+            if len(removed) >= MAX_RUN or len(added) >= MAX_RUN:
+                yield from flush()
+                passthrough = True
+            continue
+
+        yield from flush()
+        passthrough = False
+        if line.startswith("diff "):
+            header = _FileHeader(line)
+        elif line.startswith("@@"):
+            if header is not None:
+                yield from header.render(width)
+                deleted = header.status == "deleted"
+                path = header.old_path if deleted else header.new_path
+                header = None
+            match = HUNK_HEADER.match(line)
+            if match:
+                old_start, new_start, context = match.groups()
+                title = f"{MAGENTA}@ {path}:{old_start if deleted else new_start} @{ENDC}"
+                yield f"{title} {BOLD}{context}{ENDC}" if context else title
+            else:
+                yield f"{MAGENTA}{line}{ENDC}"
+        elif first == "\\":
+            yield f"{DIM}{line}{ENDC}"
+        else:
+            yield line
+
+    yield from flush()
+    if header is not None:
+        yield from header.render(width)
+
+
+def max_diff_size():
+    """The size in bytes above which blobs are left out of diffs: VG_MAX_DIFF_SIZE or DEFAULT_MAX_DIFF_SIZE."""
+    value = os.environ.get("VG_MAX_DIFF_SIZE", "").strip().lower()
+    units = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    try:
+        if value[-1:] in units:
+            return int(value[:-1]) * units[value[-1]]
+        return int(value) if value else DEFAULT_MAX_DIFF_SIZE
+    except ValueError:
+        return DEFAULT_MAX_DIFF_SIZE
+
+def _git_diff(load_large=False, command="diff"):
+    """
+    `git diff` (or `git log` for patches of commits) with
+    core.bigFileThreshold at max_diff_size(), which makes git report larger
+    blobs as binary without reading them, so neither git nor the
+    highlighter holds more than that per file.
+    """
+    if load_large:
+        return ["git", command]
+    return ["git", "-c", f"core.bigFileThreshold={max_diff_size()}", command]
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def large_blobs(args):
+    """
+    (path, old, new) for the files of `git diff args` with a side larger than
+    max_diff_size(), each side an (id, size) pair or None when the file does
+    not exist on it. One `git diff --raw` lists the blobs without reading
+    them and their sizes come from one batch-check round trip; only working
+    tree files (which have no id yet) are looked up with stat.
+    """
+    from .objects import get_object_reader
+
+    result = run(["git", "diff", "--raw", "-z", "--no-abbrev", "--no-ext-diff", *args], capture_output=True)
+    tokens = iter(result.stdout.decode("utf-8", "replace").split("\0"))
+    files = []
+    for token in tokens:
+        if not token.startswith(":"):
+            continue
+        old_mode, new_mode, old_oid, new_oid, status = token[1:].split(" ", 4)
+        path = next(tokens, "")
+        if status[:1] in "RC":
+            path = next(tokens, "")
+        files.append((path, (old_mode, old_oid), (new_mode, new_oid)))
+
+    oids = list({oid for _, *sides in files for mode, oid in sides if oid.strip("0") and mode != "160000"})
+    sizes = {oid: info[2] for oid, info in zip(oids, get_object_reader().info_many(oids)) if info}
+    toplevel = None
+    large = []
+    limit = max_diff_size()
+    for path, *sides in files:
+        found = []
+        for mode, oid in sides:
+            if not mode.strip("0") or mode == "160000":
+                found.append(None)
+            elif oid.strip("0"):
+                found.append((oid, sizes.get(oid, 0)))
+            else:
+                if toplevel is None:
+                    from .checks import repository_paths
+                    toplevel = repository_paths()[0]
+                try:
+                    found.append((None, os.lstat(os.path.join(toplevel, path)).st_size))
+                except OSError:
+                    found.append(None)
+        if any(side and side[1] > limit for side in found):
+            large.append((path, *found))
+    return large
+
+def format_large_blobs(large):
+    """The lines listing large_blobs() with their sizes and ids."""
+    def side(found):
+        if found is None:
+            return "-"
+        oid, size = found
+        return f"{format_size(size)} {DIM}({oid[:7] if oid else 'working tree'}){ENDC}"
+
+    return ([f"{YELLOW}Larger than {format_size(max_diff_size())}, shown as binary:{ENDC}"]
+            + [f"  {path}: {side(old)} → {side(new)}" for path, old, new in large])
+
+def confirm_large_blobs(args):
+    """
+    Lists the files that show_diff(args) would show as binary for their
+    size, with their sizes and ids, and on a terminal offers to load them
+    anyway. Returns whether to load them (for show_diff's load_large).
+    """
+    large = large_blobs(args)
+    if not large:
+        return False
+
+    print("\n".join(format_large_blobs(large)))
+    if not (is_tty() and is_tty(sys.stdin)):
+        print(f"{DIM}(VG_MAX_DIFF_SIZE sets the limit){ENDC}\n", flush=True)
+        return False
+    print(f"\n{GREEN}[l] Load them anyway  [any other key] Leave them out{ENDC}")
+    return read_key().lower() == "l"
+
+
+def _tee(lines, writer):
+    for line in lines:
+        writer.write(line)
+        yield line
+
+def show_diff(args, check=True, out=None, load_large=False, tee=None):
+    """
+    Writes `git diff args` through highlight_diff to out (stdout by default)
+    as git produces it. Blobs over max_diff_size() show as binary unless
+    load_large is set. The plain output also goes to tee (a diff cache
+    writer) when given, which is only closed, and so stored, if git got to
+    the end. Raises CalledProcessError when git fails and check is set,
+    like run(check=True).
+    """
+    out = out or sys.stdout
+    # _FileHeader reads the paths after a/ and b/, whatever diff.noprefix or diff.mnemonicPrefix say
+    command = [*_git_diff(load_large), "--no-color", "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/", *args]
+    process = popen(command, stdout=subprocess.PIPE, text=True, errors="replace")
+    try:
+        lines = process.stdout if tee is None else _tee(process.stdout, tee)
+        for line in highlight_diff(lines):
+            out.write(line + "\n")
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            # The reader stopped early (pager closed)
+            process.terminate()
+        returncode = process.wait()
+    out.flush()
+    if returncode == 0 and tee is not None:
+        tee.close()
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+    return returncode
+
+def show_tree_diff(old, new, args=(), out=None, load_large=False):
+    """
+    show_diff([old, new, *args]) for two commits, read from the diff cache
+    when the diff between their trees was already produced with the same
+    arguments, and stored in it otherwise.
+    """
+    from .diff_cache import open_diff_cache, tree_ids
+
+    cache = open_diff_cache()
+    trees = tree_ids([old, new]) if cache is not None else [None]
+    if None in trees:
+        return show_diff([old, new, *args], out=out, load_large=load_large)
+
+    # Version 2: explicit a/ b/ prefixes, entries stored before them may use diff.noprefix's
+    key = cache.key("patch", *trees, "all" if load_large else max_diff_size(), 2, *args)
+    text = cache.get(key)
+    if text is None:
+        return show_diff([old, new, *args], out=out, load_large=load_large, tee=cache.writer(key))
+    out = out or sys.stdout
+    # Split on "\n" only, as git's output is read: str.splitlines() also splits on \f and the like
+    for line in highlight_diff(io.StringIO(text)):
+        out.write(line + "\n")
+    out.flush()
+    return 0
+
+
+def diff_files(args):
+    """
+    (added, deleted, path, old_path) for each file in `git diff args`, from
+    a single `git diff --numstat`: no patch text is produced, so this is
+    also how the views find out whether there are differences at all.
+    Blobs over max_diff_size() are counted as binary, without reading them.
+    """
+    from .numstat import parse_numstat
+
+    command = [*_git_diff(), "--numstat", "-z", "-M", "--no-ext-diff", *args]
+    result = run(command, capture_output=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, command)
+    return [item for item in parse_numstat(result.stdout) if not isinstance(item, str)]
+
+def changed_paths(base, tip):
+    """
+    (path, old_path) for each file that differs between the two commits,
+    from `git diff --name-status -M`: git compares trees and looks for
+    renames among added and deleted files, but diffs no file content.
+    """
+    command = ["git", "diff", "--name-status", "-z", "-M", "--no-ext-diff", base, tip, "--"]
+    result = run(command, capture_output=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, command)
+    tokens = iter(result.stdout.decode("utf-8", "replace").split("\0"))
+    paths = []
+    for status in tokens:
+        if not status:
+            continue
+        if status[0] in "RC":
+            old_path, path = next(tokens, ""), next(tokens, "")
+            paths.append((path, old_path))
+        else:
+            paths.append((next(tokens, ""), None))
+    return paths
+
+def _stat_chunks(paths, size):
+    """
+    (pathspec, renames) lists covering the changed paths, about size files
+    each, for parallel_diff_files(). Renames go in chunks of their own with both
+    names; other files are covered a directory at a time with `dir/*` globs
+    (much cheaper for git to match than one literal pathspec per file),
+    except directories too large for one chunk, which are split file by file.
+    """
+    renames = [(path, old_path) for path, old_path in paths if old_path]
+    others = [path for path, old_path in paths if not old_path]
+
+    # Grouped over the whole list: git's order puts a/b/y/z between a/b/x and
+    # a/b/zz, and a directory's glob must go to a single chunk
+    directories = {}
+    for path in others:
+        directories.setdefault(path.rpartition("/")[0], []).append(path)
+
+    chunks = []
+    current, count = [], 0
+    for directory, files in directories.items():
+        if len(files) > size:
+            chunks.extend(([f":(top,literal){path}" for path in files[start:start + size]], False)
+                          for start in range(0, len(files), size))
+            continue
+        if count + len(files) > size:
+            chunks.append((current, False))
+            current, count = [], 0
+        glob = GLOB_SPECIAL.sub(r"\\\1", directory + "/" if directory else "")
+        current.append(f":(top,glob){glob}*")
+        count += len(files)
+    if current:
+        chunks.append((current, False))
+
+    for start in range(0, len(renames), size):
+        chunks.append(([f":(top,literal){name}" for pair in renames[start:start + size] for name in pair], True))
+    return chunks, {name for pair in renames for name in pair}
+
+def parallel_diff_files(base, tip):
+    """
+    diff_files([base, tip]) for diffs of any size, kept in the diff cache
+    by tree pair. The changed paths come first from changed_paths(); their
+    line counts then come from `git diff --numstat` processes run in
+    parallel, one per CPU (or per MAX_STAT_CHUNK files), each over the
+    chunks of _stat_chunks().
+    """
+    import json
+    from .diff_cache import open_diff_cache, tree_ids
+
+    cache = open_diff_cache()
+    trees = tree_ids([base, tip]) if cache is not None else [None]
+    # Version 2: entries stored before the directory grouping fix may count files twice
+    key = cache.key("numstat", *trees, max_diff_size(), 2) if None not in trees else None
+    text = cache.get(key) if key else None
+    if text is not None:
+        return [tuple(item) for item in json.loads(text)]
+    files = _parallel_diff_files(base, tip)
+    if key:
+        cache.put(key, json.dumps(files))
+    return files
+
+def _parallel_diff_files(base, tip):
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = os.cpu_count() or 1
+    if workers == 1:
+        return diff_files([base, tip, "--"])
+    paths = changed_paths(base, tip)
+    if len(paths) <= MIN_STAT_CHUNK:
+        return diff_files([base, tip, "--"]) if paths else []
+    size = min(max(-(-len(paths) // workers), MIN_STAT_CHUNK), MAX_STAT_CHUNK)
+    chunks, renamed = _stat_chunks(paths, size)
+
+    def chunk_files(chunk):
+        pathspec, renames = chunk
+        if renames:
+            return diff_files([base, tip, "--", *pathspec])
+        # Renamed files also match the globs of their directories: they are counted in their own chunk
+        files = diff_files(["--no-renames", base, tip, "--", *pathspec])
+        return [item for item in files if item[2] not in renamed]
+
+    files = []
+    with ThreadPoolExecutor(max_workers=min(len(chunks), workers)) as executor:
+        for result in executor.map(chunk_files, chunks):
+            files.extend(result)
+    files.sort(key=lambda item: item[2])
+    return files
+
+def _file_pathspec(old_path, path):
+    return ["-M", "--", old_path, path] if old_path else ["--", path]
+
+def browse_diff_files(args, files, ask_for_enter=True, commits=False):
+    """
+    The `--stat` summary of a diff, then the patch of each file picked from
+    it, generated only when it is picked (`git diff args -- path`, through
+    the pager). Off a terminal the summary is followed by the whole patch.
+    With commits set, args are two commits and the patches go through the
+    diff cache.
+    """
+    from .numstat import format_stat
+
+    def show_patch(extra, paged):
+        load_large = confirm_large_blobs([*args, *extra])
+        with pager() if paged else nullcontext(sys.stdout) as out:
+            if commits:
+                show_tree_diff(args[0], args[1], [*args[2:], *extra], out=out, load_large=load_large)
+            else:
+                show_diff([*args, *extra], out=out, load_large=load_large)
+
+    width = min(terminal_size()[0], 100)
+    stat = format_stat([(added, deleted, f"{old_path} => {path}" if old_path else path)
+                        for added, deleted, path, old_path in files], width - 4)
+    if not (is_tty() and is_tty(sys.stdin)):
+        print("\n".join(stat) + "\n", flush=True)
+        show_patch([], paged=False)
+        print()
+        if ask_for_enter:
+            print(f"{GREEN}Press any key to return to the menu...{ENDC}")
+            read_key()
+        return
+
+    from simple_term_menu import TerminalMenu
+
+    # "|" separates an entry from its preview data in simple_term_menu
+    entries = [ANSI_ESCAPE.sub("", line).replace("|", "\\|") for line in stat[:-1]]
+    while True:
+        print(f"{BLUE}{ANSI_ESCAPE.sub('', stat[-1]).strip()}{ENDC}\n")
+        terminal_menu = TerminalMenu(
+            entries + ["[a] All files", "[␣] Back to previous menu"],
+            title="Select a file to see its changes:",
+            menu_cursor=MENU_CURSOR,
+            menu_cursor_style=MENU_CURSOR_STYLE,
+            accept_keys=("enter", "a", " ", "q")
+        )
+        menu_entry_index = terminal_menu.show()
+        chosen_key = terminal_menu.chosen_accept_key
+
+        if chosen_key in (" ", "q") or menu_entry_index is None or menu_entry_index == len(files) + 1:
+            clear_terminal()
+            return
+        if chosen_key == "a" or menu_entry_index == len(files):
+            pathspec = []
+        else:
+            _, _, path, old_path = files[menu_entry_index]
+            pathspec = _file_pathspec(old_path, path)
+
+        clear_terminal()
+        show_patch(pathspec, paged=True)
+        print(f"\n{GREEN}Press any key to return to the file list...{ENDC}")
+        read_key()
+        clear_terminal()
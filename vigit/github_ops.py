@@ -1,10 +1,10 @@
-import subprocess
 import requests
 from .utils import YELLOW, GREEN, ENDC
+from .runner import run
 
 def get_github_token():
     try:
-        result = subprocess.run(
+        result = run(
             ["git", "config", "--global", "github.token"],
             capture_output=True,
             text=True
@@ -0,0 +1,225 @@
+import bisect
+import heapq
+import sys
+
+from .utils import ORANGE, DARK_BLUE, WHITE, CYAN, MAGENTA, GREEN, RED, YELLOW, BLUE, ENDC
+from .objects import relative_date
+from .history_view import format_decorations, history_stream
+from .render import screen, is_tty, read_key, terminal_size, fit
+
+LANE_COLORS = [RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN]
+DIM = "\033[2m"
+
+# A lane with no commit, fork or merge in this many rows is inactive and,
+# while collapsing is on, hidden until its next commit arrives
+INACTIVE_ROWS = 30
+
+# Lane ends, starts and junctions as they look when the horizontal line goes on past them
+THROUGH = {"┘": "┴", "└": "┴", "┐": "┬", "┌": "┬", "┤": "┼", "├": "┼"}
+
+# Commits laid out per read from the history stream
+COMMIT_BATCH = 256
+
+
+class GraphRow:
+    """
+    One commit as laid out: the character drawn in each lane (' ' where the
+    lane is free) and which lanes take part in this row, which are always
+    shown.
+    """
+
+    def __init__(self, entry, column, cells, involved, last_used):
+        self.entry = entry
+        self.column = column
+        self.cells = cells
+        self.involved = involved
+        self.last_used = last_used
+
+    def graph(self, row_number, collapse):
+        parts = []
+        hidden = 0
+        for lane, cell in enumerate(self.cells):
+            if collapse and lane not in self.involved and self.last_used[lane] < row_number - INACTIVE_ROWS:
+                if cell != " ":
+                    hidden += 1
+                continue
+            color = LANE_COLORS[lane % len(LANE_COLORS)]
+            parts.append(f"{color}{cell}{ENDC}" if cell != " " else " ")
+        graph = "".join(parts).rstrip()
+        if hidden:
+            graph += f" {DIM}⋯{hidden}{ENDC}"
+        return graph
+
+
+class GraphLayout:
+    """
+    Incremental lane assignment for commits arriving in topological order
+    (children before parents). Each lane holds the commit it is waiting for;
+    a commit takes the first lane waiting for it (or a free one), other
+    lanes waiting for it merge into it, its first parent continues in its
+    lane and further parents get the lane already waiting for them or a new
+    one. Only the lane list is kept between commits, so laying out the first
+    screen does not depend on the size of the history.
+    """
+
+    def __init__(self):
+        self.lanes = []
+        self.last_used = []
+        self.waiting = {}
+        self._free = []
+        self.rows = 0
+
+    def _free_lane(self):
+        while self._free:
+            lane = heapq.heappop(self._free)
+            if lane < len(self.lanes) and self.lanes[lane] is None:
+                return lane
+        self.lanes.append(None)
+        self.last_used.append(self.rows)
+        return len(self.lanes) - 1
+
+    def _assign(self, lane, oid):
+        self.lanes[lane] = oid
+        if oid is None:
+            heapq.heappush(self._free, lane)
+        else:
+            bisect.insort(self.waiting.setdefault(oid, []), lane)
+
+    def place(self, entry):
+        oid, parents = entry.oid, entry.parents
+        waiting = self.waiting.pop(oid, [])
+        column = waiting[0] if waiting else self._free_lane()
+        cells = ["│" if expected is not None else " " for expected in self.lanes]
+        marks = {column: "●"}
+
+        # Other lanes waiting for this commit end here
+        for lane in waiting[1:]:
+            marks[lane] = "┘" if lane > column else "└"
+            self._assign(lane, None)
+
+        self._assign(column, parents[0] if parents else None)
+        for parent in parents[1:]:
+            existing = [lane for lane in self.waiting.get(parent, ()) if lane != column]
+            if existing:
+                lane = existing[0]
+                marks[lane] = "┤" if lane > column else "├"
+            else:
+                lane = self._free_lane()
+                if lane >= len(cells):
+                    cells.extend(" " * (lane + 1 - len(cells)))
+                self._assign(lane, parent)
+                marks[lane] = "┐" if lane > column else "┌"
+
+        if len(marks) > 1:
+            # Horizontal line from the commit to every lane it joins or forks;
+            # marks it runs through become tees
+            low, high = min(marks), max(marks)
+            for lane in range(low, high + 1):
+                if lane not in marks:
+                    cells[lane] = "┼" if cells[lane] == "│" else "─"
+                elif low < lane < high and lane != column:
+                    marks[lane] = THROUGH[marks[lane]]
+        for lane, mark in marks.items():
+            cells[lane] = mark
+            self.last_used[lane] = self.rows
+
+        last_used = self.last_used[:len(cells)]
+        while self.lanes and self.lanes[-1] is None:
+            self.lanes.pop()
+            self.last_used.pop()
+
+        row = GraphRow(entry, column, "".join(cells), set(marks), last_used)
+        self.rows += 1
+        return row
+
+
+def format_graph_row(row, row_number, collapse, width):
+    entry = row.entry
+    line = (f"{row.graph(row_number, collapse)} {ORANGE}{entry.short_oid}{ENDC}{format_decorations(entry.refs)} "
+            f"{WHITE}{entry.subject}{ENDC} {DARK_BLUE}| {CYAN}{entry.author}{ENDC} "
+            f"{DARK_BLUE}| {MAGENTA}{relative_date(entry.timestamp)}{ENDC}")
+    return fit(line, width) if width else line
+
+
+class GraphPager:
+    """Rows of the --all graph, laid out only as far down as the screen has been."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.layout = GraphLayout()
+        self.rows = []
+        self._exhausted = False
+        self.top = 0
+        self.collapse = True
+
+    def ensure(self, count):
+        while len(self.rows) < count and not self._exhausted:
+            batch = self.stream.read(COMMIT_BATCH)
+            if not batch:
+                self._exhausted = True
+            self.rows.extend(self.layout.place(entry) for entry in batch)
+        return min(count, len(self.rows))
+
+    def visible(self, height):
+        end = self.ensure(self.top + height)
+        return [(number, self.rows[number]) for number in range(self.top, end)]
+
+    def scroll(self, count, height):
+        self.ensure(self.top + count + height)
+        self.top = max(0, min(self.top + count, len(self.rows) - 1))
+
+    def close(self):
+        self.stream.close()
+
+
+def browse_graph():
+    """[j/k] line, [space/b] page, [g] first, [c] collapse inactive lanes on/off, [q] back."""
+    pager = GraphPager(history_stream()(["--all", "--topo-order"]))
+    try:
+        while True:
+            width, height = terminal_size()
+            page = height - 1
+            with screen():
+                rows = pager.visible(page)
+                for number, row in rows:
+                    print(format_graph_row(row, number, pager.collapse, width))
+                print("\n" * (page - len(rows)), end="")
+                collapse = "on" if pager.collapse else "off"
+                print(f"{GREEN}[j/k] line  [space/b] page  [g] first  [c] collapse inactive lanes ({collapse})  "
+                      f"[q] back{ENDC}", end="")
+
+            key = read_key(sequences=True)
+            if key in ("j", "\r", "\n", "\x1b[B", "\x1bOB"):
+                pager.scroll(1, page)
+            elif key in ("k", "\x1b[A", "\x1bOA"):
+                pager.scroll(-1, page)
+            elif key in (" ", "f", "\x1b[6~"):
+                pager.scroll(page - 1, page)
+            elif key in ("b", "\x1b[5~"):
+                pager.scroll(-(page - 1), page)
+            elif key in ("g", "\x1b[H"):
+                pager.top = 0
+            elif key == "c":
+                pager.collapse = not pager.collapse
+            elif key in ("q", "x", "\x1b", "\x03", ""):
+                break
+    finally:
+        pager.close()
+        print()
+
+def print_graph():
+    """The whole graph, streamed as it is laid out (for pipes and redirects)."""
+    stream = history_stream()(["--all", "--topo-order"])
+    layout = GraphLayout()
+    try:
+        for number, entry in enumerate(stream):
+            print(format_graph_row(layout.place(entry), number, True, None))
+    finally:
+        stream.close()
+
+def show_graph_history():
+    """Pager on a terminal, plain streamed output otherwise."""
+    if is_tty() and is_tty(sys.stdin):
+        browse_graph()
+    else:
+        print_graph()
@@ -0,0 +1,71 @@
+import os
+
+from .utils import BLUE, YELLOW, ORANGE, DARK_BLUE, WHITE, MAGENTA, ENDC
+from .snapshot import get_snapshot
+from .objects import relative_date
+from .render import screen
+
+# Default colors of `git status -s`
+STATUS_STAGED = '\033[32m'
+STATUS_UNSTAGED = '\033[31m'
+
+
+def format_last_commit(commit):
+    """One-line summary of a commit, styled like the Show menu's `git log -1` format."""
+    if commit is None:
+        return ""
+    return (f"{ORANGE}● {commit.short_oid} {DARK_BLUE}► {WHITE}{commit.subject} "
+            f"{MAGENTA}({relative_date(commit.committer_time)}){ENDC}")
+
+def _display_path(path, work_tree):
+    # Like `git status -s`, paths are shown relative to the current directory
+    if not work_tree:
+        return path
+    return os.path.relpath(os.path.join(work_tree, path))
+
+def format_status_entry(entry, work_tree=None):
+    """A status entry as a colored `git status -s` line."""
+    path = _display_path(entry.path, work_tree)
+    if entry.orig_path:
+        path = f"{_display_path(entry.orig_path, work_tree)} -> {path}"
+    if entry.untracked:
+        return f"{STATUS_UNSTAGED}??{ENDC} {path}"
+
+    staged, unstaged = (" " if c == "." else c for c in entry.xy)
+    if entry.kind == "u":
+        return f"{STATUS_UNSTAGED}{staged}{unstaged}{ENDC} {path}"
+    staged = f"{STATUS_STAGED}{staged}{ENDC}" if staged != " " else staged
+    unstaged = f"{STATUS_UNSTAGED}{unstaged}{ENDC}" if unstaged != " " else unstaged
+    return f"{staged}{unstaged} {path}"
+
+
+def print_status_header():
+    """
+    Overall Status and Last Commit sections shown above the Show and Add
+    menus. Costs one `git status --porcelain=v2` and one HEAD lookup per
+    redraw, and is written to the terminal in one go.
+    """
+    snapshot = get_snapshot()
+    snapshot.refresh_status()
+    work_tree = getattr(snapshot.store, "work_tree", None)
+
+    with screen(clear=False):
+        print(f"\n{BLUE}Overall Status:{ENDC}")
+        entries = [entry for entry in snapshot.status_entries() if entry.kind != "!"]
+        if entries:
+            for entry in entries:
+                print(format_status_entry(entry, work_tree))
+        else:
+            print("Working tree clean")
+
+        try:
+            if snapshot.has_commits():
+                last_commit = format_last_commit(snapshot.last_commit())
+                if last_commit:
+                    print(f"\n{BLUE}Last Commit:{ENDC}")
+                    print(last_commit)
+            else:
+                print(f"\n{YELLOW}No commits yet in this repository.{ENDC}")
+        except Exception:
+            print(f"\n{YELLOW}No commit history available.{ENDC}")
+        print()
@@ -0,0 +1,308 @@
+import subprocess
+import sys
+from collections import deque
+
+from .utils import ORANGE, DARK_BLUE, WHITE, CYAN, MAGENTA, GREEN, RED, YELLOW, BLUE, BOLD, ENDC
+from .objects import relative_date
+from .render import screen, is_tty, read_key, terminal_size
+from .runner import run, popen
+
+# One record per commit, fields separated by \x1f; `git log -z` ends each record with NUL
+LOG_FORMAT = "%H%x1f%h%x1f%D%x1f%an%x1f%at%x1f%P%x1f%s"
+
+# Commits per window when the whole history is printed oldest first
+PRINT_PAGE_SIZE = 2000
+
+
+class HistoryEntry:
+    """One commit as shown by the history views."""
+
+    def __init__(self, oid, short_oid, refs, author, timestamp, subject, parents=()):
+        self.oid = oid
+        self.short_oid = short_oid
+        self.refs = refs
+        self.author = author
+        self.timestamp = timestamp
+        self.subject = subject
+        self.parents = parents
+
+    @classmethod
+    def parse(cls, record):
+        oid, short_oid, refs, author, timestamp, parents, subject = record.split("\x1f", 6)
+        return cls(oid, short_oid, refs, author, int(timestamp or 0), subject, tuple(parents.split()))
+
+
+def format_decorations(refs):
+    """Colors a %D ref list the way `git log --decorate` does."""
+    if not refs:
+        return ""
+    parts = []
+    for ref in refs.split(", "):
+        if ref.startswith("HEAD -> "):
+            parts.append(f"{BOLD}{CYAN}HEAD -> {GREEN}{ref[len('HEAD -> '):]}{ENDC}")
+        elif ref == "HEAD":
+            parts.append(f"{BOLD}{CYAN}HEAD{ENDC}")
+        elif ref.startswith("tag: "):
+            parts.append(f"{BOLD}{YELLOW}{ref}{ENDC}")
+        elif "/" in ref:
+            parts.append(f"{BOLD}{RED}{ref}{ENDC}")
+        else:
+            parts.append(f"{BOLD}{GREEN}{ref}{ENDC}")
+    return f" {YELLOW}({ENDC}" + f"{YELLOW}, {ENDC}".join(parts) + f"{YELLOW}){ENDC}"
+
+def format_history_entry(entry, width=None):
+    """
+    `● abc1234 (refs) ► subject | author | 2 days ago`, the layout of the
+    detailed history. The subject is cut so the line fits in width.
+    """
+    when = relative_date(entry.timestamp)
+    subject = entry.subject
+    if width:
+        decorations = f" ({entry.refs})" if entry.refs else ""
+        fixed = len(f"● {entry.short_oid}{decorations} ► ") + len(f" | {entry.author} | {when}")
+        room = max(10, width - fixed)
+        if len(subject) > room:
+            subject = subject[:room - 1] + "…"
+    return (f"{ORANGE}● {entry.short_oid}{ENDC}{format_decorations(entry.refs)}"
+            f"{DARK_BLUE} ► {WHITE}{subject}{ENDC} {DARK_BLUE}| {CYAN}{entry.author}{ENDC} "
+            f"{DARK_BLUE}| {MAGENTA}{when}{ENDC}")
+
+
+class LogStream:
+    """
+    Commits from one `git log` process, parsed only as they are asked for.
+    Reading stops as soon as the caller has enough, so showing the first page
+    of a long history does not wait for git to walk the rest of it.
+    """
+
+    separator = b"\0"
+
+    def __init__(self, args=(), skip=0):
+        self.position = skip
+        self._buffer = b""
+        self._records = deque()
+        self._done = False
+        self.process = popen(self.command(args, skip), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def command(self, args, skip):
+        return ["git", "log", "-z", f"--format={LOG_FORMAT}", f"--skip={skip}", *args]
+
+    def parse(self, record):
+        return HistoryEntry.parse(record.decode("utf-8", "replace"))
+
+    def _next_record(self):
+        # Each chunk is split once; partitioning the buffer per record would copy it every time
+        while not self._records:
+            if self._done:
+                record, self._buffer = self._buffer, b""
+                return record or None
+            chunk = self.process.stdout.read1(65536)
+            if not chunk:
+                self._done = True
+                continue
+            *complete, self._buffer = (self._buffer + chunk).split(self.separator)
+            self._records.extend(complete)
+        return self._records.popleft()
+
+    def __iter__(self):
+        while True:
+            record = self._next_record()
+            if record is None:
+                return
+            record = record.lstrip(b"\n")
+            if record:
+                self.position += 1
+                yield self.parse(record)
+
+    def read(self, count):
+        entries = []
+        if count <= 0:
+            return entries
+        for entry in self:
+            entries.append(entry)
+            if len(entries) == count:
+                break
+        return entries
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+        self.process.stdout.close()
+        self.process.wait()
+
+
+def count_commits(args=()):
+    """Number of commits `git log args` would list, without formatting any of them."""
+    result = run(["git", "rev-list", "--count", *(args or ["HEAD"])], capture_output=True, text=True)
+    try:
+        return int(result.stdout.strip())
+    except ValueError:
+        return 0
+
+
+class HistoryPager:
+    """
+    Page-by-page history browser. Newest first, pages come from a single
+    `git log` process that is only read as far as the pages shown; going
+    back or jumping restarts it with --skip. Oldest first, the commit count
+    tells which --skip/--max-count window holds each page, so the history
+    is never walked to the end and reversed in memory. Only the page on
+    screen is kept.
+
+    stream builds the LogStream for (args, skip); the commit index passes
+    one that reads commits from SQLite instead of formatting them in git.
+    """
+
+    def __init__(self, oldest_first=False, page_size=None, stream=LogStream):
+        self.oldest_first = oldest_first
+        self.page_size = page_size
+        self.stream = stream
+        self.offset = 0
+        self.date = None
+        self._stream = None
+        self._total = None
+
+    def _filters(self):
+        if not self.date:
+            return []
+        # Oldest first a date is where the history starts, newest first where it ends
+        return [f"--since={self.date}"] if self.oldest_first else [f"--until={self.date}"]
+
+    def _reset(self):
+        if self._stream is not None:
+            self._stream.close()
+        self._stream = None
+        self._total = None
+
+    def total(self):
+        if self._total is None:
+            self._total = count_commits(self._filters() + ["HEAD"])
+        return self._total
+
+    def page(self):
+        size = self.page_size
+        if self.oldest_first:
+            end = self.total() - self.offset
+            start = max(0, end - size)
+            if end <= 0:
+                return []
+            stream = self.stream(self._filters() + [f"--max-count={end - start}"], skip=start)
+            try:
+                return list(reversed(stream.read(end - start)))
+            finally:
+                stream.close()
+
+        if self._stream is None or self._stream.position != self.offset:
+            self._reset()
+            self._stream = self.stream(self._filters(), skip=self.offset)
+        return self._stream.read(size)
+
+    def close(self):
+        self._reset()
+
+    # NAVIGATION
+    def next_page(self):
+        self.offset += self.page_size
+
+    def previous_page(self):
+        self.offset = max(0, self.offset - self.page_size)
+
+    def toggle_order(self):
+        self._reset()
+        self.oldest_first = not self.oldest_first
+        self.offset = 0
+
+    def go_to(self, offset):
+        self.offset = max(0, offset)
+
+    def go_to_date(self, date):
+        self._reset()
+        self.date = date or None
+        self.offset = 0
+
+
+def _prompt(text):
+    print(f"\n{YELLOW}{text}{ENDC} ", end="", flush=True)
+    try:
+        return input().strip()
+    except EOFError:
+        return ""
+
+def history_stream():
+    """LogStream factory: commits from the commit index when it can be used, from `git log` otherwise."""
+    from .commit_index import open_commit_index, IndexedLogStream
+    index = open_commit_index()
+    if index is None:
+        return LogStream
+    return lambda args=(), skip=0: IndexedLogStream(index, args, skip)
+
+def browse_history(oldest_first=True):
+    """Interactive history pager: [n]ext, [p]revious, [o]rder, [g]o to offset, [d]ate, [q]uit."""
+    width, height = terminal_size()
+    pager = HistoryPager(oldest_first=oldest_first, page_size=max(5, height - 6), stream=history_stream())
+    retried = False
+    try:
+        while True:
+            entries = pager.page()
+            if not entries and pager.offset > 0 and not retried:
+                # Past the end (e.g. after a jump): show the last page instead, once,
+                # so a history that shrank under us ends on "No commits to show"
+                retried = True
+                pager.go_to(pager.total() - pager.page_size)
+                continue
+            retried = False
+
+            order = "oldest first" if pager.oldest_first else "newest first"
+            since = f", {'since' if pager.oldest_first else 'until'} {pager.date}" if pager.date else ""
+            with screen():
+                print(f"{BLUE}Commit History{ENDC} ({order}{since}) "
+                      f"- commits {pager.offset + 1}-{pager.offset + len(entries)}\n")
+                if not entries:
+                    print(f"{YELLOW}No commits to show.{ENDC}")
+                for entry in entries:
+                    print(format_history_entry(entry, width))
+                print(f"\n{GREEN}[n/space] next  [p] previous  [o] order  [g] go to #  [d] date  [q] back{ENDC}")
+
+            key = read_key().lower()
+            if key in ("n", " ", "\r", "\n", "j"):
+                if len(entries) == pager.page_size:
+                    pager.next_page()
+            elif key in ("p", "b", "k"):
+                pager.previous_page()
+            elif key == "o":
+                pager.toggle_order()
+            elif key == "g":
+                target = _prompt("Go to commit number:")
+                if target.isdigit():
+                    pager.go_to(int(target) - 1)
+            elif key == "d":
+                pager.go_to_date(_prompt("Date (e.g. 2024-01-31, '2 weeks ago', empty to clear):"))
+            elif key in ("q", "x", "\x1b", "\x03", ""):
+                break
+    finally:
+        pager.close()
+
+def print_history(oldest_first=True):
+    """
+    Whole history without paging (for pipes and redirects), written a page
+    at a time like the pager reads it: `git log --reverse` would walk the
+    whole history before printing anything.
+    """
+    pager = HistoryPager(oldest_first=oldest_first, page_size=PRINT_PAGE_SIZE, stream=history_stream())
+    try:
+        while True:
+            entries = pager.page()
+            for entry in entries:
+                print(format_history_entry(entry))
+            if len(entries) < pager.page_size:
+                break
+            pager.next_page()
+    finally:
+        pager.close()
+
+def show_commit_history(oldest_first=True):
+    """Pager on a terminal, plain streamed output otherwise."""
+    if is_tty() and is_tty(sys.stdin):
+        browse_history(oldest_first)
+    else:
+        print_history(oldest_first)
@@ -1,158 +1,125 @@
 #!/usr/bin/env python3
 
-import subprocess
 import sys
-import argparse
-import os
 import warnings
+import importlib
+from types import SimpleNamespace
 
 # Filtrar advertencias de urllib3 relacionadas con SSL
 warnings.filterwarnings("ignore", category=Warning, module="urllib3")
 
-from enum import Enum
-from simple_term_menu import TerminalMenu
-
-from .utils import BG_BLUE, YELLOW, GREEN, ENDC, BOLD, BG_PURPLE, BLACK_TEXT, WHITE_TEXT
-from .constants import start_menu, main_menu, main_local_menu, main_remote_menu, branch_local_menu, branch_remote_menu, manage_branch_menu, updated_start_menu, MENU_CURSOR, MENU_CURSOR_STYLE, show_menu, add_menu
-from .checks import is_git_installed, is_git_repo, print_not_git_repo, current_branch, get_current_branch, is_current_branch_main
-from .menu import work_in_main, create_local_repo, commit_to_local_repo, commit_and_push, main_local, main_remote, create_remote_repo
-from .show_menu import show_menu_options, show_status_long, general_view, show_detailed_history, show_expanded_history, show_tracking_history, show_differences_history, show_local_repo, show_remote_repo, show_branches, show_differences_non_staged, show_differences_staged, show_differences_between_commits, show_differences_between_branches
-from .branx_local import go_to_branch, go_to_main, create_local_branch
-from .branx_remote import commit_and_push_in_branch, push_changes_to_remote_branch, create_remote_branch
-from .branx_manage import merge_branches, manage_branches, merge_with_main, merge_with_selected_branch
-from .branx import work_in_branches
-from .advanced import advanced_operations
-from .config import configuration
-from .add_menu import add_menu_options, add_tracked_files, add_all_files
+from .utils import YELLOW, GREEN, ENDC, BOLD, BG_PURPLE, BLACK_TEXT
+from .constants import main_local_menu, main_remote_menu, branch_local_menu, manage_branch_menu, updated_start_menu, MENU_CURSOR, MENU_CURSOR_STYLE, show_menu, add_menu
+from .checks import is_git_installed, is_git_repo, print_not_git_repo, current_branch, get_current_branch
+from .runner import run, enable_tracing
+from .render import clear_screen
+
+
+# QUICK ACTIONS
+# (commands, help, module, function, keyword arguments). The first command is
+# the canonical one, the rest are aliases. Modules are imported only when their
+# command runs, so `vg s` does not load the menus, requests or simple_term_menu.
+QUICK_ACTIONS = [
+    (['a'], 'Add a local repo', 'menu', 'create_local_repo', {}),
+    (['ar'], 'Add repo to remote', 'menu', 'create_remote_repo', {}),
+    (['b'], 'Add a local branch', 'branx_local', 'create_local_branch', {}),
+    (['br'], 'Create a branch directly on remote', 'branx_remote', 'create_remote_branch', {}),
+    (['c'], 'Commit to local repo', 'menu', 'commit_to_local_repo', {}),
+    (['p'], 'Commit & Push in current branch', 'menu', 'commit_and_push', {}),
+    (['f'], 'Merge branch with main', 'branx_manage', 'merge_branches', {}),
+    (['g'], 'Go to a different branch', 'branx_local', 'go_to_branch', {}),
+    (['m', 'mo'], 'Merge current branch with main', 'branx_manage', 'merge_with_main', {}),
+    (['mb'], 'Merge current branch with selected branch', 'branx_manage', 'merge_with_selected_branch', {}),
+    (['n'], 'New Configuration', 'config', 'configuration', {}),
+    (['optimize'], 'Optimize repository (commit-graph, multi-pack-index, bitmaps)', 'optimize', 'optimize_repository', {'ask_for_enter': False}),
+    (['s', 'ss'], 'See detailed status', 'show_menu', 'show_status_long', {}),
+    (['v', 'sv'], 'General View', 'show_menu', 'general_view', {}),
+    (['sd', 'sdd'], 'Show differences of non staged files', 'show_menu', 'show_differences_non_staged', {'ask_for_enter': False}),
+    (['sda'], 'Show differences of added files', 'show_menu', 'show_differences_staged', {'ask_for_enter': False}),
+    (['sdc'], 'Show differences between commits', 'show_menu', 'show_differences_between_commits', {'ask_for_enter': False}),
+    (['sdb'], 'Show differences between branches', 'show_menu', 'show_differences_between_branches', {'ask_for_enter': False}),
+    (['h', 'sh', 'shh', 'sc'], 'Show commit history', 'show_menu', 'show_detailed_history', {'ask_for_enter': False}),
+    (['shx', 'sx', 'hx'], 'Show expanded history', 'show_menu', 'show_expanded_history', {'ask_for_enter': False}),
+    (['sht', 'st', 'ht'], 'Show tracking history', 'show_menu', 'show_tracking_history', {'ask_for_enter': False}),
+    (['shd', 'hd'], 'Show differences history', 'show_menu', 'show_differences_history', {'ask_for_enter': False}),
+    (['shp', 'hp'], 'Show history of a file or directory', 'path_history', 'show_path_history', {'ask_for_enter': False}),
+    (['find', 'sf'], 'Find commits by message, author or content', 'search', 'find_commits', {'ask_for_enter': False}),
+    (['blame', 'sa'], 'Blame a file, line by line', 'blame_view', 'blame_file', {'ask_for_enter': False}),
+    (['sl', 'l'], 'Show local repo', 'show_menu', 'show_local_repo', {'ask_for_enter': False}),
+    (['sr', 'r'], 'Show remote repo', 'show_menu', 'show_remote_repo', {'ask_for_enter': False}),
+    (['sb'], 'Show branches', 'show_menu', 'show_branches', {'ask_for_enter': False}),
+    (['at'], 'Add tracked files', 'add_menu', 'add_tracked_files', {'ask_for_enter': False}),
+    (['aa'], 'Add all files', 'add_menu', 'add_all_files', {'ask_for_enter': False}),
+]
+
+# Commands that take an optional commit message
+MESSAGE_COMMANDS = {'c', 'p'}
+
+COMMANDS = {command: action for action in QUICK_ACTIONS for command in action[0]}
+
+
+def resolve_action(command):
+    """Importa el módulo de una acción rápida y devuelve su función"""
+    _, _, module_name, function_name, _ = COMMANDS[command]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, function_name)
+
+def run_action(command, message=None):
+    function = resolve_action(command)
+    kwargs = COMMANDS[command][4]
+    if command in MESSAGE_COMMANDS:
+        function(message or None, **kwargs)
+    else:
+        function(**kwargs)
+
+
+def parse_quick_args(argv):
+    """
+    Parses `[--trace] [--trace-file PATH] [command [message]]` without
+    argparse. Returns None for anything else (--help, unknown commands,
+    extra arguments) so handle_args() can deal with it and report errors.
+    """
+    args = SimpleNamespace(command=None, message=None, trace=False, trace_file=None)
+    argv = list(argv)
+    while argv and argv[0].startswith('-'):
+        option = argv.pop(0)
+        if option == '--trace':
+            args.trace = True
+        elif option == '--trace-file' and argv:
+            args.trace_file = argv.pop(0)
+        elif option.startswith('--trace-file='):
+            args.trace_file = option[len('--trace-file='):]
+        else:
+            return None
+
+    if not argv:
+        return args
+    if argv[0] not in COMMANDS:
+        return None
+    args.command = argv.pop(0)
+    if args.command in MESSAGE_COMMANDS and len(argv) == 1 and not argv[0].startswith('-'):
+        args.message = argv.pop(0)
+    return args if not argv else None
 
 
 def handle_args():
+    import argparse
+
     parser = argparse.ArgumentParser(description="Visual Git Command Line Tool")
+    parser.add_argument('--trace', action='store_true', help='Print a summary of every git invocation at exit (or set VG_TRACE=1)')
+    parser.add_argument('--trace-file', metavar='PATH', help='Append every git invocation to PATH as JSONL (or set VG_TRACE_FILE)')
 
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
-
-    # Command: vg a (add repo)
-    add_parser = subparsers.add_parser('a', help='Quick action: Add a local repo')
-
-    # Command: vg ar (add remote repo)
-    ar_parser = subparsers.add_parser('ar', help='Quick action: Add repo to remote')
-
-    # Command: vg b (add-branch)
-    b_parser = subparsers.add_parser('b', help='Quick action: Add a local branch')
-
-    # Command: vg br (branch to remote)
-    br_parser = subparsers.add_parser('br', help='Quick action: Create a branch directly on remote')
-
-    # Command: vg c (commit)
-    c_parser = subparsers.add_parser('c', help='Quick action: Commit to local repo')
-    c_parser.add_argument('message', nargs='?', help='Commit message')
-
-    # Command: vg p (commit-push-main)
-    p_parser = subparsers.add_parser('p', help='Quick action: Commit & Push in current branch')
-    p_parser.add_argument('message', nargs='?', help='Commit message')
-
-    # Command: vg f (merge/fusion)
-    f_parser = subparsers.add_parser('f', help='Quick action: Merge branch with main')
-
-    # Command: vg g (goto branch)
-    g_parser = subparsers.add_parser('g', help='Quick action: Go to a different branch')
-
-    # Command: vg m (merge with main)
-    m_parser = subparsers.add_parser('m', help='Quick action: Merge current branch with main')
-
-    # Command: vg mo (merge with main - alternative)
-    mo_parser = subparsers.add_parser('mo', help='Quick action: Merge current branch with main')
-
-    # Command: vg mb (merge with branch)
-    mb_parser = subparsers.add_parser('mb', help='Quick action: Merge current branch with selected branch')
-
-    # Command: vg n (new configuration)
-    n_parser = subparsers.add_parser('n', help='Quick action: New Configuration')
-
-    # Command: vg s (see log)
-    s_parser = subparsers.add_parser('s', help='Quick action: See detailed status')
-
-    # Command: vg ss (same as s)
-    ss_parser = subparsers.add_parser('ss', help='Quick action: See detailed status (alias of s)')
-
-    # Command: vg v (general view)
-    v_parser = subparsers.add_parser('v', help='Quick action: General View')
-
-    # Command: vg sv (same as v)
-    sv_parser = subparsers.add_parser('sv', help='Quick action: General View (alias of v)')
-
-    # Command: vg sd (diff non-staged)
-    sd_parser = subparsers.add_parser('sd', help='Quick action: Show differences of non staged files')
-
-    # Command: vg sdd (same as sd)
-    sdd_parser = subparsers.add_parser('sdd', help='Quick action: Show differences of non staged files (alias of sd)')
-
-    # Command: vg sda (diff staged/added)
-    sda_parser = subparsers.add_parser('sda', help='Quick action: Show differences of added files')
-
-    # Command: vg sdc (diff between commits)
-    sdc_parser = subparsers.add_parser('sdc', help='Quick action: Show differences between commits')
-
-    # Command: vg sdb (diff between branches)
-    sdb_parser = subparsers.add_parser('sdb', help='Quick action: Show differences between branches')
-
-    # Command: vg h (history)
-    h_parser = subparsers.add_parser('h', help='Quick action: Show commit history')
-
-    # Command: vg sh (same as h)
-    sh_parser = subparsers.add_parser('sh', help='Quick action: Show commit history (alias of h)')
-
-    # Command: vg shh (same as h)
-    shh_parser = subparsers.add_parser('shh', help='Quick action: Show commit history (alias of h)')
-
-    # Command: vg sc (same as h)
-    sc_parser = subparsers.add_parser('sc', help='Quick action: Show commit history (alias of h)')
-
-    # Command: vg shx (expanded history)
-    shx_parser = subparsers.add_parser('shx', help='Quick action: Show expanded history')
-
-    # Command: vg sx (same as shx)
-    sx_parser = subparsers.add_parser('sx', help='Quick action: Show expanded history (alias of shx)')
-
-    # Command: vg hx (same as shx)
-    hx_parser = subparsers.add_parser('hx', help='Quick action: Show expanded history (alias of shx)')
-
-    # Command: vg sht (tracking history)
-    sht_parser = subparsers.add_parser('sht', help='Quick action: Show tracking history')
-
-    # Command: vg st (same as sht)
-    st_parser = subparsers.add_parser('st', help='Quick action: Show tracking history (alias of sht)')
-
-    # Command: vg ht (same as sht)
-    ht_parser = subparsers.add_parser('ht', help='Quick action: Show tracking history (alias of sht)')
-
-    # Command: vg shd (differences history)
-    shd_parser = subparsers.add_parser('shd', help='Quick action: Show differences history')
-
-    # Command: vg hd (same as shd)
-    hd_parser = subparsers.add_parser('hd', help='Quick action: Show differences history (alias of shd)')
-
-    # Command: vg sl (local repo)
-    sl_parser = subparsers.add_parser('sl', help='Quick action: Show local repo')
-
-    # Command: vg l (same as sl)
-    l_parser = subparsers.add_parser('l', help='Quick action: Show local repo (alias of sl)')
-
-    # Command: vg sr (remote repo)
-    sr_parser = subparsers.add_parser('sr', help='Quick action: Show remote repo')
-
-    # Command: vg r (same as sr)
-    r_parser = subparsers.add_parser('r', help='Quick action: Show remote repo (alias of sr)')
-
-    # Command: vg sb (branches)
-    sb_parser = subparsers.add_parser('sb', help='Quick action: Show branches')
-
-    # Command: vg at (add tracked files)
-    at_parser = subparsers.add_parser('at', help='Quick action: Add tracked files')
-
-    # Command: vg aa (add all files)
-    aa_parser = subparsers.add_parser('aa', help='Quick action: Add all files')
+    for commands, help_text, _, _, _ in QUICK_ACTIONS:
+        for command in commands:
+            if command == commands[0]:
+                command_help = f'Quick action: {help_text}'
+            else:
+                command_help = f'Quick action: {help_text} (alias of {commands[0]})'
+            command_parser = subparsers.add_parser(command, help=command_help)
+            if command in MESSAGE_COMMANDS:
+                command_parser.add_argument('message', nargs='?', help='Commit message')
 
     return parser.parse_args()
 
@@ -161,102 +128,30 @@ def handle_args():
 print("VISUAL GIT")
 print("-" * 30)
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 def main():
-    args = handle_args()
+    args = parse_quick_args(sys.argv[1:]) or handle_args()
+
+    if args.trace or args.trace_file:
+        enable_tracing(args.trace_file)
 
     # Handle subcommands
-    if hasattr(args, 'command') and args.command:
-        if args.command == 'a':
-            create_local_repo()
-            return
-        elif args.command == 'ar':
-            create_remote_repo()
-            return
-        elif args.command == 'b':
-            create_local_branch()
-            return
-        elif args.command == 'br':
-            create_remote_branch()
-            return
-        elif args.command == 'c':
-            commit_to_local_repo(args.message if hasattr(args, 'message') and args.message else None)
-            return
-        elif args.command == 'p':
-            commit_and_push(args.message if hasattr(args, 'message') and args.message else None)
-            return
-        elif args.command == 'f':
-            merge_branches()
-            return
-        elif args.command == 'g':
-            go_to_branch()
-            return
-        elif args.command == 'm':
-            merge_with_main()
-            return
-        elif args.command == 'mo':
-            merge_with_main()
-            return
-        elif args.command == 'mb':
-            merge_with_selected_branch()
-            return
-        elif args.command == 'n':
-            configuration()
-            return
-        elif args.command == 's' or args.command == 'ss':
-            show_status_long()
-            return
-        elif args.command == 'v' or args.command == 'sv':
-            general_view()
-            return
-        elif args.command == 'sd' or args.command == 'sdd':
-            show_differences_non_staged(ask_for_enter=False)
-            return
-        elif args.command == 'sda':
-            show_differences_staged(ask_for_enter=False)
-            return
-        elif args.command == 'sdc':
-            show_differences_between_commits(ask_for_enter=False)
-            return
-        elif args.command == 'sdb':
-            show_differences_between_branches(ask_for_enter=False)
-            return
-        elif args.command == 'h' or args.command == 'sh' or args.command == 'shh' or args.command == 'sc':
-            show_detailed_history(ask_for_enter=False)
-            return
-        elif args.command == 'shx' or args.command == 'sx' or args.command == 'hx':
-            show_expanded_history(ask_for_enter=False)
-            return
-        elif args.command == 'sht' or args.command == 'st' or args.command == 'ht':
-            show_tracking_history(ask_for_enter=False)
-            return
-        elif args.command == 'shd' or args.command == 'hd':
-            show_differences_history(ask_for_enter=False)
-            return
-        elif args.command == 'sl' or args.command == 'l':
-            show_local_repo(ask_for_enter=False)
-            return
-        elif args.command == 'sr' or args.command == 'r':
-            show_remote_repo(ask_for_enter=False)
-            return
-        elif args.command == 'sb':
-            show_branches(ask_for_enter=False)
-            return
-        elif args.command == 'at':
-            add_tracked_files(ask_for_enter=False)
-            return
-        elif args.command == 'aa':
-            add_all_files(ask_for_enter=False)
-            return
+    if getattr(args, 'command', None):
+        run_action(args.command, getattr(args, 'message', None))
+        return
 
     if not is_git_installed():
         print("Git is not installed. You need to install git to use VisualGit.")
         return
 
+    from simple_term_menu import TerminalMenu
+    from .menu import main_local, main_remote
+    from .branx_manage import manage_branches
+    from .advanced import advanced_operations
+    from .config import configuration
+    from .show_menu import show_menu_options
+    from .add_menu import add_menu_options
+
     while True:
         current = current_branch()
         this_branch = get_current_branch()
@@ -330,12 +225,17 @@ def check_log():
         return
 
     try:
-        subprocess.run(["git", "log", "--oneline"])
+        run(["git", "log", "--oneline"])
     except Exception as e:
         print(f"Error checking log: {e}")
 
 
 def quick_actions():
+    from simple_term_menu import TerminalMenu
+    from .menu import create_local_repo, commit_to_local_repo, commit_and_push
+    from .branx_local import go_to_branch
+    from .branx_manage import merge_branches
+
     while True:
 
         print(f"{GREEN}Quick Actions:{ENDC}")
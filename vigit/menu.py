@@ -1,18 +1,10 @@
-import subprocess
-import os
-
 from .checks import is_git_repo, print_not_git_repo, is_connected_to_remote, print_connected_to_remote, print_not_connected_to_remote, print_git_repo
 from .utils import BLUE, DARK_BLUE, YELLOW, GREEN, ENDC
-from .github_ops import create_github_repository, get_github_token, delete_github_repository, get_github_username
 from .constants import MENU_CURSOR, MENU_CURSOR_STYLE
+from .runner import run
+from .render import clear_screen
 
 from enum import Enum
-from simple_term_menu import TerminalMenu
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print("\nVISUAL GIT")
-    print("-" * 30)
 
 
 class main_menu(Enum):
@@ -21,6 +13,7 @@ class main_menu(Enum):
 
 
 def work_in_main():
+    from simple_term_menu import TerminalMenu
     while True:
 
         print(f"\n{GREEN}Work in main: {ENDC}")
@@ -61,6 +54,7 @@ class main_local_menu(Enum):
 
 
 def main_local():
+    from simple_term_menu import TerminalMenu
     while True:
 
         print(f"{GREEN}Local:{ENDC}")
@@ -99,7 +93,7 @@ def create_local_repo():
         return
 
     try:
-        subprocess.run(["git", "init"])
+        run(["git", "init"])
         print("Local repository successfully created in the current directory.")
     except Exception as e:
         print(f"Error while creating the repository: {e}")
@@ -110,7 +104,7 @@ def commit_to_local_repo(commit_message=None):
         return
 
     try:
-        subprocess.run(["git", "add", "."])
+        run(["git", "add", "."])
 
         # Si se proporciona un mensaje de commit, lo usamos directamente
         # Si no, pedimos al usuario que lo introduzca
@@ -120,7 +114,7 @@ def commit_to_local_repo(commit_message=None):
             message = commit_message
             print(f"Using provided commit message: {message}")
 
-        subprocess.run(["git", "commit", "-m", message])
+        run(["git", "commit", "-m", message])
         print(f"{GREEN}Changes committed successfully!{ENDC}")
 
     except Exception as e:
@@ -134,7 +128,7 @@ def delete_local_repo():
     confirm = input("Are you sure you want to delete the local git repository? (yes/no): ").lower()
     if confirm == 'yes':
         try:
-            subprocess.run(["rm", "-rf", ".git"])
+            run(["rm", "-rf", ".git"])
             print("Local repository deleted successfully.")
         except Exception as e:
             print(f"Error deleting local repository: {e}")
@@ -152,6 +146,7 @@ class main_remote_menu(Enum):
     DELETE_REMOTE = 'Delete Remote Repo'
 
 def main_remote():
+    from simple_term_menu import TerminalMenu
     while True:
         print(f"{GREEN}Remote:{ENDC}")
 
@@ -193,6 +188,7 @@ def main_remote():
             quit()
 
 def create_remote_repo():
+    from .github_ops import create_github_repository
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -223,7 +219,7 @@ def create_remote_repo():
 
         if link_repo:
             try:
-                subprocess.run(["git", "remote", "add", "origin", remote_url])
+                run(["git", "remote", "add", "origin", remote_url])
                 print("Local repository successfully connected with GitHub.")
             except Exception as e:
                 print(f"Error connecting to the remote repository: {e}")
@@ -242,7 +238,7 @@ def connect_local_with_remote():
 
     remote_url = input("Enter the remote repository (GitHub) URL: ")
     try:
-        subprocess.run(["git", "remote", "add", "origin", remote_url])
+        run(["git", "remote", "add", "origin", remote_url])
         print(f"Connected local repository with remote: {remote_url}")
     except Exception as e:
         print(f"Error connecting with remote: {e}")
@@ -254,7 +250,7 @@ def commit_and_push(commit_message=None):
 
     try:
         # Get current branch
-        branch = subprocess.run(["git", "rev-parse", "--abbrev-ref", "HEAD"],
+        branch = run(["git", "rev-parse", "--abbrev-ref", "HEAD"],
                                capture_output=True, text=True).stdout.strip()
 
         if not branch:
@@ -262,7 +258,7 @@ def commit_and_push(commit_message=None):
             return
 
         # First we try to commit
-        subprocess.run(["git", "add", "."])
+        run(["git", "add", "."])
 
         # Si se proporciona un mensaje de commit, lo usamos directamente
         # Si no, pedimos al usuario que lo introduzca
@@ -272,10 +268,10 @@ def commit_and_push(commit_message=None):
             message = commit_message
             print(f"Using provided commit message: {message}")
 
-        commit_result = subprocess.run(["git", "commit", "-m", message])
+        commit_result = run(["git", "commit", "-m", message])
 
         # We try to push
-        push_result = subprocess.run(["git", "push", "origin", branch], capture_output=True, text=True)
+        push_result = run(["git", "push", "origin", branch], capture_output=True, text=True)
 
         # If push fails, we offer options
         if push_result.returncode != 0:
@@ -289,17 +285,17 @@ def commit_and_push(commit_message=None):
 
             if choice == "1":
                 # Pull with rebase to keep local commits at the end
-                pull_result = subprocess.run(["git", "pull", "--rebase", "origin", branch])
+                pull_result = run(["git", "pull", "--rebase", "origin", branch])
                 if pull_result.returncode == 0:
                     # Try push again
-                    subprocess.run(["git", "push", "origin", branch])
+                    run(["git", "push", "origin", branch])
                     print(f"{GREEN}Changes integrated and pushed successfully!{ENDC}")
                 else:
                     print(f"{YELLOW}There were conflicts during the pull. Please resolve conflicts manually.{ENDC}")
             elif choice == "2":
                 confirm = input(f"{YELLOW}WARNING! Force push will overwrite remote changes. Are you sure? (y/n): {ENDC}").lower()
                 if confirm == 'y':
-                    subprocess.run(["git", "push", "--force", "origin", branch])
+                    run(["git", "push", "--force", "origin", branch])
                     print(f"{GREEN}Force push completed.{ENDC}")
                 else:
                     print("Operation cancelled.")
@@ -316,7 +312,7 @@ def check_remote_repos():
         print_not_connected_to_remote()
         return
     try:
-        subprocess.run(["git", "remote", "-v"])
+        run(["git", "remote", "-v"])
     except Exception as e:
         print(f"Error checking remote repository: {e}")
 
@@ -325,9 +321,9 @@ def clone_remote_to_local():
     directory_name = input("Enter the directory name for the cloned repo (leave empty for default): ")
     try:
         if directory_name:
-            subprocess.run(["git", "clone", remote_url, directory_name])
+            run(["git", "clone", remote_url, directory_name])
         else:
-            subprocess.run(["git", "clone", remote_url])
+            run(["git", "clone", remote_url])
         print(f"Successfully cloned {remote_url} to {directory_name if directory_name else 'current directory'}.")
     except Exception as e:
         print(f"Error cloning remote repository: {e}")
@@ -342,7 +338,7 @@ def pull_remote_changes():
         return
 
     try:
-        subprocess.run(["git", "pull"])
+        run(["git", "pull"])
         print("Successfully pulled changes from remote.")
     except Exception as e:
         print(f"Error pulling changes from remote: {e}")
@@ -354,7 +350,7 @@ def delete_remote_repo():
 
     try:
         # Obtener información sobre los remotos configurados
-        remotes = subprocess.run(
+        remotes = run(
             ["git", "remote", "-v"],
             capture_output=True,
             text=True
@@ -377,7 +373,7 @@ def delete_remote_repo():
             user_choice = input("Do you want to delete the reference to the remote repository 'origin'? (y/n): ")
             if user_choice.lower() == 'y':
                 try:
-                    subprocess.run(["git", "remote", "remove", "origin"])
+                    run(["git", "remote", "remove", "origin"])
                     print("The 'origin' reference has been removed from your local repository.")
                     print("Note: This doesn't delete the remote repository itself, just the reference in your local config.")
                 except:
@@ -0,0 +1,204 @@
+import json
+import os
+import subprocess
+
+from .utils import ORANGE, DARK_BLUE, WHITE, CYAN, MAGENTA, GREEN, RED, ENDC
+from .objects import relative_date
+from .history_view import format_decorations
+from .render import terminal_size
+from .runner import popen
+
+# Commits per `git diff-tree --stdin` process when filling the cache
+NUMSTAT_BATCH = 200
+
+# Commits rendered per round: the first round is small so the view starts at
+# once, later ones grow so the cache is filled with several processes at a time
+FIRST_WINDOW = 50
+MAX_WINDOW = 2000
+
+
+def parse_numstat(output):
+    """
+    Yields, from `--numstat -z` output, a commit id for each commit header
+    (diff-tree --stdin) and (added, deleted, path, old_path) for each file,
+    with None counts for binary files and old_path set only for renames and
+    copies.
+    """
+    tokens = iter(output.decode("utf-8", "replace").split("\0"))
+    for token in tokens:
+        if not token:
+            continue
+        if "\t" not in token:
+            yield token.strip()
+            continue
+        added, deleted, path = token.split("\t", 2)
+        old_path = None
+        if not path:
+            # Rename or copy: the old and new paths follow as their own tokens
+            old_path, path = next(tokens, ""), next(tokens, "")
+        yield None if added == "-" else int(added), None if deleted == "-" else int(deleted), path, old_path
+
+
+def numstat(oids):
+    """
+    {oid: [(added, deleted, path), ...]} for each commit in oids, diffed
+    against its first parent (renames as 'old => new', binary files with
+    None counts). Merges get no stat, as in `git log --stat`.
+    """
+    process = popen(
+        ["git", "diff-tree", "--stdin", "-r", "-M", "--numstat", "--root", "-z"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    output, _ = process.communicate("".join(f"{oid}\n" for oid in oids).encode())
+
+    stats = {oid: [] for oid in oids}
+    current = None
+    for item in parse_numstat(output):
+        if isinstance(item, str):
+            current = stats.setdefault(item, [])
+            continue
+        added, deleted, path, old_path = item
+        current.append((added, deleted, f"{old_path} => {path}" if old_path else path))
+    return stats
+
+
+class StatCache:
+    """
+    Per-commit numstat in the commit index database, keyed by commit id.
+    A commit's stat never changes, so rows are never updated or invalidated;
+    missing ones are computed in parallel batches the first time they are
+    asked for.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.db.execute("CREATE TABLE IF NOT EXISTS numstat (oid TEXT PRIMARY KEY, files TEXT NOT NULL) WITHOUT ROWID")
+
+    def get_many(self, oids):
+        found = {}
+        for start in range(0, len(oids), 500):
+            chunk = oids[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT oid, files FROM numstat WHERE oid IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((oid, [tuple(entry) for entry in json.loads(files)]) for oid, files in rows)
+        missing = [oid for oid in oids if oid not in found]
+        if missing:
+            found.update(self.fill(missing))
+        return found
+
+    def fill(self, oids):
+        from concurrent.futures import ThreadPoolExecutor
+
+        batches = [oids[start:start + NUMSTAT_BATCH] for start in range(0, len(oids), NUMSTAT_BATCH)]
+        stats = {}
+        with ThreadPoolExecutor(max_workers=min(len(batches), os.cpu_count() or 1)) as executor:
+            for result in executor.map(numstat, batches):
+                stats.update(result)
+        self.db.executemany("INSERT OR REPLACE INTO numstat VALUES (?, ?)",
+                            [(oid, json.dumps(files)) for oid, files in stats.items()])
+        self.db.commit()
+        return stats
+
+
+def format_stat(files, width):
+    """The `git log --stat` block for one commit: ` path | 12 +++---` lines and the summary."""
+    if not files:
+        return []
+    changes = [0 if added is None else added + deleted for added, deleted, _ in files]
+    count_width = max(len(str(change)) for change in changes) if any(changes) else 1
+    count_width = max(count_width, 3) if any(added is None for added, _, _ in files) else count_width
+    name_width = min(max(len(path) for _, _, path in files), max(10, width * 5 // 8))
+    bar_width = max(5, width - name_width - count_width - 5)
+    largest = max(changes)
+
+    lines = []
+    for (added, deleted, path), change in zip(files, changes):
+        if len(path) > name_width:
+            path = "..." + path[len(path) - name_width + 3:]
+        if added is None:
+            lines.append(f" {path:<{name_width}} | {'Bin':>{count_width}}")
+            continue
+        if largest > bar_width:
+            plus = added * bar_width // largest if added else 0
+            minus = deleted * bar_width // largest if deleted else 0
+            # Every changed side keeps at least one mark
+            plus, minus = max(plus, 1 if added else 0), max(minus, 1 if deleted else 0)
+        else:
+            plus, minus = added, deleted
+        lines.append(f" {path:<{name_width}} | {change:>{count_width}} {GREEN}{'+' * plus}{RED}{'-' * minus}{ENDC}")
+
+    insertions = sum(added or 0 for added, _, _ in files)
+    deletions = sum(deleted or 0 for _, deleted, _ in files)
+    summary = [f"{len(files)} file{'s' if len(files) != 1 else ''} changed"]
+    if insertions or not deletions:
+        summary.append(f"{insertions} insertion{'s' if insertions != 1 else ''}(+)")
+    if deletions or not insertions:
+        summary.append(f"{deletions} deletion{'s' if deletions != 1 else ''}(-)")
+    lines.append(" " + ", ".join(summary))
+    return lines
+
+
+def _tracking_block(entry, prefix, continuation, files, width):
+    """One commit of the tracking view, in the layout the view had with `git log --graph --stat`."""
+    lines = [
+        f"{prefix}{ORANGE}{entry.short_oid}{ENDC}{format_decorations(entry.refs)} {DARK_BLUE}|{ENDC} "
+        f"{CYAN}{entry.author}{ENDC} {DARK_BLUE}|{ENDC} {MAGENTA}{relative_date(entry.timestamp)}{ENDC}",
+        continuation,
+        f"{continuation}{DARK_BLUE}► {WHITE}{entry.subject}{ENDC}",
+    ]
+    if files:
+        lines.append(continuation)
+        lines.extend(continuation + line for line in format_stat(files, width - len(continuation)))
+    return lines
+
+
+def write_tracking_history(index, out):
+    """
+    Writes the tracking history of HEAD to out. The graph comes from
+    `git log --graph` without any diff, commit details from the commit index
+    and file stats from the StatCache, filled window by window as the view
+    is read.
+    """
+    cache = StatCache(index.db)
+    width = min(terminal_size()[0], 100)
+    process = popen(["git", "log", "--graph", "--format=%x01%H %P"],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+    def flush(pending):
+        stats = cache.get_many([oid for kind, _, oid, _ in pending if kind == "commit"])
+        for kind, graph, oid, parents in pending:
+            if kind == "graph":
+                out.write(graph + "\n")
+                continue
+            continuation = graph.replace("*", "|" if parents else " ").rstrip() + " "
+            entry = index.entry(oid)
+            if entry is not None:
+                out.write("\n".join(_tracking_block(entry, graph, continuation, stats.get(oid), width)) + "\n")
+        out.flush()
+
+    try:
+        pending = []
+        window = FIRST_WINDOW
+        commits = 0
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            if "\x01" in line:
+                graph, _, ids = line.partition("\x01")
+                oid, _, parents = ids.partition(" ")
+                pending.append(("commit", graph, oid, parents))
+                commits += 1
+                if commits == window:
+                    flush(pending)
+                    pending, commits = [], 0
+                    window = min(window * 2, MAX_WINDOW)
+            else:
+                pending.append(("graph", line, None, None))
+        flush(pending)
+    finally:
+        if process.poll() is None:
+            process.terminate()
+        process.stdout.close()
+        process.wait()
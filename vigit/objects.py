@@ -0,0 +1,217 @@
+import atexit
+import os
+import subprocess
+import threading
+import time
+
+from .runner import popen, record
+
+
+class Commit:
+    """Parsed commit object."""
+
+    def __init__(self, oid, raw):
+        self.oid = oid
+        self.tree = None
+        self.parents = []
+        self.author = ""
+        self.author_email = ""
+        self.author_time = 0
+        self.committer = ""
+        self.committer_email = ""
+        self.committer_time = 0
+
+        header, _, message = raw.partition(b"\n\n")
+        encoding = "utf-8"
+        last_key = None
+        for line in header.split(b"\n"):
+            if line.startswith(b" ") and last_key:
+                # Continuation of a multi-line header such as gpgsig
+                continue
+            key, _, value = line.partition(b" ")
+            last_key = key
+            if key == b"tree":
+                self.tree = value.decode()
+            elif key == b"parent":
+                self.parents.append(value.decode())
+            elif key == b"author":
+                self.author, self.author_email, self.author_time = _parse_person(value)
+            elif key == b"committer":
+                self.committer, self.committer_email, self.committer_time = _parse_person(value)
+            elif key == b"encoding":
+                encoding = value.decode("ascii", "replace")
+
+        try:
+            self.message = message.decode(encoding, "replace")
+        except LookupError:
+            self.message = message.decode("utf-8", "replace")
+
+    @property
+    def subject(self):
+        # Like %s: the first paragraph folded onto one line
+        return " ".join(self.message.strip().split("\n\n")[0].split("\n")).strip()
+
+    @property
+    def short_oid(self):
+        return self.oid[:7]
+
+
+def _parse_person(value):
+    text = value.decode("utf-8", "replace")
+    name, _, rest = text.partition(" <")
+    email, _, date = rest.partition("> ")
+    try:
+        timestamp = int(date.split()[0])
+    except (IndexError, ValueError):
+        timestamp = 0
+    return name, email, timestamp
+
+
+def _ago(count, unit):
+    return f"{count} {unit}{'s' if count != 1 else ''} ago"
+
+def relative_date(timestamp, now=None):
+    """Formats a timestamp the way git's %cr / --date=relative does."""
+    now = time.time() if now is None else now
+    diff = int(now - timestamp)
+    if diff < 0:
+        return "in the future"
+    if diff < 90:
+        return _ago(diff, "second")
+    diff = (diff + 30) // 60
+    if diff < 90:
+        return _ago(diff, "minute")
+    diff = (diff + 30) // 60
+    if diff < 36:
+        return _ago(diff, "hour")
+    diff = (diff + 12) // 24
+    if diff < 14:
+        return _ago(diff, "day")
+    if diff < 70:
+        return _ago((diff + 3) // 7, "week")
+    if diff < 365:
+        return _ago((diff + 15) // 30, "month")
+    if diff < 1825:
+        total_months = (diff * 12 * 2 + 365) // (365 * 2)
+        years, months = divmod(total_months, 12)
+        if months:
+            return f"{years} year{'s' if years != 1 else ''}, {_ago(months, 'month')}"
+        return _ago(years, "year")
+    return _ago((diff + 183) // 365, "year")
+
+
+class ObjectReader:
+    """
+    Keeps one `git cat-file --batch` and one `git cat-file --batch-check`
+    process open for the whole session, so object and metadata lookups are
+    pipe round-trips instead of new git processes.
+    """
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd or os.getcwd()
+        self._processes = {}
+        self._lock = threading.Lock()
+
+    def _process(self, mode):
+        process = self._processes.get(mode)
+        if process is None or process.poll() is not None:
+            process = popen(
+                ["git", "cat-file", mode],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd
+            )
+            self._processes[mode] = process
+        return process
+
+    @staticmethod
+    def _parse_info(line):
+        parts = line.decode("utf-8", "replace").split()
+        # "<name> missing" / "<name> ambiguous", where the name can contain spaces
+        if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"):
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+    def info(self, rev):
+        """(oid, type, size) for rev, or None if it does not name an object."""
+        return self.info_many([rev])[0]
+
+    def info_many(self, revs):
+        """Looks up many revs through the batch-check process in a single round of writes."""
+        revs = list(revs)
+        if not revs:
+            return []
+        with self._lock:
+            process = self._process("--batch-check")
+            payload = "".join(f"{rev}\n" for rev in revs).encode()
+
+            # Write from a thread so a large request cannot deadlock against a full stdout pipe
+            started = time.perf_counter()
+            writer = threading.Thread(target=self._write, args=(process, payload))
+            writer.start()
+            results = [self._parse_info(process.stdout.readline()) for _ in revs]
+            writer.join()
+            record(["git", "cat-file", "--batch-check"], time.time(), time.perf_counter() - started,
+                   output_bytes=len(revs), kind="pipe")
+            return results
+
+    @staticmethod
+    def _write(process, payload):
+        try:
+            process.stdin.write(payload)
+            process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def read(self, rev):
+        """(oid, type, content) for rev, or None if it does not name an object."""
+        with self._lock:
+            process = self._process("--batch")
+            started = time.perf_counter()
+            self._write(process, f"{rev}\n".encode())
+            info = self._parse_info(process.stdout.readline())
+            content = b""
+            if info is not None:
+                content = process.stdout.read(info[2])
+                process.stdout.read(1)  # Trailing newline after the content
+            record(["git", "cat-file", "--batch"], time.time(), time.perf_counter() - started,
+                   output_bytes=len(content), kind="pipe")
+            if info is None:
+                return None
+            return info[0], info[1], content
+
+    def commit(self, rev="HEAD"):
+        """Parsed Commit for rev (peeling tags), or None."""
+        found = self.read(f"{rev}^{{commit}}")
+        if found is None or found[1] != "commit":
+            return None
+        return Commit(found[0], found[2])
+
+    def close(self):
+        with self._lock:
+            for process in self._processes.values():
+                try:
+                    process.stdin.close()
+                    process.wait(timeout=2)
+                except Exception:
+                    process.kill()
+            self._processes = {}
+
+
+_readers = {}
+
+def get_object_reader():
+    """Session-wide reader for the repository in the current directory."""
+    cwd = os.getcwd()
+    reader = _readers.get(cwd)
+    if reader is None:
+        if not _readers:
+            atexit.register(close_object_readers)
+        reader = _readers[cwd] = ObjectReader(cwd)
+    return reader
+
+def close_object_readers():
+    for reader in _readers.values():
+        reader.close()
+    _readers.clear()
@@ -0,0 +1,270 @@
+import os
+import struct
+import subprocess
+import time
+
+from .utils import BLUE, GREEN, YELLOW, RED, ENDC
+from .checks import is_git_repo, print_not_git_repo, has_commits
+from .render import read_key
+from .runner import run
+
+# Git commands behind the vigit views that these files speed up
+AFFECTED_VIEWS = [
+    ("Expanded history (hx)", [["git", "rev-list", "--all", "--topo-order"]]),
+    ("Branches, merged/not merged (sb)", [["git", "branch", "--merged"], ["git", "branch", "--no-merged"]]),
+    ("Commit count (h)", [["git", "rev-list", "--count", "HEAD"]]),
+]
+
+
+class Structure:
+    """State of one of the files git can use to avoid walking the object store."""
+
+    def __init__(self, name, present=False, stale=False, detail=""):
+        self.name = name
+        self.present = present
+        self.stale = stale
+        self.detail = detail
+
+    @property
+    def needs_build(self):
+        return not self.present or self.stale
+
+    def describe(self):
+        if not self.present:
+            return f"{RED}missing{ENDC}"
+        if self.stale:
+            return f"{YELLOW}stale{ENDC} ({self.detail})" if self.detail else f"{YELLOW}stale{ENDC}"
+        return f"{GREEN}up to date{ENDC}"
+
+
+def _read_chunks(data, table_offset, count):
+    """{chunk id: (start, end)} from a chunk table of count entries (commit-graph and MIDX format)."""
+    chunks = {}
+    entries = [struct.unpack_from(">4sQ", data, table_offset + 12 * i) for i in range(count + 1)]
+    for (chunk_id, start), (_, end) in zip(entries, entries[1:]):
+        chunks[chunk_id] = (start, end)
+    return chunks
+
+
+class GraphFile:
+    """The parts of a commit-graph file that tell whether it covers a commit and what it holds."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        signature, _, hash_version, chunk_count, _ = struct.unpack_from(">4sBBBB", self.data, 0)
+        if signature != b"CGPH":
+            raise ValueError(f"{path} is not a commit-graph file")
+        self.hash_len = 32 if hash_version == 2 else 20
+        self.chunks = _read_chunks(self.data, 8, chunk_count)
+
+    def has(self, chunk_id):
+        return chunk_id in self.chunks
+
+    def contains(self, oid):
+        raw = bytes.fromhex(oid)
+        fanout = self.chunks[b"OIDF"][0]
+        lookup = self.chunks[b"OIDL"][0]
+        low = struct.unpack_from(">I", self.data, fanout + 4 * (raw[0] - 1))[0] if raw[0] else 0
+        high = struct.unpack_from(">I", self.data, fanout + 4 * raw[0])[0]
+        while low < high:
+            middle = (low + high) // 2
+            start = lookup + middle * self.hash_len
+            current = self.data[start:start + self.hash_len]
+            if current == raw:
+                return True
+            if current < raw:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+
+def graph_paths(objects_dir):
+    """Every commit-graph file in use: the single file, or each layer of a split chain."""
+    single = os.path.join(objects_dir, "info", "commit-graph")
+    if os.path.exists(single):
+        return [single]
+    chain_dir = os.path.join(objects_dir, "info", "commit-graphs")
+    try:
+        with open(os.path.join(chain_dir, "commit-graph-chain")) as f:
+            return [os.path.join(chain_dir, f"graph-{line.strip()}.graph") for line in f if line.strip()]
+    except OSError:
+        return []
+
+def graph_files(objects_dir):
+    return [GraphFile(path) for path in graph_paths(objects_dir)]
+
+def has_changed_path_filters(objects_dir):
+    """Whether the commit-graph has Bloom filters (BIDX/BDAT), reading only the chunk tables."""
+    paths = graph_paths(objects_dir)
+    try:
+        for path in paths:
+            with open(path, "rb") as f:
+                header = f.read(8)
+                signature, _, _, chunk_count, _ = struct.unpack_from(">4sBBBB", header, 0)
+                chunks = _read_chunks(header + f.read(12 * (chunk_count + 1)), 8, chunk_count)
+            if signature != b"CGPH" or b"BIDX" not in chunks or b"BDAT" not in chunks:
+                return False
+    except (OSError, struct.error):
+        return False
+    return bool(paths)
+
+def ref_tips():
+    result = run(["git", "for-each-ref", "--format=%(objectname) %(*objectname) %(objecttype)"],
+                 capture_output=True, text=True)
+    tips = set()
+    for line in result.stdout.splitlines():
+        oid, peeled, kind = line.split(" ")
+        if kind == "commit" or peeled:
+            tips.add(peeled or oid)
+    return tips
+
+
+def inspect_commit_graph(objects_dir):
+    """Commit-graph with generation numbers (GDA2) and Bloom filters (BIDX/BDAT) covering every ref."""
+    structures = [
+        Structure("Commit-graph"),
+        Structure("Generation numbers"),
+        Structure("Changed-path Bloom filters"),
+    ]
+    try:
+        graphs = graph_files(objects_dir)
+    except (OSError, ValueError, struct.error):
+        graphs = []
+    if not graphs:
+        return structures
+
+    missing = [tip for tip in ref_tips() if not any(graph.contains(tip) for graph in graphs)]
+    graph, generations, bloom = structures
+    graph.present = True
+    graph.stale = bool(missing)
+    graph.detail = f"{len(missing)} ref tip{'s' if len(missing) != 1 else ''} not covered"
+    generations.present = all(g.has(b"GDA2") for g in graphs)
+    bloom.present = all(g.has(b"BIDX") and g.has(b"BDAT") for g in graphs)
+    # Commits added after the last write have neither
+    generations.stale = bloom.stale = graph.stale
+    generations.detail = bloom.detail = "new commits not covered" if graph.stale else ""
+    return structures
+
+def inspect_multi_pack_index(objects_dir):
+    """Multi-pack-index listing every pack, and the reachability bitmap written for it."""
+    midx = Structure("Multi-pack-index")
+    bitmap = Structure("Reachability bitmap")
+    pack_dir = os.path.join(objects_dir, "pack")
+    try:
+        packs = {name for name in os.listdir(pack_dir) if name.endswith(".idx")}
+    except OSError:
+        packs = set()
+
+    try:
+        with open(os.path.join(pack_dir, "multi-pack-index"), "rb") as f:
+            data = f.read()
+        signature, _, hash_version, chunk_count, _, _ = struct.unpack_from(">4sBBBBI", data, 0)
+        if signature != b"MIDX":
+            raise ValueError("not a multi-pack-index")
+    except (OSError, ValueError, struct.error):
+        # Without a MIDX a single-pack repository can still have a pack bitmap
+        bitmap.present = len(packs) == 1 and os.path.exists(os.path.join(pack_dir, packs.pop()[:-4] + ".bitmap"))
+        return [midx, bitmap]
+
+    start, end = _read_chunks(data, 12, chunk_count)[b"PNAM"]
+    listed = {name.decode() for name in data[start:end].split(b"\0") if name}
+    midx.present = True
+    midx.stale = listed != packs
+    midx.detail = f"{len(packs - listed)} pack(s) not listed" if packs - listed else "lists removed packs"
+
+    checksum = data[-(32 if hash_version == 2 else 20):].hex()
+    bitmap.present = os.path.exists(os.path.join(pack_dir, f"multi-pack-index-{checksum}.bitmap"))
+    bitmap.stale = bitmap.present and midx.stale
+    bitmap.detail = "written for an older multi-pack-index"
+    return [midx, bitmap]
+
+
+def objects_directory():
+    result = run(["git", "rev-parse", "--git-path", "objects"], capture_output=True, text=True)
+    return os.path.abspath(result.stdout.strip()) if result.returncode == 0 else None
+
+def inspect_repository(objects_dir):
+    return inspect_commit_graph(objects_dir) + inspect_multi_pack_index(objects_dir)
+
+
+def time_views(repeat=2):
+    """Best-of-repeat seconds for the git commands behind each affected view."""
+    timings = []
+    for name, commands in AFFECTED_VIEWS:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for command in commands:
+                run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append((name, best))
+    return timings
+
+
+def build_structures(structures):
+    """Writes the missing or stale files. Returns False if any git command failed."""
+    needed = {structure.name for structure in structures if structure.needs_build}
+    ok = True
+    if needed & {"Commit-graph", "Generation numbers", "Changed-path Bloom filters"}:
+        print(f"\n{BLUE}Writing commit-graph with generation numbers and Bloom filters...{ENDC}", flush=True)
+        result = run(["git", "-c", "commitGraph.generationVersion=2", "commit-graph", "write",
+                      "--reachable", "--changed-paths"])
+        ok = ok and result.returncode == 0
+
+    if needed & {"Multi-pack-index", "Reachability bitmap"}:
+        print(f"\n{BLUE}Writing multi-pack-index and reachability bitmap...{ENDC}", flush=True)
+        result = run(["git", "multi-pack-index", "write", "--bitmap"], stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            # Bitmaps need every reachable object packed (and git 2.34+); the MIDX alone still helps
+            print(f"{YELLOW}Could not write the bitmap: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'unknown error'}{ENDC}")
+            print(f"{YELLOW}Writing the multi-pack-index without it.{ENDC}", flush=True)
+            result = run(["git", "multi-pack-index", "write"])
+            ok = ok and result.returncode == 0
+    return ok
+
+
+def print_structures(structures):
+    for structure in structures:
+        print(f"  {structure.name:<28} {structure.describe()}")
+
+def optimize_repository(ask_for_enter=True):
+    """Crea o actualiza commit-graph, filtros Bloom, multi-pack-index y bitmaps"""
+    if not is_git_repo():
+        print_not_git_repo()
+        return
+
+    print(f"\n{GREEN}Optimize Repository{ENDC}\n")
+    objects_dir = objects_directory()
+    if not has_commits() or objects_dir is None:
+        print(f"{YELLOW}No commits yet in this repository.{ENDC}")
+        return
+
+    structures = inspect_repository(objects_dir)
+    print_structures(structures)
+
+    if not any(structure.needs_build for structure in structures):
+        print(f"\n{GREEN}The repository is already optimized.{ENDC}")
+    else:
+        print(f"\n{BLUE}Timing the affected views before...{ENDC}", flush=True)
+        before = time_views()
+        ok = build_structures(structures)
+        print(f"\n{BLUE}Timing the affected views after...{ENDC}", flush=True)
+        after = time_views()
+
+        print()
+        print_structures(inspect_repository(objects_dir))
+        print(f"\n  {'View':<34} {'before':>10} {'after':>10} {'speedup':>9}")
+        for (name, old), (_, new) in zip(before, after):
+            speedup = f"{old / new:.1f}x" if new > 0 else "-"
+            print(f"  {name:<34} {old * 1000:>8.0f}ms {new * 1000:>8.0f}ms {speedup:>9}")
+        if ok:
+            print(f"\n{GREEN}Repository optimized.{ENDC}")
+        else:
+            print(f"\n{RED}Some structures could not be written; see the git output above.{ENDC}")
+
+    if ask_for_enter:
+        print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
+        read_key()
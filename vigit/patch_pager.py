@@ -0,0 +1,244 @@
+import sys
+import time
+from collections import OrderedDict
+
+from .utils import ORANGE, DARK_BLUE, WHITE, CYAN, MAGENTA, GREEN, ENDC
+from .history_view import format_decorations, history_stream
+from .render import screen, is_tty, read_key, terminal_size, fit
+from .runner import run
+
+# Commits whose rendered patch is kept while browsing
+PATCH_CACHE_SIZE = 64
+
+# Commits read from the history stream at a time
+COMMIT_BATCH = 64
+
+# Below the list of blobs too large to diff in a commit's patch
+LOAD_LARGE = f"{GREEN}[l] Load them anyway{ENDC}"
+
+# The empty tree's id by hash length (SHA-1, SHA-256): what a root commit is diffed against
+EMPTY_TREES = {
+    40: "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+    64: "6ef19b41225c5369f1c104d45d8d85efa9b057b53b14b4b9b939dd74decc5321",
+}
+
+
+class PatchCache:
+    """Rendered patch lines by commit id, dropping the least recently shown beyond size commits."""
+
+    def __init__(self, size=PATCH_CACHE_SIZE):
+        self.size = size
+        self._patches = OrderedDict()
+
+    def get(self, oid, load):
+        lines = self._patches.get(oid)
+        if lines is not None:
+            self._patches.move_to_end(oid)
+            return lines
+        return self.put(oid, load(oid))
+
+    def put(self, oid, lines):
+        self._patches[oid] = lines
+        self._patches.move_to_end(oid)
+        if len(self._patches) > self.size:
+            self._patches.popitem(last=False)
+        return lines
+
+
+def load_patch(oid, load_large=False):
+    """
+    `--stat` and patch of one commit, colored by git, as lines (merges have
+    none, as in `git log -p`). Blobs over max_diff_size() show as binary,
+    below a list of them with their sizes and ids, unless load_large is
+    set. Kept in the diff cache by the commit's tree and its parent's, so
+    the same change is not diffed again.
+    """
+    from .diff_cache import open_diff_cache, tree_ids
+    from .diff_render import _git_diff, max_diff_size, large_blobs, format_large_blobs
+
+    tree, parent_tree, merged_tree = tree_ids([oid, f"{oid}^1", f"{oid}^2"])
+    if tree is None or merged_tree is not None:
+        return []
+    cache = open_diff_cache()
+    key = cache.key("log-patch", parent_tree or "", tree, "all" if load_large else max_diff_size()) if cache else None
+    text = cache.get(key) if key else None
+    if text is None:
+        notice = ""
+        if not load_large:
+            large = large_blobs([parent_tree or EMPTY_TREES[len(tree)], tree])
+            if large:
+                notice = "\n".join(format_large_blobs(large) + [LOAD_LARGE, "", ""])
+        result = run([*_git_diff(load_large, "log"), "-1", "--color=always", "--stat", "-p", "--format=", oid],
+                     capture_output=True)
+        text = notice + result.stdout.decode("utf-8", "replace")
+        if key is not None and result.returncode == 0:
+            cache.put(key, text)
+    # Split on "\n" only, as git's output is read: str.splitlines() also splits on \f and the like
+    text = text.expandtabs(8).strip("\n")
+    return text.split("\n") if text else []
+
+def format_patch_header(entry):
+    date = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.timestamp))
+    return [
+        f"{WHITE}{'-' * 30}{ENDC}",
+        f"{ORANGE}● {entry.short_oid}{ENDC}{format_decorations(entry.refs)}",
+        f"{DARK_BLUE}► {WHITE}{entry.subject}{ENDC} {DARK_BLUE}| {CYAN}{entry.author}{ENDC} "
+        f"{DARK_BLUE}| {MAGENTA}{date}{ENDC}",
+        "",
+    ]
+
+
+class PatchPager:
+    """
+    Scrollable list of commits with their patches, newest first. Commits are
+    read from the history stream only as far as the screen has reached, and a
+    commit's patch is generated the first time one of its lines is shown.
+    The position is (commit number, line within that commit).
+    """
+
+    def __init__(self, stream, cache=None):
+        self.stream = stream
+        self.cache = cache or PatchCache()
+        self.commits = []
+        self._exhausted = False
+        self.top = 0
+        self.line = 0
+
+    def commit(self, index):
+        while len(self.commits) <= index and not self._exhausted:
+            batch = self.stream.read(COMMIT_BATCH)
+            if not batch:
+                self._exhausted = True
+            self.commits.extend(batch)
+        return self.commits[index] if index < len(self.commits) else None
+
+    def lines(self, index):
+        entry = self.commit(index)
+        return format_patch_header(entry) + self.cache.get(entry.oid, load_patch)
+
+    def visible(self, height):
+        shown = []
+        index, line = self.top, self.line
+        while len(shown) < height and self.commit(index) is not None:
+            shown.extend(self.lines(index)[line:line + height - len(shown)])
+            index, line = index + 1, 0
+        return shown
+
+    def close(self):
+        self.stream.close()
+
+    # NAVIGATION
+    def scroll_down(self, count):
+        while count > 0:
+            remaining = len(self.lines(self.top)) - 1 - self.line
+            if count <= remaining:
+                self.line += count
+                return
+            if self.commit(self.top + 1) is None:
+                self.line += remaining
+                return
+            count -= remaining + 1
+            self.top += 1
+            self.line = 0
+
+    def scroll_up(self, count):
+        while count > 0:
+            if self.line >= count:
+                self.line -= count
+                return
+            count -= self.line
+            self.line = 0
+            if self.top == 0:
+                return
+            self.top -= 1
+            self.line = len(self.lines(self.top)) - 1
+            count -= 1
+
+    def next_commit(self):
+        if self.commit(self.top + 1) is not None:
+            self.top += 1
+            self.line = 0
+
+    def previous_commit(self):
+        if self.line == 0 and self.top > 0:
+            self.top -= 1
+        self.line = 0
+
+    def first(self):
+        self.top = self.line = 0
+
+    def load_large(self, height):
+        """Shows the first commit on screen that left out large blobs again, with them."""
+        index, shown = self.top, -self.line
+        while shown < height and self.commit(index) is not None:
+            lines = self.lines(index)
+            if LOAD_LARGE in lines:
+                self.cache.put(self.commit(index).oid, load_patch(self.commit(index).oid, load_large=True))
+                if index == self.top:
+                    self.line = min(self.line, len(self.lines(index)) - 1)
+                return
+            index, shown = index + 1, shown + len(lines)
+
+
+def browse_patches():
+    """
+    [j/k] line, [space/b] page, [n/p] commit, [g] first, [l] load large
+    files, [q] back. Arrows and Page Up/Down work too.
+    """
+    pager = PatchPager(history_stream()())
+    try:
+        while True:
+            width, height = terminal_size()
+            page = height - 1
+            with screen():
+                shown = pager.visible(page)
+                print("\n".join(fit(line, width) for line in shown))
+                print("\n" * (page - len(shown)), end="")
+                position = f"commit {pager.top + 1}"
+                print(f"{GREEN}{position}  [j/k] line  [space/b] page  [n/p] commit  [g] first  [q] back{ENDC}",
+                      end="")
+
+            key = read_key(sequences=True)
+            if key in ("j", "\r", "\n", "\x1b[B", "\x1bOB"):
+                pager.scroll_down(1)
+            elif key in ("k", "\x1b[A", "\x1bOA"):
+                pager.scroll_up(1)
+            elif key in (" ", "f", "\x1b[6~"):
+                pager.scroll_down(page - 1)
+            elif key in ("b", "\x1b[5~"):
+                pager.scroll_up(page - 1)
+            elif key == "n":
+                pager.next_commit()
+            elif key == "p":
+                pager.previous_commit()
+            elif key in ("g", "\x1b[H"):
+                pager.first()
+            elif key == "l":
+                pager.load_large(page)
+            elif key in ("q", "x", "\x1b", "\x03", ""):
+                break
+    finally:
+        pager.close()
+        print()
+
+def print_patches():
+    """
+    Every commit with its patch in one `git log -p`, written as git produces
+    it (for pipes and redirects). Blobs over max_diff_size() show as binary.
+    """
+    sys.stdout.flush()
+    from .diff_render import _git_diff
+
+    run([
+        *_git_diff(command="log"), "--color=always", "--stat", "-p",
+        f"--pretty=format:%C(white){'-' * 30}%Creset%n%C(yellow)● %h%Creset%C(auto)%d%Creset%n"
+        "%C(blue)► %C(white)%s%Creset %C(blue)| %C(cyan)%an%Creset %C(blue)| %C(magenta)%ad%Creset%n",
+        "--date=format:%Y-%m-%d %H:%M"
+    ])
+
+def show_patch_history():
+    """Pager on a terminal, plain streamed output otherwise."""
+    if is_tty() and is_tty(sys.stdin):
+        browse_patches()
+    else:
+        print_patches()
@@ -0,0 +1,153 @@
+from .utils import BLUE, GREEN, YELLOW, RED, DARK_BLUE, ENDC
+from .checks import is_git_repo, print_not_git_repo, has_commits, repository_paths
+from .objects import get_object_reader
+from .history_view import LogStream, format_history_entry
+from .render import pager, read_key, terminal_size
+from .runner import run
+
+
+class RenameCache:
+    """
+    Renames found while following a file, in the commit index database:
+    (commit, path) -> the path it had in the commit's first parent, or ''
+    when the commit created it. Both answers are final, so each commit's
+    rename detection runs once per repository.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.db.execute("CREATE TABLE IF NOT EXISTS renames "
+                        "(oid TEXT NOT NULL, path TEXT NOT NULL, old_path TEXT NOT NULL, "
+                        "PRIMARY KEY (oid, path)) WITHOUT ROWID")
+
+    def get(self, oid, path):
+        row = self.db.execute("SELECT old_path FROM renames WHERE oid = ? AND path = ?", (oid, path)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, oid, path, old_path):
+        self.db.execute("INSERT OR REPLACE INTO renames VALUES (?, ?, ?)", (oid, path, old_path))
+        self.db.commit()
+
+
+def detect_rename(oid, parent, path):
+    """Path that path was renamed from between parent and oid, or '' if it was created there."""
+    result = run(["git", "diff-tree", "-r", "-M", "--name-status", "-z", "--diff-filter=R", parent, oid],
+                 capture_output=True)
+    fields = result.stdout.decode("utf-8", "replace").split("\0")
+    for index in range(0, len(fields) - 2, 3):
+        if fields[index].startswith("R") and fields[index + 2] == path:
+            return fields[index + 1]
+    return ""
+
+
+def follow_path(revision, path, cache=None):
+    """
+    Yields (entry, path) for every commit that changed path, newest first,
+    and keeps going under the old name when the oldest one renamed it.
+    Each stretch is a plain path-limited `git log`, which the commit-graph's
+    changed-path Bloom filters speed up; `git log --follow` can use neither
+    those nor a cache, and repeats rename detection on every run. Here it
+    only runs at the commit that created the path, and once per commit with
+    a cache.
+    """
+    reader = get_object_reader()
+    seen = set()
+    while True:
+        stream = LogStream([revision, "--", f":(top,literal){path}"])
+        oldest = None
+        try:
+            for entry in stream:
+                oldest = entry
+                yield entry, path
+        finally:
+            stream.close()
+
+        # Only files are followed, and only past the commit that created them
+        if oldest is None or not oldest.parents or (oldest.oid, path) in seen:
+            return
+        seen.add((oldest.oid, path))
+        created, in_parent = reader.info_many([f"{oldest.oid}:{path}", f"{oldest.parents[0]}:{path}"])
+        if created is None or created[1] != "blob" or in_parent is not None:
+            return
+
+        old_path = cache.get(oldest.oid, path) if cache is not None else None
+        if old_path is None:
+            old_path = detect_rename(oldest.oid, oldest.parents[0], path)
+            if cache is not None:
+                cache.put(oldest.oid, path, old_path)
+        if not old_path:
+            return
+        revision, path = oldest.parents[0], old_path
+
+
+def write_path_history(revision, path, out, cache=None):
+    """Writes the history of path to out, with a line wherever it had another name. Returns the commit count."""
+    width, _ = terminal_size()
+    count = 0
+    current = path
+    for entry, name in follow_path(revision, path, cache):
+        if name != current:
+            out.write(f"{YELLOW}  ↳ renamed from {name} to {current}{ENDC}\n")
+            current = name
+        out.write(format_history_entry(entry, width) + "\n")
+        count += 1
+        if count % 50 == 0:
+            out.flush()
+    out.flush()
+    return count
+
+
+def _prompt(text):
+    print(f"{YELLOW}{text}{ENDC} ", end="", flush=True)
+    try:
+        return input().strip()
+    except EOFError:
+        return ""
+
+def show_path_history(ask_for_enter=True):
+    """Historial de un archivo o directorio, siguiendo los renombrados de archivos"""
+    import os
+    from .commit_index import open_commit_index
+    from .optimize import objects_directory, has_changed_path_filters
+
+    if not is_git_repo():
+        print_not_git_repo()
+        return
+    if not has_commits():
+        print(f"{YELLOW}No commits yet in this repository.{ENDC}")
+        return
+
+    print(f"\n{BLUE}History of Path:{ENDC}\n")
+    path = _prompt("File or directory:")
+    if not path:
+        print(f"{YELLOW}No path given.{ENDC}")
+        return
+    revision = _prompt("Revision (empty for HEAD):") or "HEAD"
+
+    _, prefix = repository_paths()
+    path = os.path.normpath(os.path.join(prefix, path)).replace(os.sep, "/")
+    if path == ".":
+        path = ""
+    if get_object_reader().info(f"{revision}^{{commit}}") is None:
+        print(f"{RED}{revision} is not a commit.{ENDC}")
+        return
+
+    objects_dir = objects_directory()
+    if objects_dir and not has_changed_path_filters(objects_dir):
+        print(f"{DARK_BLUE}Tip: `vg optimize` writes changed-path Bloom filters, which make this view faster.{ENDC}")
+
+    index = open_commit_index()
+    cache = RenameCache(index.db) if index is not None else None
+    print(f"\n{BLUE}History of {GREEN}{path or '/'}{BLUE} at {revision}:{ENDC}\n", flush=True)
+    count = None
+    try:
+        with pager() as out:
+            count = write_path_history(revision, path, out, cache)
+    except KeyboardInterrupt:
+        pass
+    if count == 0:
+        print(f"{YELLOW}No commits changed {path or 'the repository'} at {revision}.{ENDC}")
+
+    if ask_for_enter:
+        print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
+        read_key()
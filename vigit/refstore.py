@@ -0,0 +1,326 @@
+import os
+import re
+
+from .runner import run
+
+# Refs that live in each worktree's own git dir rather than in the common dir
+PER_WORKTREE_PREFIXES = ("refs/bisect/", "refs/worktree/", "refs/rewritten/")
+
+OID_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+
+class RefStore:
+    """
+    Reads HEAD, loose refs, packed-refs and branch/remote configuration
+    straight from the .git directory, so branch metadata never needs a git
+    process. Understands linked worktrees (`.git` files and `commondir`).
+    """
+
+    def __init__(self, git_dir, common_dir, work_tree):
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.work_tree = work_tree
+        self._packed = None
+        self._config = None
+
+    # LOW LEVEL
+    def _ref_dir(self, refname):
+        if refname == "HEAD" or refname.startswith(PER_WORKTREE_PREFIXES) or "/" not in refname:
+            return self.git_dir
+        return self.common_dir
+
+    def _read_loose(self, refname):
+        try:
+            with open(os.path.join(self._ref_dir(refname), refname), "r") as f:
+                return f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def packed_refs(self):
+        if self._packed is None:
+            self._packed = {}
+            try:
+                with open(os.path.join(self.common_dir, "packed-refs"), "r") as f:
+                    for line in f:
+                        # Comments and peeled tag lines ("^<oid>") are skipped
+                        if line.startswith(("#", "^")):
+                            continue
+                        oid, _, refname = line.rstrip("\n").partition(" ")
+                        if refname:
+                            self._packed[refname] = oid
+            except OSError:
+                pass
+        return self._packed
+
+    def read_ref(self, refname, depth=0):
+        """Resolves a full refname (following symbolic refs) to an object id, or None."""
+        if depth > 5:
+            return None
+        value = self._read_loose(refname)
+        if value is None:
+            return self.packed_refs().get(refname)
+        if value.startswith("ref: "):
+            return self.read_ref(value[5:].strip(), depth + 1)
+        return value if OID_RE.match(value) else None
+
+    def loose_refs(self, prefix):
+        refs = {}
+        base = os.path.join(self.common_dir, prefix)
+        for root, dirs, files in os.walk(base):
+            for name in files:
+                path = os.path.join(root, name)
+                refname = os.path.relpath(path, self.common_dir).replace(os.sep, "/")
+                if name.endswith(".lock"):
+                    continue
+                oid = self.read_ref(refname)
+                if oid:
+                    refs[refname] = oid
+        return refs
+
+    def refs(self, prefix):
+        """All refs under prefix ('refs/heads/'), loose refs taking precedence over packed ones."""
+        refs = {name: oid for name, oid in self.packed_refs().items() if name.startswith(prefix)}
+        refs.update(self.loose_refs(prefix))
+        return refs
+
+    # HEAD
+    def head(self):
+        """Returns (symbolic target or None, object id or None)."""
+        value = self._read_loose("HEAD")
+        if value is None:
+            return None, None
+        if value.startswith("ref: "):
+            target = value[5:].strip()
+            return target, self.read_ref(target)
+        return None, value if OID_RE.match(value) else None
+
+    def current_branch(self):
+        """Current branch name, or 'HEAD' when detached."""
+        target, _ = self.head()
+        if target and target.startswith("refs/heads/"):
+            return target[len("refs/heads/"):]
+        return "HEAD"
+
+    def head_oid(self):
+        return self.head()[1]
+
+    # BRANCHES
+    def local_branches(self):
+        return {name[len("refs/heads/"):]: oid for name, oid in self.refs("refs/heads/").items()}
+
+    def remote_branches(self):
+        return {name[len("refs/remotes/"):]: oid for name, oid in self.refs("refs/remotes/").items()}
+
+    def stash_oid(self):
+        return self.read_ref("refs/stash")
+
+    # CONFIG
+    def config(self):
+        if self._config is None:
+            self._config = parse_config(os.path.join(self.common_dir, "config"))
+        return self._config
+
+    def remotes(self):
+        return sorted({key[1] for key in self.config() if key[0] == "remote" and key[1]})
+
+    def branch_upstream(self, branch_name):
+        """Short upstream name ('origin/main') as `%(upstream:short)` would print it."""
+        section = self.config().get(("branch", branch_name), {})
+        remote = section.get("remote")
+        merge = section.get("merge")
+        if not remote or not merge:
+            return None
+        short = merge[len("refs/heads/"):] if merge.startswith("refs/heads/") else merge
+        return short if remote == "." else f"{remote}/{short}"
+
+
+class GitRefStore:
+    """Same questions as RefStore, answered by git. Used for layouts RefStore does not read."""
+
+    def __init__(self, work_tree):
+        self.work_tree = work_tree
+
+    def _git(self, *args):
+        result = run(["git", *args], capture_output=True, text=True)
+        return result.stdout if result.returncode == 0 else None
+
+    def _for_each_ref(self, prefix):
+        output = self._git("for-each-ref", "--format=%(refname) %(objectname)", prefix) or ""
+        return dict(line.split(" ", 1) for line in output.splitlines() if " " in line)
+
+    def read_ref(self, refname):
+        output = self._git("rev-parse", "--verify", "--quiet", refname)
+        return output.strip() if output else None
+
+    def refs(self, prefix):
+        return self._for_each_ref(prefix)
+
+    def head(self):
+        target = self._git("symbolic-ref", "--quiet", "HEAD")
+        return (target.strip() if target else None), self.read_ref("HEAD")
+
+    def current_branch(self):
+        target, _ = self.head()
+        if target and target.startswith("refs/heads/"):
+            return target[len("refs/heads/"):]
+        return "HEAD"
+
+    def head_oid(self):
+        return self.read_ref("HEAD")
+
+    def local_branches(self):
+        return {name[len("refs/heads/"):]: oid for name, oid in self.refs("refs/heads/").items()}
+
+    def remote_branches(self):
+        return {name[len("refs/remotes/"):]: oid for name, oid in self.refs("refs/remotes/").items()}
+
+    def stash_oid(self):
+        return self.read_ref("refs/stash")
+
+    def remotes(self):
+        return (self._git("remote") or "").split()
+
+    def branch_upstream(self, branch_name):
+        output = self._git("for-each-ref", "--format=%(upstream:short)", f"refs/heads/{branch_name}")
+        return output.strip() if output and output.strip() else None
+
+
+def parse_config(path):
+    """
+    Minimal git config reader: returns {(section, subsection): {key: value}}.
+    Section and key names are lower-cased; subsections keep their case.
+    """
+    config = {}
+    section = None
+    try:
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return config
+
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            header = line[1:line.index("]")] if "]" in line else line[1:]
+            match = re.match(r'^\s*([^\s"]+)\s*(?:"((?:[^"\\]|\\.)*)")?\s*$', header)
+            if not match:
+                section = None
+                continue
+            name, sub = match.group(1), match.group(2)
+            if sub is None and "." in name:
+                # Deprecated [section.subsection] syntax
+                name, sub = name.split(".", 1)
+            section = (name.lower(), sub.replace('\\"', '"').replace("\\\\", "\\") if sub is not None else None)
+            config.setdefault(section, {})
+            continue
+        if section is None:
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip()
+        if not value.startswith('"'):
+            value = re.split(r"\s[#;]", value, 1)[0].strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        config[section][key.strip().lower()] = value if sep else "true"
+    return config
+
+
+def _is_supported(git_dir, common_dir, work_tree):
+    """RefStore only handles the files backend in a work tree owned by the current user."""
+    if hasattr(os, "geteuid"):
+        try:
+            # git refuses repositories owned by someone else unless safe.directory allows it
+            if os.stat(work_tree).st_uid != os.geteuid():
+                return False
+        except OSError:
+            return False
+
+    config = parse_config(os.path.join(common_dir, "config"))
+    core = config.get(("core", None), {})
+    extensions = config.get(("extensions", None), {})
+    if extensions.get("refstorage", "files").lower() != "files":
+        return False
+    if "worktree" in core or core.get("bare", "false").lower() == "true":
+        return False
+    if any(section[0] in ("include", "includeif") for section in config):
+        return False
+    if os.path.exists(os.path.join(common_dir, "reftable")):
+        return False
+    return os.path.isfile(os.path.join(git_dir, "HEAD"))
+
+
+def discover(path=None):
+    """
+    Finds the repository containing path (default: the current directory).
+    Returns (git_dir, common_dir, work_tree), or None when path is not inside
+    a work tree.
+    """
+    path = os.path.abspath(path or os.getcwd())
+    current = path
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            git_dir = dot_git
+            break
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git, "r") as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir: "):
+                return None
+            git_dir = os.path.normpath(os.path.join(current, content[len("gitdir: "):]))
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+    # Inside the .git directory itself is not a work tree
+    if path == git_dir or path.startswith(git_dir + os.sep):
+        return None
+
+    common_dir = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r") as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
+
+    return git_dir, common_dir, current
+
+
+def get_ref_store(path=None):
+    """
+    Returns a RefStore for the repository around path, a GitRefStore when the
+    layout needs git to interpret it, or None outside a repository.
+    """
+    if any(os.environ.get(name) for name in ("GIT_DIR", "GIT_WORK_TREE", "GIT_COMMON_DIR")):
+        return _git_ref_store()
+
+    found = discover(path)
+    if found is None:
+        return None
+
+    git_dir, common_dir, work_tree = found
+    if not _is_supported(git_dir, common_dir, work_tree):
+        return _git_ref_store()
+    return RefStore(git_dir, common_dir, work_tree)
+
+
+def _git_ref_store():
+    try:
+        result = run(
+            ["git", "rev-parse", "--is-inside-work-tree", "--show-toplevel"],
+            capture_output=True,
+            text=True
+        )
+    except Exception:
+        return None
+    lines = result.stdout.split()
+    if result.returncode != 0 or not lines or lines[0] != "true":
+        return None
+    return GitRefStore(lines[1] if len(lines) > 1 else None)
@@ -0,0 +1,192 @@
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+from contextlib import contextmanager
+
+from .runner import run
+
+# Cursor home, clear the screen and the scrollback: what `clear` writes,
+# without forking /bin/sh and clear on every menu transition.
+CLEAR = "\033[H\033[2J\033[3J"
+
+BANNER = "\nVISUAL GIT\n" + "-" * 30 + "\n"
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def is_tty(stream=None):
+    stream = stream or sys.stdout
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+@contextmanager
+def screen(clear=True, banner=False):
+    """
+    Renders one screen. On a terminal, everything printed inside the block is
+    collected and written to stdout in a single write (after the clear
+    sequence), so the screen is redrawn at once instead of line by line.
+    When stdout is not a TTY nothing is cleared and output goes straight
+    through.
+
+    Only Python output is collected: a git process writing to the terminal
+    inside the block would show up before it.
+    """
+    stream = sys.stdout
+    if not is_tty(stream):
+        if banner:
+            stream.write(BANNER)
+        yield stream
+        return
+
+    buffer = io.StringIO()
+    if clear:
+        buffer.write(CLEAR)
+    if banner:
+        buffer.write(BANNER)
+    sys.stdout = buffer
+    try:
+        yield buffer
+    finally:
+        sys.stdout = stream
+        stream.write(buffer.getvalue())
+        stream.flush()
+
+
+@contextmanager
+def pager():
+    """
+    Stream for a long view. On a terminal it is the user's git pager (`git var
+    GIT_PAGER`, less by default), started the way git starts it, so the view
+    is only produced as fast as it is read. Otherwise it is stdout. Quitting
+    the pager before the end just stops the view.
+    """
+    if not is_tty():
+        yield sys.stdout
+        return
+    command = run(["git", "var", "GIT_PAGER"], capture_output=True, text=True).stdout.strip() or "less"
+    if command == "cat":
+        yield sys.stdout
+        return
+    env = dict(os.environ)
+    env.setdefault("LESS", "FRX")
+    env.setdefault("LV", "-c")
+    sys.stdout.flush()
+    process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, env=env, text=True, errors="replace")
+    try:
+        yield process.stdin
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
+
+
+def clear_terminal():
+    """Limpia la pantalla"""
+    with screen():
+        pass
+
+def clear_screen():
+    """Limpia la pantalla y muestra el título"""
+    with screen(banner=True):
+        pass
+
+
+_cbreak = False
+
+@contextmanager
+def cbreak():
+    """
+    Keeps the terminal reading key by key, without echo, for a whole view,
+    so keys typed while the view is busy wait for read_key() untouched
+    instead of being echoed or line-edited by the terminal. Output is
+    processed as usual, and Ctrl-C arrives as a key.
+    """
+    global _cbreak
+    if not is_tty(sys.stdin) or _cbreak:
+        yield
+        return
+    import termios
+    import tty
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd, termios.TCSANOW)
+        mode = termios.tcgetattr(fd)
+        mode[3] &= ~termios.ISIG
+        termios.tcsetattr(fd, termios.TCSANOW, mode)
+        _cbreak = True
+        yield
+    finally:
+        _cbreak = False
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+
+def read_key(sequences=False, timeout=None):
+    """
+    Lee una sola tecla sin esperar a Enter; lee una línea si stdin no es un terminal.
+    With sequences, keys that send escape sequences (arrows, Page Up/Down)
+    come back whole, e.g. "\x1b[B", instead of as a lone "\x1b". With a
+    timeout, returns None if no key is pressed within that many seconds.
+    """
+    if not is_tty(sys.stdin):
+        return sys.stdin.readline()[:1]
+    fd = sys.stdin.fileno()
+    if _cbreak:
+        import select
+        if timeout is not None and not select.select([fd], [], [], timeout)[0]:
+            return None
+        return os.read(fd, 32 if sequences else 1).decode("utf-8", "replace")
+    import termios
+    import tty
+    old_settings = termios.tcgetattr(fd)
+    try:
+        # TCSANOW: the default TCSAFLUSH would drop keys typed while the caller was busy
+        tty.setraw(fd, termios.TCSANOW)
+        if timeout is not None:
+            import select
+            if not select.select([fd], [], [], timeout)[0]:
+                return None
+        if sequences:
+            # A terminal writes the whole sequence at once
+            return os.read(fd, 32).decode("utf-8", "replace")
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+def fit(text, width):
+    """Cuts text to width visible columns, keeping its color codes and resetting them if cut."""
+    if len(text) <= width:
+        return text
+    parts = []
+    visible = 0
+    position = 0
+    for match in ANSI_ESCAPE.finditer(text):
+        segment = text[position:match.start()]
+        if visible + len(segment) > width:
+            break
+        parts.append(segment)
+        parts.append(match.group())
+        visible += len(segment)
+        position = match.end()
+    else:
+        segment = text[position:]
+        if visible + len(segment) <= width:
+            return text
+    parts.append(text[position:position + width - visible])
+    parts.append("\033[0m")
+    return "".join(parts)
+
+def terminal_size():
+    """(columns, lines) of the terminal, with a sane default when there is none."""
+    size = shutil.get_terminal_size((100, 30))
+    return size.columns, size.lines
@@ -0,0 +1,210 @@
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Every git invocation goes through this module so that each one can be
+# traced: argv, wall time, exit code and bytes of captured output.
+# Tracing is enabled with `vg --trace` / `vg --trace-file PATH` or the
+# VG_TRACE=1 / VG_TRACE_FILE=PATH environment variables.
+
+_spans = []
+_lock = threading.Lock()
+_trace = {"enabled": False, "file": None, "registered": False}
+
+# git commands that can move refs, the index or the work tree: once one of
+# them has run, the cached RepoSnapshot is dropped rather than trusted to
+# notice the change from stat() data (same-second writes, packed refs...)
+CHANGING_COMMANDS = {
+    "add", "branch", "checkout", "cherry-pick", "clone", "commit", "fetch", "init", "merge", "mv", "pull",
+    "push", "rebase", "remote", "reset", "restore", "revert", "rm", "stash", "switch", "tag",
+}
+
+
+def git_subcommand(argv):
+    """(subcommand, arguments) of a git argv, skipping global options; (None, []) for anything else."""
+    words = argv.split() if isinstance(argv, str) else list(argv)
+    if not words or words[0] != "git":
+        return None, []
+    rest = words[1:]
+    # Skip global options: --no-pager, -c key=value, -C path
+    while rest and rest[0].startswith("-"):
+        rest = rest[2:] if rest[0] in ("-c", "-C") else rest[1:]
+    return (rest[0], rest[1:]) if rest else (None, [])
+
+
+class Span:
+    def __init__(self, argv, start, duration, returncode, output_bytes, kind="process"):
+        self.argv = argv
+        self.start = start
+        self.duration = duration
+        self.returncode = returncode
+        self.output_bytes = output_bytes
+        self.kind = kind
+
+    @property
+    def label(self):
+        """Short name used to group spans: 'git status', 'git cat-file --batch', ..."""
+        subcommand, arguments = git_subcommand(self.argv)
+        if subcommand is not None:
+            label = ["git", subcommand]
+            if subcommand == "cat-file" and arguments:
+                label.append(arguments[0])
+            return " ".join(label)
+        words = self.argv.split() if isinstance(self.argv, str) else list(self.argv)
+        return " ".join(words[:2])
+
+    def to_dict(self):
+        return {
+            "argv": self.argv,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "returncode": self.returncode,
+            "output_bytes": self.output_bytes,
+        }
+
+
+def enable_tracing(path=None):
+    """Turns tracing on for the rest of the process; the report is emitted at exit."""
+    _trace["enabled"] = True
+    if path:
+        _trace["file"] = path
+    if not _trace["registered"]:
+        _trace["registered"] = True
+        atexit.register(report)
+
+def tracing_enabled():
+    return _trace["enabled"]
+
+def record(argv, start, duration, returncode=None, output_bytes=None, kind="process"):
+    if not _trace["enabled"]:
+        return
+    with _lock:
+        _spans.append(Span(argv, start, duration, returncode, output_bytes, kind))
+
+def spans():
+    with _lock:
+        return list(_spans)
+
+
+def _output_size(value):
+    if value is None:
+        return 0
+    return len(value.encode("utf-8", "replace")) if isinstance(value, str) else len(value)
+
+def _invalidate_snapshot(cmd):
+    if git_subcommand(cmd)[0] in CHANGING_COMMANDS:
+        # Only a snapshot module that was imported can hold a snapshot
+        snapshot = sys.modules.get(f"{__package__}.snapshot")
+        if snapshot is not None:
+            snapshot.invalidate_snapshot()
+
+def run(cmd, **kwargs):
+    """subprocess.run() with tracing; changing git commands drop the cached repository snapshot."""
+    start = time.time()
+    started = time.perf_counter()
+    result = None
+    try:
+        result = subprocess.run(cmd, **kwargs)
+        return result
+    except subprocess.CalledProcessError as e:
+        result = e
+        raise
+    finally:
+        _invalidate_snapshot(cmd)
+        if _trace["enabled"]:
+            captured = result is not None and (result.stdout is not None or result.stderr is not None)
+            record(
+                cmd,
+                start,
+                time.perf_counter() - started,
+                result.returncode if result is not None else None,
+                _output_size(result.stdout) + _output_size(result.stderr) if captured else None
+            )
+
+def getoutput(cmd):
+    """subprocess.getoutput() with tracing."""
+    start = time.time()
+    started = time.perf_counter()
+    output = subprocess.getoutput(cmd)
+    record(cmd, start, time.perf_counter() - started, None, _output_size(output))
+    return output
+
+
+class TracedPopen(subprocess.Popen):
+    """Popen that records its span once the process has been waited for."""
+
+    def __init__(self, cmd, **kwargs):
+        self._trace_start = time.time()
+        self._trace_started = time.perf_counter()
+        self._trace_recorded = False
+        super().__init__(cmd, **kwargs)
+
+    def wait(self, timeout=None):
+        returncode = super().wait(timeout=timeout)
+        self._record_span()
+        return returncode
+
+    def poll(self):
+        returncode = super().poll()
+        if returncode is not None:
+            self._record_span()
+        return returncode
+
+    def _record_span(self):
+        if not self._trace_recorded:
+            self._trace_recorded = True
+            record(self.args, self._trace_start, time.perf_counter() - self._trace_started, self.returncode)
+
+def popen(cmd, **kwargs):
+    """subprocess.Popen() with tracing."""
+    return TracedPopen(cmd, **kwargs)
+
+
+def report():
+    """Writes the collected spans as JSONL, or prints a summary to stderr."""
+    collected = spans()
+    if _trace["file"]:
+        try:
+            with open(_trace["file"], "a") as f:
+                for span in collected:
+                    f.write(json.dumps(span.to_dict()) + "\n")
+        except OSError as e:
+            print(f"Could not write trace to {_trace['file']}: {e}", file=sys.stderr)
+        return
+    print_summary(collected, sys.stderr)
+
+def print_summary(collected, stream):
+    processes = [span for span in collected if span.kind == "process"]
+    total = sum(span.duration for span in collected)
+
+    groups = {}
+    for span in collected:
+        group = groups.setdefault((span.label, span.kind), [0, 0.0, 0.0, 0])
+        group[0] += 1
+        group[1] += span.duration
+        group[2] = max(group[2], span.duration)
+        group[3] += span.output_bytes or 0
+
+    print(f"\nvg trace: {len(processes)} processes, {len(collected) - len(processes)} pipe requests, "
+          f"{total * 1000:.1f} ms total", file=stream)
+    print(f"{'command':<32} {'kind':<8} {'count':>6} {'total ms':>10} {'max ms':>9} {'bytes':>10}", file=stream)
+    for (label, kind), (count, duration, longest, size) in sorted(groups.items(), key=lambda item: -item[1][1]):
+        print(f"{label[:32]:<32} {kind:<8} {count:>6} {duration * 1000:>10.1f} {longest * 1000:>9.1f} {size:>10}", file=stream)
+
+    slowest = sorted(processes, key=lambda span: -span.duration)[:5]
+    if slowest:
+        print("slowest:", file=stream)
+        for span in slowest:
+            argv = span.argv if isinstance(span.argv, str) else " ".join(span.argv)
+            print(f"  {span.duration * 1000:>8.1f} ms  exit={span.returncode}  {argv[:100]}", file=stream)
+
+
+if os.environ.get("VG_TRACE_FILE"):
+    enable_tracing(os.environ["VG_TRACE_FILE"])
+elif os.environ.get("VG_TRACE", "").lower() in ("1", "true", "yes"):
+    enable_tracing()
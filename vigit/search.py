@@ -0,0 +1,159 @@
+import os
+import queue
+import subprocess
+import threading
+
+from .utils import BLUE, GREEN, YELLOW, RED, ENDC
+from .checks import is_git_repo, print_not_git_repo, has_commits
+from .history_view import HistoryEntry, LOG_FORMAT, format_history_entry
+from .render import read_key, terminal_size
+from .runner import run, popen
+
+# What each search kind matches and the `git log` option that does it
+SEARCH_KINDS = {
+    "m": ("commit messages", lambda pattern: ["--regexp-ignore-case", f"--grep={pattern}"]),
+    "a": ("authors", lambda pattern: ["--regexp-ignore-case", f"--author={pattern}"]),
+    "c": ("content added or removed", lambda pattern: [f"-S{pattern}"]),
+}
+
+# Commits per chunk: small enough that the first results show up quickly,
+# large enough that starting a git process is not most of the work
+MIN_CHUNK = 500
+CHUNKS_PER_WORKER = 4
+
+
+def list_commits(revisions):
+    """Commit ids in `git log` order for revisions (a range, branch names, --all, ...)."""
+    result = run(["git", "rev-list", *revisions], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.split()
+
+def split_chunks(oids, workers):
+    size = max(MIN_CHUNK, -(-len(oids) // (workers * CHUNKS_PER_WORKER)))
+    return [oids[start:start + size] for start in range(0, len(oids), size)]
+
+
+def search_chunk(oids, options, results, stop):
+    """
+    Runs the search over exactly the commits in oids (`--no-walk --stdin`,
+    keeping their order) and puts every match in results, then None.
+    """
+    try:
+        if stop.is_set():
+            return
+        process = popen(
+            ["git", "log", "-z", f"--format={LOG_FORMAT}", "--no-walk=unsorted", "--stdin", *options],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        writer = threading.Thread(target=_feed, args=(process, oids))
+        writer.start()
+        buffer = b""
+        while True:
+            chunk = process.stdout.read1(65536)
+            if stop.is_set():
+                process.kill()
+                break
+            buffer += chunk
+            records = buffer.split(b"\0")
+            buffer = records.pop() if chunk else b""
+            for record in records:
+                record = record.lstrip(b"\n")
+                if record:
+                    results.put(HistoryEntry.parse(record.decode("utf-8", "replace")))
+            if not chunk:
+                break
+        writer.join()
+        process.stdout.close()
+        process.wait()
+    finally:
+        results.put(None)
+
+def _feed(process, oids):
+    try:
+        process.stdin.write("".join(f"{oid}\n" for oid in oids).encode())
+        process.stdin.close()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def search_history(options, revisions=("HEAD",), workers=None):
+    """
+    Yields the commits of revisions that match the `git log` filter options,
+    in history order. The commits are split into chunks searched by up to
+    `workers` git processes at once; chunk i is yielded as soon as its git
+    process finds matches, while later chunks are searched ahead.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    oids = list_commits(revisions)
+    if not oids:
+        return
+    workers = workers or os.cpu_count() or 1
+    chunks = split_chunks(oids, workers)
+    queues = [queue.Queue() for _ in chunks]
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(chunks)))
+    try:
+        for oids_chunk, results in zip(chunks, queues):
+            executor.submit(search_chunk, oids_chunk, options, results, stop)
+        for results in queues:
+            while True:
+                entry = results.get()
+                if entry is None:
+                    break
+                yield entry
+    finally:
+        # Also reached when the caller stops early (Ctrl+C, closed generator)
+        stop.set()
+        executor.shutdown(wait=True)
+
+
+def _prompt(text):
+    print(f"{YELLOW}{text}{ENDC} ", end="", flush=True)
+    try:
+        return input().strip()
+    except EOFError:
+        return ""
+
+def find_commits(ask_for_enter=True):
+    """Busca commits por mensaje, autor o contenido (pickaxe)"""
+    if not is_git_repo():
+        print_not_git_repo()
+        return
+    if not has_commits():
+        print(f"{YELLOW}No commits yet in this repository.{ENDC}")
+        return
+
+    print(f"\n{BLUE}Find in History:{ENDC}\n")
+    kind = _prompt("Search in [m]essages, [a]uthors or [c]ontent? (default m):").lower()[:1] or "m"
+    if kind not in SEARCH_KINDS:
+        print(f"{RED}Invalid option.{ENDC}")
+        return
+    description, make_options = SEARCH_KINDS[kind]
+    pattern = _prompt(f"Text to find in {description}:")
+    if not pattern:
+        print(f"{YELLOW}Nothing to search for.{ENDC}")
+        return
+    revisions = _prompt("Revisions to search (empty for the current branch, --all for every branch):").split() or ["HEAD"]
+
+    print(f"\n{BLUE}Commits matching {GREEN}{pattern}{BLUE} in {description}:{ENDC}\n", flush=True)
+    width, _ = terminal_size()
+    found = 0
+    try:
+        for entry in search_history(make_options(pattern), revisions):
+            found += 1
+            print(format_history_entry(entry, width), flush=True)
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}Search interrupted.{ENDC}")
+
+    if found:
+        print(f"\n{GREEN}{found} commit{'s' if found != 1 else ''} found.{ENDC}")
+    else:
+        print(f"{YELLOW}No commits found.{ENDC}")
+
+    if ask_for_enter:
+        print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
+        read_key()
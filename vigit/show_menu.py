@@ -4,10 +4,17 @@ import termios
 import tty
 import re
 
-from simple_term_menu import TerminalMenu
-from .utils import DARK_BLUE, GREEN, ENDC, BLUE, ORANGE, RED, WHITE, YELLOW
+from .utils import DARK_BLUE, GREEN, ENDC, BLUE, ORANGE, RED, YELLOW
 from .constants import show_menu, MENU_CURSOR, MENU_CURSOR_STYLE, history_menu, differences_menu
-from .checks import is_git_repo, print_not_git_repo
+from .checks import is_git_repo, print_not_git_repo, get_current_branch, has_commits as repo_has_commits
+from .header import print_status_header
+from .history_view import show_commit_history
+from .patch_pager import show_patch_history
+from .graph_view import show_graph_history
+from .diff_render import (show_diff, show_tree_diff, diff_files, parallel_diff_files, browse_diff_files,
+                          confirm_large_blobs)
+from .runner import run, popen
+from .render import clear_terminal, pager
 
 def get_single_keypress():
     """Captura un solo carácter del usuario sin necesidad de presionar Enter."""
@@ -19,80 +26,62 @@ def get_single_keypress():
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
-def clear_screen():
-    """Clear the terminal screen"""
-    import os
-    os.system('cls' if os.name == 'nt' else 'clear')
+# Seconds each general_view() query may take before its section gives up
+GENERAL_VIEW_TIMEOUT = 10
+
+def _git_output(cmd):
+    return run(cmd, capture_output=True, text=True, timeout=GENERAL_VIEW_TIMEOUT).stdout.strip()
 
 def general_view():
+    from concurrent.futures import ThreadPoolExecutor
+    from subprocess import TimeoutExpired
+
     if not is_git_repo():
         print_not_git_repo()
         return
 
-    try:
-        # Get the absolute path of the repository
-        repo_path = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Get the repository name (last element of the path)
-        repo_name = repo_path.split('/')[-1]
-
-
-        # Get all local branches
-        branches = subprocess.run(
-            ["git", "branch", "--color=always"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Get configured remotes
-        remotes = subprocess.run(
-            ["git", "remote", "-v"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Get all remote branches
-        remote_branches = subprocess.run(
-            ["git", "branch", "-r", "--color=always"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Get a status summary
-        status = subprocess.run(
-            ["git", "status", "--short"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
-
-        # Display the collected information
-        print(f"{BLUE}Local Repository:{ENDC}")
-        print(f"{YELLOW}Name:{ENDC} {repo_name}")
-        print(f"{YELLOW}Path:{ENDC} {repo_path}")
+    # Todas las consultas se lanzan a la vez; status va primero porque es la más lenta
+    queries = {
+        "status": ["git", "-c", "color.status=always", "status", "--short"],
+        "repo_path": ["git", "rev-parse", "--show-toplevel"],
+        "branches": ["git", "branch", "--color=always"],
+        "remotes": ["git", "remote", "-v"],
+        "remote_branches": ["git", "branch", "-r", "--color=always"],
+    }
 
-        print(f"\n{BLUE}Local Branches:{ENDC}")
-        if branches:
-            print(branches)
-        else:
-            print("No local branches")
+    try:
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = {name: executor.submit(_git_output, cmd) for name, cmd in queries.items()}
+
+            def section(title, name, empty):
+                """Prints a section as soon as its query finishes."""
+                print(f"{BLUE}{title}:{ENDC}")
+                try:
+                    output = futures[name].result()
+                    print(output if output else empty)
+                except TimeoutExpired:
+                    print(f"{YELLOW}Timed out after {GENERAL_VIEW_TIMEOUT} s{ENDC}")
+                except Exception as e:
+                    print(f"{YELLOW}Error: {e}{ENDC}")
+                print(flush=True)
+
+            # Get the absolute path of the repository
+            try:
+                repo_path = futures["repo_path"].result()
+            except Exception:
+                repo_path = ""
 
-        print(f"\n{BLUE}Remote Repository:{ENDC}")
-        if remotes:
-            print(remotes)
-        else:
-            print("No remote repositories joined to local repository")
+            # Get the repository name (last element of the path)
+            repo_name = repo_path.split('/')[-1]
 
-        print(f"\n{BLUE}Remote Branches:{ENDC}")
-        if remote_branches:
-            print(remote_branches)
-        else:
-            print("No remote branches available")
+            print(f"{BLUE}Local Repository:{ENDC}")
+            print(f"{YELLOW}Name:{ENDC} {repo_name}")
+            print(f"{YELLOW}Path:{ENDC} {repo_path}\n", flush=True)
 
-        print()
+            section("Local Branches", "branches", "No local branches")
+            section("Remote Repository", "remotes", "No remote repositories joined to local repository")
+            section("Remote Branches", "remote_branches", "No remote branches available")
+            section("Status", "status", "Working tree clean")
 
     except Exception as e:
         print(f"Error getting repository information: {e}")
@@ -104,7 +93,7 @@ def show_status_long():
 
     try:
         # Capturar la salida del comando git status
-        result = subprocess.run(
+        result = run(
             ["git", "status"],
             capture_output=True,
             text=True,
@@ -114,7 +103,7 @@ def show_status_long():
 
         if status:
             # Usar el comando directamente para preservar colores
-            subprocess.run(["git", "status"], check=True)
+            run(["git", "status"], check=True)
         else:
             print("Working tree clean")
         print()
@@ -133,11 +122,7 @@ def show_tracking_history(ask_for_enter=True):
         print(f"\n{BLUE}Tracking History of modified files:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository.{ENDC}")
@@ -146,15 +131,23 @@ def show_tracking_history(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Mostrar el historial de commits con estadísticas de archivos modificados
-        subprocess.run([
-            "git", "log",
-            "--graph",
-            "--stat",
-            "--pretty=format:%C(yellow)%h%Creset%C(auto)%d%Creset %C(blue)|%Creset %C(cyan)%an%Creset %C(blue)| %Creset%C(magenta)%ar%Creset%n%n%C(blue)► %C(white)%s%Creset%n",
-            "--decorate=short",
-            "--date=relative"
-        ], check=True)
+        # Estadísticas desde la caché por commit; git solo dibuja el grafo
+        from .commit_index import open_commit_index
+        index = open_commit_index()
+        if index is not None:
+            from .numstat import write_tracking_history
+            with pager() as out:
+                write_tracking_history(index, out)
+        else:
+            # Mostrar el historial de commits con estadísticas de archivos modificados
+            run([
+                "git", "log",
+                "--graph",
+                "--stat",
+                "--pretty=format:%C(yellow)%h%Creset%C(auto)%d%Creset %C(blue)|%Creset %C(cyan)%an%Creset %C(blue)| %Creset%C(magenta)%ar%Creset%n%n%C(blue)► %C(white)%s%Creset%n",
+                "--decorate=short",
+                "--date=relative"
+            ], check=True)
         print()
     except Exception as e:
         print(f"{YELLOW}No tracking history available.{ENDC}")
@@ -163,6 +156,7 @@ def show_tracking_history(ask_for_enter=True):
             get_single_keypress()
 
 def show_history():
+    from simple_term_menu import TerminalMenu
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -175,6 +169,7 @@ def show_history():
             f"[x] {history_menu.EXPANDED_HISTORY.value}",
             f"[t] {history_menu.TRACKING_HISTORY.value}",
             f"[d] {history_menu.DIFFERENCES_HISTORY.value}",
+            f"[p] {history_menu.PATH_HISTORY.value}",
             "[␣] Back to previous menu",
             "[q] Quit program"
         ]
@@ -184,7 +179,7 @@ def show_history():
             title=f"Please select an option:",
             menu_cursor=MENU_CURSOR,
             menu_cursor_style=MENU_CURSOR_STYLE,
-            accept_keys=("enter", "h", "x", "t", "d", " ", "q")
+            accept_keys=("enter", "h", "x", "t", "d", "p", " ", "q")
         )
 
         menu_entry_index = terminal_menu.show()
@@ -192,7 +187,7 @@ def show_history():
 
         # Si se presionó la barra espaciadora, volvemos al menú anterior
         if chosen_key == " ":
-            clear_screen()
+            clear_terminal()
             return
 
         # Procesamos la selección normal del menú
@@ -200,24 +195,29 @@ def show_history():
             show_detailed_history()
             print(f"{GREEN}Press any key to return to the menu...{ENDC}")
             get_single_keypress()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 1 or chosen_key == "x":
             show_expanded_history()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 2 or chosen_key == "t":
             show_tracking_history()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 3 or chosen_key == "d":
             show_differences_history()
-            clear_screen()
+            clear_terminal()
             continue
-        elif menu_entry_index == 4:
-            clear_screen()
+        elif menu_entry_index == 4 or chosen_key == "p":
+            from .path_history import show_path_history
+            show_path_history()
+            clear_terminal()
+            continue
+        elif menu_entry_index == 5:
+            clear_terminal()
             return
-        elif menu_entry_index == 5 or chosen_key == "q":
+        elif menu_entry_index == 6 or chosen_key == "q":
             quit()
         else:
             print("Invalid option. Please try again.")
@@ -232,11 +232,7 @@ def show_expanded_history(ask_for_enter=True):
         print(f"\n{BLUE}Expanded Commit History:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository.{ENDC}")
@@ -245,15 +241,8 @@ def show_expanded_history(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Mostrar el historial de commits con formato gráfico expandido
-        subprocess.run([
-            "git", "log",
-            "--graph",
-            "--all",
-            "--pretty=format:%C(yellow)%h%Creset%C(auto)%d%Creset %C(cyan)%an%Creset %C(magenta)%ar%Creset%n  %C(white)%s%Creset",
-            "--decorate=short",
-            "--date=relative"
-        ], check=True)
+        # Grafo de todas las ramas, calculado solo hasta donde se ve en pantalla
+        show_graph_history()
         print()
     except Exception as e:
         print(f"{YELLOW}No expanded commit history available.{ENDC}")
@@ -271,11 +260,7 @@ def show_detailed_history(ask_for_enter=True):
         print(f"\n{BLUE}Detailed Commit History:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository.{ENDC}")
@@ -284,16 +269,8 @@ def show_detailed_history(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Mostrar el historial de commits con el formato específico
-        subprocess.run([
-            "git", "--no-pager", "log",
-            "--reverse",
-            "--pretty=format:%C(yellow)● %h%Creset%C(auto)%d%Creset%C(blue) ► %C(white)%s%Creset %C(blue)| %C(cyan)%an%Creset %C(blue)| %C(magenta)%ad%Creset",
-            "--decorate=short",
-            "--date=format:%Y-%m-%d %H:%M",
-            "--date=relative"
-        ], check=True)
-        print("\n")
+        # Historial paginado: se lee de git página a página, sin recorrer todo el historial
+        show_commit_history(oldest_first=True)
     except Exception as e:
         print(f"{YELLOW}No commit history available.{ENDC}")
         if ask_for_enter:
@@ -310,11 +287,7 @@ def show_differences_history(ask_for_enter=True):
         print(f"\n{BLUE}Differences History of Commits:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository.{ENDC}")
@@ -323,13 +296,9 @@ def show_differences_history(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Comando completo usando subprocess.run con shell=True para mantener el pipeline
-        subprocess.run(
-            "git log --color=always --stat -p --pretty=format:\"%C(white)$(printf '%.0s-' {1..30})%Creset%n%C(yellow)● %h%Creset%C(auto)%d%Creset%n%C(blue)► %C(white)%s%Creset %C(blue)| %C(cyan)%an%Creset %C(blue)| %C(magenta)%ad%Creset\" --date=format:'%Y-%m-%d %H:%M%n' | diff-so-fancy | less -R",
-            shell=True,
-            check=True
-        )
-        print("\n")
+        # Cada parche se genera solo cuando aparece en pantalla
+        show_patch_history()
+        print()
     except Exception as e:
         print(f"{YELLOW}No differences history available.{ENDC}")
         if ask_for_enter:
@@ -345,29 +314,18 @@ def show_differences_non_staged(ask_for_enter=True):
     try:
         print(f"\n{BLUE}Differences of non staged files:{ENDC}\n")
 
-        # Verificar si hay diferencias no staged
-        has_differences = subprocess.run(
-            ["git", "diff", "--quiet"],
-            capture_output=True
-        ).returncode != 0
+        # Una sola pasada: git diff --numstat dice qué archivos cambiaron, sin generar parches
+        files = diff_files([])
 
-        if not has_differences:
+        if not files:
             print(f"{YELLOW}No differences found. Working tree clean.{ENDC}")
             if ask_for_enter:
                 print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
                 get_single_keypress()
             return
 
-        # Ejecutar el comando git diff con diff-so-fancy
-        subprocess.run(
-            "git diff | diff-so-fancy",
-            shell=True,
-            check=True
-        )
-        print()
-        if ask_for_enter:
-            print(f"{GREEN}Press any key to return to the menu...{ENDC}")
-            get_single_keypress()
+        # Resumen por archivo; cada parche se genera al abrirlo
+        browse_diff_files([], files, ask_for_enter)
     except Exception as e:
         print(f"Error retrieving differences: {e}")
         if ask_for_enter:
@@ -383,29 +341,18 @@ def show_differences_staged(ask_for_enter=True):
     try:
         print(f"\n{BLUE}Differences of Added files:{ENDC}\n")
 
-        # Verificar si hay diferencias staged
-        has_differences = subprocess.run(
-            ["git", "diff", "--staged", "--quiet"],
-            capture_output=True
-        ).returncode != 0
+        # Una sola pasada: git diff --staged --numstat dice qué archivos cambiaron, sin generar parches
+        files = diff_files(["--staged"])
 
-        if not has_differences:
+        if not files:
             print(f"{YELLOW}No staged differences found. No files have been added.{ENDC}")
             if ask_for_enter:
                 print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
                 get_single_keypress()
             return
 
-        # Ejecutar el comando git diff --staged con diff-so-fancy
-        subprocess.run(
-            "git diff --staged | diff-so-fancy",
-            shell=True,
-            check=True
-        )
-        print()
-        if ask_for_enter:
-            print(f"{GREEN}Press any key to return to the menu...{ENDC}")
-            get_single_keypress()
+        # Resumen por archivo; cada parche se genera al abrirlo
+        browse_diff_files(["--staged"], files, ask_for_enter)
     except Exception as e:
         print(f"Error retrieving staged differences: {e}")
         if ask_for_enter:
@@ -422,11 +369,7 @@ def show_differences_committed(ask_for_enter=True):
         print(f"\n{BLUE}Differences with HEAD:{ENDC}\n")
 
         # Verificar si hay commits
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository. Cannot compare with HEAD.{ENDC}")
@@ -436,7 +379,7 @@ def show_differences_committed(ask_for_enter=True):
             return
 
         # Verificar si hay diferencias con HEAD
-        has_differences = subprocess.run(
+        has_differences = run(
             ["git", "diff", "HEAD", "--quiet"],
             capture_output=True
         ).returncode != 0
@@ -448,12 +391,8 @@ def show_differences_committed(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Ejecutar el comando git diff HEAD con diff-so-fancy
-        subprocess.run(
-            "git diff HEAD | diff-so-fancy",
-            shell=True,
-            check=True
-        )
+        # Mostrar git diff HEAD resaltado a medida que git lo produce
+        show_diff(["HEAD"], load_large=confirm_large_blobs(["HEAD"]))
         print()
         if ask_for_enter:
             print(f"{GREEN}Press any key to return to the menu...{ENDC}")
@@ -474,11 +413,7 @@ def show_differences_between_commits(ask_for_enter=True):
         print(f"\n{BLUE}Select commits to compare differences:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository. Cannot compare differences between commits.{ENDC}")
@@ -487,34 +422,25 @@ def show_differences_between_commits(ask_for_enter=True):
                 get_single_keypress()
             return
 
-        # Mostrar los commits recientes para referencia
-        print(f"{YELLOW}Recent commits:{ENDC}")
-        subprocess.run(
-            ["git", "--no-pager", "log", "--oneline", "--max-count=10"],
-            check=True
-        )
-        print()
-
-        # Solicitar el commit base (más antiguo)
-        print(f"{YELLOW}Enter base commit hash (older):{ENDC} ", end="")
-        base_commit = input().strip()
-
-        # Solicitar el commit de comparación (más reciente)
-        print(f"{YELLOW}Enter comparison commit hash (newer or HEAD):{ENDC} ", end="")
-        compare_commit = input().strip()
+        # Elegir los commits en una lista filtrable que se lee de git a medida que se recorre
+        from .commit_picker import pick_commit, resolve_revisions
+        base_commit = pick_commit("Select the base commit (older):")
+        compare_commit = pick_commit("Select the comparison commit (newer or HEAD):") if base_commit else None
 
         if not base_commit or not compare_commit:
             print("Error: You need to provide both commit hashes.")
             return
 
-        print(f"\n{BLUE}Differences between commits {base_commit} and {compare_commit}:{ENDC}\n")
+        # Ambas revisiones se resuelven en una sola consulta a git cat-file --batch-check
+        base_oid, compare_oid = resolve_revisions([base_commit, compare_commit])
+        if base_oid is None or compare_oid is None:
+            print(f"{RED}Unknown commit: {base_commit if base_oid is None else compare_commit}{ENDC}")
+            return
+
+        print(f"\n{BLUE}Differences between commits {base_oid[:7]} and {compare_oid[:7]}:{ENDC}\n")
 
         # Ejecutar el comando para mostrar las diferencias entre los dos commits
-        subprocess.run(
-            f"git diff {base_commit}..{compare_commit} | diff-so-fancy",
-            shell=True,
-            check=True
-        )
+        show_tree_diff(base_oid, compare_oid, ["--"], load_large=confirm_large_blobs([base_oid, compare_oid, "--"]))
 
         print()
         if ask_for_enter:
@@ -536,11 +462,7 @@ def show_differences_between_branches(ask_for_enter=True):
         print(f"\n{BLUE}Select branches to compare differences:{ENDC}\n")
 
         # Verificar si hay commits antes de intentar mostrar el historial
-        has_commits = subprocess.run(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            capture_output=True,
-            text=True
-        ).returncode == 0
+        has_commits = repo_has_commits()
 
         if not has_commits:
             print(f"{YELLOW}No commits yet in this repository. Cannot compare differences between branches.{ENDC}")
@@ -551,14 +473,14 @@ def show_differences_between_branches(ask_for_enter=True):
 
         # Mostrar todas las ramas (locales y remotas) para referencia
         print(f"{YELLOW}Local branches:{ENDC}")
-        subprocess.run(
+        run(
             ["git", "--no-pager", "branch"],
             check=True
         )
         print()
 
         print(f"{YELLOW}Remote branches:{ENDC}")
-        subprocess.run(
+        run(
             ["git", "--no-pager", "branch", "-r"],
             check=True
         )
@@ -576,19 +498,31 @@ def show_differences_between_branches(ask_for_enter=True):
             print("Error: You need to provide both branch names.")
             return
 
-        print(f"\n{BLUE}Differences between branches {first_branch} and {second_branch}:{ENDC}\n")
+        # Ambas ramas se resuelven en una sola consulta a git cat-file --batch-check
+        from .commit_picker import resolve_revisions
+        first_oid, second_oid = resolve_revisions([first_branch, second_branch])
+        if first_oid is None or second_oid is None:
+            print(f"{RED}Unknown branch: {first_branch if first_oid is None else second_branch}{ENDC}")
+            return
 
-        # Ejecutar el comando para mostrar las diferencias entre las dos ramas
-        subprocess.run(
-            f"git diff {first_branch}..{second_branch} | diff-so-fancy",
-            shell=True,
-            check=True
-        )
+        # Lo que cambió en la segunda rama desde que se separó de la primera
+        merge_base = run(["git", "merge-base", first_oid, second_oid], capture_output=True, text=True).stdout.strip()
+        if merge_base:
+            print(f"\n{BLUE}Changes on {second_branch} since it forked from {first_branch} "
+                  f"(merge-base {merge_base[:7]}):{ENDC}\n", flush=True)
+        else:
+            merge_base = first_oid
+            print(f"\n{BLUE}Differences between branches {first_branch} and {second_branch} "
+                  f"{YELLOW}(no common history){BLUE}:{ENDC}\n", flush=True)
 
-        print()
-        if ask_for_enter:
-            print(f"{GREEN}Press any key to return to the menu...{ENDC}")
-            get_single_keypress()
+        files = parallel_diff_files(merge_base, second_oid)
+        if not files:
+            print(f"{YELLOW}No differences.{ENDC}")
+            if ask_for_enter:
+                print(f"\n{GREEN}Press any key to return to the menu...{ENDC}")
+                get_single_keypress()
+            return
+        browse_diff_files([merge_base, second_oid], files, ask_for_enter, commits=True)
     except Exception as e:
         print(f"{YELLOW}Error comparing branches: {e}{ENDC}")
         if ask_for_enter:
@@ -605,7 +539,7 @@ def show_local_repo(ask_for_enter=True):
         print(f"\n{BLUE}Local Repository Information:{ENDC}\n")
 
         # Obtener la ruta absoluta del repositorio
-        repo_path = subprocess.run(
+        repo_path = run(
             ["git", "rev-parse", "--show-toplevel"],
             capture_output=True,
             text=True
@@ -615,14 +549,10 @@ def show_local_repo(ask_for_enter=True):
         repo_name = repo_path.split('/')[-1]
 
         # Obtener la rama actual
-        current_branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
+        current_branch = get_current_branch()
 
         # Obtener todas las ramas locales
-        all_branches = subprocess.run(
+        all_branches = run(
             ["git", "branch", "--color=always"],
             capture_output=True,
             text=True
@@ -660,14 +590,14 @@ def show_remote_repo(ask_for_enter=True):
         print(f"\n{BLUE}Remote Repository Information:{ENDC}")
 
         # Obtener información detallada del remoto
-        remote_info = subprocess.run(
+        remote_info = run(
             ["git", "remote", "-v"],
             capture_output=True,
             text=True
         ).stdout.strip()
 
         # Obtener todas las ramas remotas
-        remote_branches = subprocess.run(
+        remote_branches = run(
             ["git", "branch", "-r", "--color=always"],
             capture_output=True,
             text=True
@@ -707,18 +637,14 @@ def show_branches(ask_for_enter=True):
         print(f"{BLUE}All Branches Information:{ENDC}")
 
         # Obtener rama actual
-        current_branch = subprocess.run(
-            ["git", "branch", "--show-current"],
-            capture_output=True,
-            text=True
-        ).stdout.strip()
+        current_branch = get_current_branch()
 
         # Mostrar la rama actual
         print(f"\n{YELLOW}Current Branch:{ENDC} {current_branch}")
 
         # Mostrar todas las ramas locales
         print(f"\n{YELLOW}Local Branches:{ENDC}")
-        result = subprocess.Popen(
+        result = popen(
             ["git", "--no-pager", "branch", "--color=always", "-v"],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -740,7 +666,7 @@ def show_branches(ask_for_enter=True):
 
         # Mostrar todas las ramas remotas
         print(f"\n{YELLOW}Remote Branches:{ENDC}")
-        result = subprocess.Popen(
+        result = popen(
             ["git", "--no-pager", "branch", "-r", "--color=always", "-v"],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -762,14 +688,14 @@ def show_branches(ask_for_enter=True):
 
         # Mostrar ramas fusionadas
         print(f"\n{YELLOW}Merged Branches:{ENDC}")
-        subprocess.run(
+        run(
             ["git", "--no-pager", "branch", "--color=always", "--merged"],
             check=True
         )
 
         # Mostrar ramas no fusionadas
         print(f"\n{YELLOW}Non Merged Branches:{ENDC}")
-        subprocess.run(
+        run(
             ["git", "--no-pager", "branch", "--color=always", "--no-merged"],
             check=True
         )
@@ -786,6 +712,7 @@ def show_branches(ask_for_enter=True):
 
 def show_differences():
     """Muestra el submenú de diferencias"""
+    from simple_term_menu import TerminalMenu
     if not is_git_repo():
         print_not_git_repo()
         return
@@ -815,28 +742,28 @@ def show_differences():
 
         # Si se presionó la barra espaciadora, volvemos al menú anterior
         if chosen_key == " ":
-            clear_screen()
+            clear_terminal()
             return
 
         # Procesamos la selección normal del menú
         if menu_entry_index == 0 or chosen_key == "d":
             show_differences_non_staged()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 1 or chosen_key == "a":
             show_differences_staged()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 2 or chosen_key == "c":
             show_differences_between_commits()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 3 or chosen_key == "b":
             show_differences_between_branches()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 4:
-            clear_screen()
+            clear_terminal()
             return
         elif menu_entry_index == 5 or chosen_key == "q":
             quit()
@@ -844,67 +771,22 @@ def show_differences():
             print("Invalid option. Please try again.")
 
 def show_menu_options():
+    from simple_term_menu import TerminalMenu
     from .constants import show_menu
 
     while True:
         print(f"{GREEN}SHOW{ENDC}")
-        print(f"\n{BLUE}Overall Status:{ENDC}")
-        # Mostrar automáticamente el status antes de mostrar las opciones del menú
-        if is_git_repo():
-            try:
-                # Capturar la salida para verificar si hay cambios
-                result = subprocess.run(
-                    ["git", "status", "-s"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                status = result.stdout.strip()
-
-                if status:
-                    # Ejecutar directamente para preservar colores
-                    subprocess.run(["git", "status", "-s"], check=True)
-                else:
-                    print("Working tree clean")
-            except Exception as e:
-                print(f"Error getting status: {e}")
-
-        # Obtener el último commit si es un repositorio git
+        # Mostrar automáticamente el status y el último commit antes de las opciones del menú
         if is_git_repo():
-            try:
-                # Primero verificar si hay commits
-                has_commits = subprocess.run(
-                    ["git", "rev-parse", "--verify", "HEAD"],
-                    capture_output=True,
-                    text=True
-                ).returncode == 0
-
-                if has_commits:
-                    result = subprocess.run(
-                        ["git", "log", "-1", "--pretty=format:%C(yellow)● %h %C(blue)► %C(white)%s %C(magenta)(%cr)", "--color=always"],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    last_commit = result.stdout.strip()
-
-                    if last_commit:
-                        print(f"\n{BLUE}Last Commit:{ENDC}")
-                        print(last_commit)
-                        print()  # Añadir línea en blanco después del commit
-                else:
-                    print(f"\n{YELLOW}No commits yet in this repository.{ENDC}")
-                    print()  # Añadir línea en blanco
-            except Exception as e:
-                # No mostrar el error, solo manejar silenciosamente esta situación
-                print(f"\n{YELLOW}No commit history available.{ENDC}")
-                print()  # Añadir línea en blanco
+            print_status_header()
 
         menu_options = [
             f"[v] {show_menu.GENERAL_VIEW.value}",
             f"[s] {show_menu.SHOW_STATUS.value}",
             f"[d] {show_menu.SHOW_DIFFERENCES.value}",
             f"[h] {show_menu.SHOW_HISTORY.value}",
+            f"[f] {show_menu.FIND_IN_HISTORY.value}",
+            f"[a] {show_menu.BLAME_FILE.value}",
             f"[l] {show_menu.SHOW_LOCAL_REPO.value}",
             f"[r] {show_menu.SHOW_REMOTE_REPO.value}",
             f"[b] {show_menu.SHOW_BRANCHES.value}",
@@ -917,7 +799,7 @@ def show_menu_options():
             title=f"Please select an option:",
             menu_cursor=MENU_CURSOR,
             menu_cursor_style=MENU_CURSOR_STYLE,
-            accept_keys=("enter", "v", "s", "d", "h", "l", "r", "b", " ", "q")
+            accept_keys=("enter", "v", "s", "d", "h", "f", "a", "l", "r", "b", " ", "q")
         )
 
         menu_entry_index = terminal_menu.show()
@@ -925,7 +807,7 @@ def show_menu_options():
 
         # Si se presionó la barra espaciadora, volvemos al menú anterior
         if chosen_key == " ":
-            clear_screen()
+            clear_terminal()
             return
 
         # Procesamos la selección normal del menú
@@ -934,41 +816,51 @@ def show_menu_options():
             # Prevents returning to the "Show" menu which would display the "Overall Status" again
             print(f"{GREEN}Press any key to return to the menu...{ENDC}")
             get_single_keypress()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 1 or chosen_key == "s":
             show_status_long()
             # Prevents returning to the "Show" menu which would display the "Overall Status" again
             print(f"{GREEN}Press any key to return to the menu...{ENDC}")
             get_single_keypress()
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 2 or chosen_key == "d":
             show_differences()
             # Ya no pedimos presionar Enter después de volver del sub-menú History
-            clear_screen()
+            clear_terminal()
             continue
         elif menu_entry_index == 3 or chosen_key == "h":
             show_history()
             # Ya no pedimos presionar Enter después de volver del sub-menú History
-            clear_screen()
+            clear_terminal()
+            continue
+        elif menu_entry_index == 4 or chosen_key == "f":
+            from .search import find_commits
+            find_commits()
+            clear_terminal()
+            continue
+        elif menu_entry_index == 5 or chosen_key == "a":
+            from .blame_view import blame_file
+            blame_file()
+            clear_terminal()
             continue
-        elif menu_entry_index == 4 or chosen_key == "l":
+        elif menu_entry_index == 6 or chosen_key == "l":
             show_local_repo()
-            clear_screen()
+            clear_terminal()
             continue
-        elif menu_entry_index == 5 or chosen_key == "r":
+        elif menu_entry_index == 7 or chosen_key == "r":
             show_remote_repo()
-            clear_screen()
+            clear_terminal()
             continue
-        elif menu_entry_index == 6 or chosen_key == "b":
+        elif menu_entry_index == 8 or chosen_key == "b":
             show_branches()
-            clear_screen()
+            clear_terminal()
             continue
-        elif menu_entry_index == 7:
-            clear_screen()
+        elif menu_entry_index == 9:
+            clear_terminal()
             return
-        elif menu_entry_index == 8 or chosen_key == "q":
+        elif menu_entry_index == 10 or chosen_key == "q":
             quit()
         else:
             print("Invalid option. Please try again.")
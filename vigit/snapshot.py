@@ -0,0 +1,264 @@
+import os
+
+from .refstore import get_ref_store
+from .objects import get_object_reader
+from .runner import run
+
+
+class StatusEntry:
+    """A single entry from `git status --porcelain=v2`."""
+
+    def __init__(self, kind, xy, path, orig_path=None):
+        self.kind = kind
+        self.xy = xy
+        self.path = path
+        self.orig_path = orig_path
+
+    @property
+    def staged(self):
+        return self.kind in ("1", "2", "u") and self.xy[0] != "."
+
+    @property
+    def unstaged(self):
+        return self.kind in ("1", "2", "u") and self.xy[1] != "."
+
+    @property
+    def untracked(self):
+        return self.kind == "?"
+
+
+class RepoSnapshot:
+    """
+    Process-wide cache of the repository state asked for on every menu
+    redraw: current branch, last commit, remotes, branches and status
+    entries. Branch and ref metadata is read from the .git directory by the
+    ref store; working tree state comes from a single
+    `git status --porcelain=v2 --branch -z`, run only the first time one of
+    its answers is needed.
+
+    Every answer is kept until get_snapshot() sees that one of the files it
+    was derived from changed on disk (see refs_fingerprint and
+    status_fingerprint), so returning to a menu after a no-op costs no git
+    process at all.
+    """
+
+    def __init__(self):
+        self.cwd = os.getcwd()
+        self.store = get_ref_store()
+        self.is_repo = self.store is not None
+        self.fingerprint = refs_fingerprint(self.store)
+        self._cache = {}
+        self._reset_status()
+
+    def _reset_status(self):
+        self._status_loaded = False
+        self.status_fingerprint = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+        self.entries = []
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    # STATUS
+    def _load_status(self):
+        if self._status_loaded:
+            return
+        self._status_loaded = True
+        if not self.is_repo:
+            return
+
+        try:
+            result = run(
+                ["git", "status", "--porcelain=v2", "--branch", "-z"],
+                capture_output=True
+            )
+        except Exception:
+            return
+
+        if result.returncode != 0:
+            return
+
+        fields = result.stdout.decode("utf-8", "replace").split("\0")
+        i = 0
+        while i < len(fields):
+            field = fields[i]
+            i += 1
+            if not field:
+                continue
+
+            if field.startswith("# "):
+                self._parse_header(field[2:])
+            elif field[0] == "1":
+                parts = field.split(" ", 8)
+                self.entries.append(StatusEntry("1", parts[1], parts[8]))
+            elif field[0] == "2":
+                # Renames and copies carry the original path in the next field
+                parts = field.split(" ", 9)
+                orig_path = fields[i] if i < len(fields) else None
+                i += 1
+                self.entries.append(StatusEntry("2", parts[1], parts[9], orig_path))
+            elif field[0] == "u":
+                parts = field.split(" ", 10)
+                self.entries.append(StatusEntry("u", parts[1], parts[10]))
+            elif field[0] in "?!":
+                self.entries.append(StatusEntry(field[0], field[0] * 2, field[2:]))
+
+        self.status_fingerprint = status_fingerprint(self.store, self.entries)
+
+    def _parse_header(self, header):
+        key, _, value = header.partition(" ")
+        if key == "branch.upstream":
+            self.upstream = value
+        elif key == "branch.ab":
+            ahead, _, behind = value.partition(" ")
+            self.ahead = int(ahead.lstrip("+") or 0)
+            self.behind = int(behind.lstrip("-") or 0)
+
+    def status_entries(self):
+        self._load_status()
+        return self.entries
+
+    def refresh_status(self):
+        """Drops the status answers so the next one runs `git status` again."""
+        self._reset_status()
+
+    # REFS
+    @property
+    def local_branches(self):
+        return self._cached("local_branches", lambda: self.store.local_branches() if self.is_repo else {})
+
+    @property
+    def remote_branches(self):
+        return self._cached("remote_branches", lambda: self.store.remote_branches() if self.is_repo else {})
+
+    @property
+    def remotes(self):
+        """Configured remote names."""
+        return self._cached("remotes", lambda: self.store.remotes() if self.is_repo else [])
+
+    # QUESTIONS
+    def in_repo(self):
+        return self.is_repo
+
+    def branch(self):
+        """Current branch name, 'HEAD' when detached, None outside a repository."""
+        return self._cached("branch", lambda: self.store.current_branch() if self.is_repo else None)
+
+    def head_oid(self):
+        return self._cached("head_oid", lambda: self.store.head_oid() if self.is_repo else None)
+
+    def has_commits(self):
+        return self.head_oid() is not None
+
+    def last_commit(self):
+        """Parsed commit HEAD points to, read through the session's cat-file process."""
+        oid = self.head_oid()
+        return self._cached("last_commit", lambda: get_object_reader().commit(oid) if oid else None)
+
+    def has_staged_changes(self):
+        self._load_status()
+        return any(entry.staged for entry in self.entries)
+
+    def has_unstaged_changes(self):
+        self._load_status()
+        return any(entry.unstaged for entry in self.entries)
+
+    def has_changes(self):
+        self._load_status()
+        return any(entry.kind != "!" for entry in self.entries)
+
+    def branch_upstream(self, branch_name):
+        return self._cached(("upstream", branch_name),
+                            lambda: self.store.branch_upstream(branch_name) if self.is_repo else None)
+
+    def has_stash(self):
+        return self._cached("stash", lambda: self.is_repo and self.store.stash_oid() is not None)
+
+    def branches(self):
+        """Local branch names in the order `git branch` lists them."""
+        return sorted(self.local_branches)
+
+    def has_branch(self, branch_name):
+        return branch_name in self.local_branches
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+def _tree_key(path):
+    """mtimes of path and every directory below it: a loose ref update renames a file in its own directory."""
+    keys = []
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            keys.append((current, os.stat(current).st_mtime_ns))
+            with os.scandir(current) as entries:
+                pending.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+    return tuple(sorted(keys))
+
+def refs_fingerprint(store):
+    """
+    stat() signature of everything branch, HEAD, ref and remote answers are
+    read from, or None when it cannot be computed (no repository, or a
+    layout only git can read), in which case nothing is reused.
+    """
+    git_dir = getattr(store, "git_dir", None)
+    if git_dir is None:
+        return None
+    common_dir = store.common_dir
+    return (
+        _stat_key(os.path.join(git_dir, "HEAD")),
+        _stat_key(os.path.join(common_dir, "packed-refs")),
+        _stat_key(os.path.join(common_dir, "config")),
+        _tree_key(os.path.join(common_dir, "refs")),
+    )
+
+def status_fingerprint(store, entries):
+    """
+    stat() signature for the cached status entries: the index, the work tree
+    root and every path status reported. Edits made in place to files that
+    were clean, deep in the tree, only show up once the index or HEAD moves.
+    """
+    git_dir = getattr(store, "git_dir", None)
+    if git_dir is None:
+        return None
+    work_tree = store.work_tree
+    return (
+        _stat_key(os.path.join(git_dir, "index")),
+        _stat_key(work_tree),
+        tuple(_stat_key(os.path.join(work_tree, entry.path)) for entry in entries),
+    )
+
+
+_snapshot = None
+
+def get_snapshot():
+    """
+    Returns the cached snapshot while the repository files it was built from
+    are unchanged, otherwise a new one. Only stat() calls are made to decide.
+    """
+    global _snapshot
+    if _snapshot is not None and _snapshot.fingerprint is not None and _snapshot.cwd == os.getcwd():
+        if refs_fingerprint(_snapshot.store) == _snapshot.fingerprint:
+            if _snapshot._status_loaded and \
+                    status_fingerprint(_snapshot.store, _snapshot.entries) != _snapshot.status_fingerprint:
+                _snapshot._reset_status()
+            return _snapshot
+    _snapshot = RepoSnapshot()
+    return _snapshot
+
+def invalidate_snapshot():
+    """Drops the cached snapshot; runner.run() calls it after every git command in CHANGING_COMMANDS."""
+    global _snapshot
+    _snapshot = None
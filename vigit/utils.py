@@ -10,6 +10,8 @@ BLUE = '\033[95m'
 DARK_BLUE = '\033[34m'
 RED = '\033[91m'
 WHITE = '\033[97m'
+MAGENTA = '\033[35m'
+CYAN = '\033[36m'
 ENDC = '\033[0m'
 
 # STYLES
@@ -29,6 +31,8 @@ class global_menu(Enum):
 
 # REPEATING CHOICES
 def quit():
+    from .objects import close_object_readers
+    close_object_readers()
     sys.exit("Exiting VisualGit...\n")
 def invalid_opt():
     print("Invalid choice. Please select a valid option.")